@@ -0,0 +1,510 @@
+"""
+Teste diferencial dos motores de análise contra um oráculo congelado.
+
+O oráculo (benchmarks/oracle.py) são as funções de análise do teste_teste.py original (revisão
+342f832, antes do pacote football_studio), extraídas por benchmarks.freeze_oracle e que não
+mudam junto com o pacote. Cada motor candidato (ENGINES) recebe os mesmos resultados que o
+oráculo, e as saídas de analyze_surf, analyze_colors, find_complex_patterns,
+analyze_break_probability, analyze_draw_specifics e generate_advanced_suggestion (sem os sinais
+novos) precisam ser idênticas, inclusive na ordem das chaves (a comparação é pelo repr).
+
+Antes da comparação, as saídas do motor voltam à representação do oráculo: os Pattern viram o
+texto de pattern_label e 'last_break' vira o 'last_break_type' de break_label (user-018). Fora
+isso, só são aceitas as diferenças listadas em INTENDED_CHANGES, mudanças de comportamento feitas
+de propósito depois do original; o relatório conta quantas vezes cada uma foi aplicada. Regras
+removidas que nunca disparavam no original (Escada Crescente, Zig-Zag, Espelho/Onda) não mudam
+nenhuma saída e não precisam de exceção.
+
+As análises que o original não tinha (analyze_transitions, analyze_longest_match e
+analyze_windows) e a sugestão com os sinais que vêm delas são comparadas com as funções de
+varredura do pacote (football_studio.analysis), a referência dos motores otimizados.
+
+Modos:
+    random      sequências aleatórias com semente (pesos e formatos variados); uma divergência é
+                reduzida removendo resultados enquanto ela persistir
+    exhaustive  todas as sequências de 0 a --max-length resultados (3^12 = 531441 só no tamanho 12)
+    long        históricos longos com semente, comparados rodada a rodada com o limite de
+                MAX_HISTORY_TO_STORE resultados (inclui o descarte dos mais antigos)
+
+check_guarantee_status não depende do motor e é comparada uma vez, com todas as entradas possíveis.
+
+O relatório traz, por modo e motor, quantos casos passaram, as mudanças intencionais aplicadas, a
+primeira entrada divergente (em ordem cronológica, H/A/D) e o tempo total do oráculo e do motor,
+com o ganho de velocidade. O tempo do motor cobre só o que o oráculo também faz (as cinco análises
+originais e uma sugestão); as análises novas e a sugestão com os sinais delas aparecem à parte, na
+coluna 'novas'. No motor incremental, o push atualiza também o estado das análises novas, e esse
+custo fica no tempo do motor.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.differential                              # todos os motores e modos
+    python -m benchmarks.differential --engine bitpacked --mode exhaustive --max-length 10
+    python -m benchmarks.differential --quick --json
+"""
+
+
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import random
+import sys
+import time
+
+from football_studio import (
+    MAX_HISTORY_TO_STORE,
+    ResultHistory,
+    IncrementalAnalyzer,
+    analyze_all,
+    generate_advanced_suggestion,
+    check_guarantee_status,
+)
+from football_studio import analysis, bitpacked
+from football_studio.common import RESULTS
+from football_studio.memo import SuggestionCache
+from football_studio.patterns import pattern_label, break_label
+from benchmarks import oracle
+
+SEED = 20240601
+ORACLE_ANALYZERS = ('analyze_surf', 'analyze_colors', 'find_complex_patterns', 'analyze_break_probability',
+                    'analyze_draw_specifics')
+ANALYZER_NAMES = ORACLE_ANALYZERS + ('generate_advanced_suggestion',)
+# Saídas sem equivalente no oráculo, comparadas com as funções de varredura do pacote
+EXTRA_ANALYZERS = ('analyze_transitions', 'analyze_longest_match', 'analyze_windows')
+REFERENCE_NAMES = EXTRA_ANALYZERS + ('generate_advanced_suggestion (sinais novos)',)
+RESULT_LETTERS = {'home': 'H', 'away': 'A', 'draw': 'D'}
+MODES = ('random', 'exhaustive', 'long')
+DEFAULTS = {'random_cases': 5000, 'max_random_length': 120, 'max_length': 12, 'long_histories': 3, 'long_rounds': 3000}
+QUICK = {'random_cases': 500, 'max_random_length': 60, 'max_length': 8, 'long_histories': 1, 'long_rounds': 1500}
+EXHAUSTIVE_JOB_SIZE = 3 ** 9
+MAX_SHRINK_ATTEMPTS = 2000
+
+# --- Mudanças intencionais em relação ao oráculo ---
+
+def oracle_raised_color_key(expected, actual, history, analyses):
+    """O original somava em bet_scores['red'] / ['blue'], chaves que não existem, e lançava KeyError."""
+    return isinstance(expected, KeyError) and expected.args[0] in ('red', 'blue')
+
+def guarantee_compares_result(expected, actual, latest_result, bet_type):
+    """O original comparava a aposta ('home') com a cor do resultado ('red') e sempre dava FALHA."""
+    return expected['status'] == 'FALHA' and actual['status'] == 'SUCESSO' and latest_result == bet_type
+
+IntendedChange = collections.namedtuple('IntendedChange', ['id', 'output', 'description', 'applies'])
+
+INTENDED_CHANGES = (
+    IntendedChange('user-005', 'generate_advanced_suggestion',
+                   "As regras 2x2/3x3 pontuam a aposta Casa/Visitante da cor em vez de lançar KeyError.",
+                   oracle_raised_color_key),
+    IntendedChange('user-022', 'check_guarantee_status',
+                   "A aposta é comparada com o resultado, não com a cor do resultado.",
+                   guarantee_compares_result),
+)
+
+def intended_change(output, *args):
+    """Id da primeira mudança intencional de 'output' que explica a diferença, ou None."""
+    for change in INTENDED_CHANGES:
+        if change.output == output and change.applies(*args):
+            return change.id
+    return None
+
+# --- Oráculo e motores ---
+
+def oracle_outputs(results):
+    """
+    Saídas do oráculo para 'results' (lista, mais recente primeiro); no lugar da sugestão, a
+    exceção que o original lançou, se for o caso.
+    """
+    analyses = tuple(getattr(oracle, name)(results) for name in ORACLE_ANALYZERS)
+    try:
+        suggestion = oracle.generate_advanced_suggestion(results, *analyses)
+    except KeyError as error:
+        suggestion = error
+    return analyses + (suggestion,)
+
+def reference_outputs(results):
+    """Saídas sem equivalente no oráculo, pelas funções de varredura do pacote."""
+    analyses = analyze_all(results)
+    return analyses[5:] + (generate_advanced_suggestion(results, *analyses),)
+
+def pattern_labels(counts):
+    return {pattern_label(pattern): count for pattern, count in counts.items()}
+
+def as_oracle(analyses, suggestion):
+    """Saídas de um motor na representação do oráculo (chaves de texto e 'last_break_type')."""
+    surf, colors, complex_patterns, break_probability, draw_specifics = analyses[:5]
+    return (
+        surf,
+        colors,
+        pattern_labels(complex_patterns),
+        {'break_chance': break_probability['break_chance'], 'last_break_type': break_label(break_probability['last_break'])},
+        {**draw_specifics, 'draw_patterns': pattern_labels(draw_specifics['draw_patterns'])},
+        suggestion,
+    )
+
+def engine_outputs(history, analyze, analyze_extra, generate):
+    """
+    ((histórico, análises, sugestão só com as análises do oráculo, sugestão com todas as análises),
+    segundos gastos nas análises novas e na segunda sugestão). 'analyze' calcula as cinco análises
+    do oráculo e 'analyze_extra' as de EXTRA_ANALYZERS.
+    """
+    analyses = analyze()
+    suggestion = generate(history, *analyses)
+    start = time.perf_counter()
+    analyses += analyze_extra()
+    full_suggestion = generate(history, *analyses)
+    return (history, analyses, suggestion, full_suggestion), time.perf_counter() - start
+
+def scan_analyses(results, names):
+    return tuple(getattr(analysis, name)(results) for name in names)
+
+def bitpacked_analyses(results):
+    packed = bitpacked.PackedHistory.from_results(results)
+    return tuple(bitpacked.PACKED_ANALYZERS[name](packed) for name in ORACLE_ANALYZERS)
+
+class HistoryEngine:
+    """Motor sem estado próprio: 'analyze' recalcula as análises do oráculo sobre o histórico a cada consulta."""
+
+    def __init__(self, analyze):
+        self.analyze = analyze
+
+    def reset(self, max_history):
+        self.history = ResultHistory(max_history)
+
+    def push(self, result):
+        self.history.push(result)
+
+    def outputs(self):
+        return engine_outputs(self.history, lambda: self.analyze(self.history),
+                              lambda: scan_analyses(self.history, EXTRA_ANALYZERS), generate_advanced_suggestion)
+
+class IncrementalEngine:
+    """Caminho do app: IncrementalAnalyzer e, com 'cached', o SuggestionCache (mantido entre casos)."""
+
+    def __init__(self, cached=False):
+        self.cache = SuggestionCache() if cached else None
+
+    def reset(self, max_history):
+        self.history = ResultHistory(max_history)
+        self.analyzer = IncrementalAnalyzer(max_history)
+
+    def push(self, result):
+        self.history.push(result)
+        self.analyzer.push(result)
+
+    def analyses(self, names):
+        return tuple(getattr(self.analyzer, name)() for name in names)
+
+    def outputs(self):
+        generate = self.cache.generate if self.cache is not None else generate_advanced_suggestion
+        return engine_outputs(self.history, lambda: self.analyses(ORACLE_ANALYZERS),
+                              lambda: self.analyses(EXTRA_ANALYZERS), generate)
+
+ENGINES = {
+    'scan': lambda: HistoryEngine(lambda results: scan_analyses(results, ORACLE_ANALYZERS)),
+    'bitpacked': lambda: HistoryEngine(bitpacked_analyses),
+    'incremental': lambda: IncrementalEngine(),
+    'memo': lambda: IncrementalEngine(cached=True),
+}
+
+def compare(outputs, expected, reference):
+    """
+    Compara as saídas de um motor (engine_outputs) com o oráculo ('expected') e a referência;
+    devolve (diferença, mudanças intencionais aplicadas), em que a diferença é
+    (saída, esperado, motor) ou None.
+    """
+    history, analyses, suggestion, full_suggestion = outputs
+    changes = []
+    for name, oracle_value, engine_value in zip(ANALYZER_NAMES, expected, as_oracle(analyses, suggestion)):
+        if repr(oracle_value) == repr(engine_value):
+            continue
+        change = intended_change(name, oracle_value, engine_value, history, analyses)
+        if change is None:
+            return (name, oracle_value, engine_value), changes
+        changes.append(change)
+    for name, reference_value, engine_value in zip(REFERENCE_NAMES, reference, analyses[5:] + (full_suggestion,)):
+        if repr(reference_value) != repr(engine_value):
+            return (name, reference_value, engine_value), changes
+    return None, changes
+
+def history_text(sequence):
+    return ''.join(RESULT_LETTERS[result] for result in sequence)
+
+# --- Execução ---
+
+def empty_entry():
+    return {'cases': 0, 'intended': {}, 'divergence': None, 'oracle_seconds': 0.0, 'engine_seconds': 0.0, 'extra_seconds': 0.0}
+
+def empty_report(engine_names):
+    return {name: empty_entry() for name in engine_names}
+
+def record(entry, sequence, difference, changes):
+    entry['cases'] += 1
+    for change in changes:
+        entry['intended'][change] = entry['intended'].get(change, 0) + 1
+    if difference is not None:
+        entry['divergence'] = divergence(sequence, *difference)
+
+def check_sequences(engine_names, sequences, max_history=MAX_HISTORY_TO_STORE):
+    """
+    Compara o estado final de cada sequência (cronológica) entre o oráculo e os motores; cada
+    motor para de ser verificado na sua primeira divergência.
+    """
+    engines = {name: ENGINES[name]() for name in engine_names}
+    report = empty_report(engine_names)
+    for sequence in sequences:
+        active = [name for name in engine_names if report[name]['divergence'] is None]
+        if not active:
+            break
+        recent = list(reversed(sequence[-max_history:]))
+        start = time.perf_counter()
+        expected = oracle_outputs(recent)
+        oracle_seconds = time.perf_counter() - start
+        reference = reference_outputs(recent)
+        for name in active:
+            engine = engines[name]
+            start = time.perf_counter()
+            engine.reset(max_history)
+            for result in sequence:
+                engine.push(result)
+            actual, extra_seconds = engine.outputs()
+            entry = report[name]
+            entry['engine_seconds'] += time.perf_counter() - start - extra_seconds
+            entry['extra_seconds'] += extra_seconds
+            entry['oracle_seconds'] += oracle_seconds
+            record(entry, sequence, *compare(actual, expected, reference))
+    return report
+
+def check_stream(engine_names, sequence, max_history=MAX_HISTORY_TO_STORE):
+    """Compara rodada a rodada ao longo de um histórico longo (cada rodada conta como um caso)."""
+    engines = {name: ENGINES[name]() for name in engine_names}
+    for engine in engines.values():
+        engine.reset(max_history)
+    report = empty_report(engine_names)
+    recent = []
+    for round_number, result in enumerate(sequence, 1):
+        recent.insert(0, result)
+        del recent[max_history:]
+        start = time.perf_counter()
+        expected = oracle_outputs(recent)
+        oracle_seconds = time.perf_counter() - start
+        reference = reference_outputs(recent)
+        for name, engine in engines.items():
+            entry = report[name]
+            if entry['divergence'] is not None:
+                continue
+            start = time.perf_counter()
+            engine.push(result)
+            actual, extra_seconds = engine.outputs()
+            entry['engine_seconds'] += time.perf_counter() - start - extra_seconds
+            entry['extra_seconds'] += extra_seconds
+            entry['oracle_seconds'] += oracle_seconds
+            record(entry, sequence[:round_number], *compare(actual, expected, reference))
+    return report
+
+def check_guarantees():
+    """check_guarantee_status do pacote contra a do oráculo, com todas as combinações de entrada."""
+    entry = empty_entry()
+    for bet_type, guarantee_pattern, latest_result in itertools.product(RESULTS + ('none',), ('Padrão', 'N/A'), RESULTS + ('',)):
+        start = time.perf_counter()
+        expected = oracle.check_guarantee_status(latest_result, bet_type, guarantee_pattern)
+        entry['oracle_seconds'] += time.perf_counter() - start
+        start = time.perf_counter()
+        actual = check_guarantee_status(latest_result, bet_type, guarantee_pattern)
+        entry['engine_seconds'] += time.perf_counter() - start
+        difference, changes = None, []
+        if repr(expected) != repr(actual):
+            change = intended_change('check_guarantee_status', expected, actual, latest_result, bet_type)
+            if change is None:
+                difference = ('check_guarantee_status', expected, actual)
+            else:
+                changes.append(change)
+        record(entry, [], difference, changes)
+        if difference is not None:
+            entry['divergence']['arguments'] = repr((latest_result, bet_type, guarantee_pattern))
+            break
+    return {'pacote': entry}
+
+def divergence(sequence, analyzer, expected, actual):
+    return {
+        'length': len(sequence),
+        'history': history_text(sequence),
+        'analyzer': analyzer,
+        'expected': repr(expected),
+        'actual': repr(actual),
+    }
+
+def merge_reports(total, partial):
+    """Soma 'partial' em 'total'; a divergência que vale é a primeira na ordem dos casos."""
+    for name, entry in partial.items():
+        merged = total.setdefault(name, empty_entry())
+        if merged['divergence'] is not None:
+            continue
+        for key in ('cases', 'oracle_seconds', 'engine_seconds', 'extra_seconds'):
+            merged[key] += entry[key]
+        for change, count in entry['intended'].items():
+            merged['intended'][change] = merged['intended'].get(change, 0) + count
+        merged['divergence'] = entry['divergence']
+    return total
+
+def shrink(engine_name, sequence, max_history=MAX_HISTORY_TO_STORE):
+    """Remove resultados (um a um, do mais antigo ao mais recente) enquanto a divergência persistir."""
+    def diverges(candidate):
+        return check_sequences([engine_name], [candidate], max_history)[engine_name]['divergence'] is not None
+
+    attempts = 0
+    changed = True
+    while changed and attempts < MAX_SHRINK_ATTEMPTS:
+        changed = False
+        for index in range(len(sequence)):
+            candidate = sequence[:index] + sequence[index + 1:]
+            attempts += 1
+            if diverges(candidate):
+                sequence = candidate
+                changed = True
+                break
+    return check_sequences([engine_name], [sequence], max_history)[engine_name]['divergence']
+
+def random_sequence(rng, length):
+    """Sequência reprodutível de 'length' resultados: pesos variados, blocos longos ou alternância."""
+    shape = rng.random()
+    if shape < 0.5:
+        weights = [rng.random() + 0.01 for _ in range(3)]
+        return rng.choices(('home', 'away', 'draw'), weights, k=length)
+    if shape < 0.8:
+        # Blocos de mesmo resultado com tamanhos de 1 a 6
+        sequence = []
+        while len(sequence) < length:
+            sequence.extend([rng.choice(('home', 'away', 'draw'))] * rng.randint(1, 6))
+        return sequence[:length]
+    # Alternância com empates ocasionais
+    pair = rng.sample(('home', 'away', 'draw'), 2)
+    return [pair[i % 2] if rng.random() > 0.1 else 'draw' for i in range(length)]
+
+def random_sequences(count, max_length, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield random_sequence(rng, rng.randint(0, max_length))
+
+def run_random(engine_names, count, max_length, seed):
+    report = check_sequences(engine_names, random_sequences(count, max_length, seed))
+    for name, entry in report.items():
+        if entry['divergence'] is not None:
+            shrunk = shrink(name, [{'H': 'home', 'A': 'away', 'D': 'draw'}[letter]
+                                   for letter in entry['divergence']['history']])
+            entry['divergence']['shrunk'] = shrunk
+    return report
+
+def exhaustive_chunk(engine_names, length, start, stop):
+    """Sequências de tamanho 'length' de índice start a stop - 1 (na ordem de itertools.product)."""
+    sequences = itertools.islice(itertools.product(('home', 'away', 'draw'), repeat=length), start, stop)
+    return check_sequences(engine_names, (list(sequence) for sequence in sequences))
+
+def run_exhaustive(engine_names, max_length, workers=1):
+    jobs = [
+        (engine_names, length, start, min(start + EXHAUSTIVE_JOB_SIZE, 3 ** length))
+        for length in range(max_length + 1)
+        for start in range(0, 3 ** length, EXHAUSTIVE_JOB_SIZE)
+    ]
+    report = {}
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            merge_reports(report, exhaustive_chunk(*job))
+        return report
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(exhaustive_chunk, *zip(*jobs)):
+            merge_reports(report, partial)
+    return report
+
+def run_long(engine_names, histories, rounds, seed):
+    rng = random.Random(seed + 1)
+    report = {}
+    for _ in range(histories):
+        merge_reports(report, check_stream(engine_names, random_sequence(rng, rounds)))
+    return report
+
+def run(engine_names, modes, settings, seed=SEED, workers=1):
+    """
+    Relatório {modo: {motor: {...}}} com os casos, as mudanças intencionais aplicadas, a primeira
+    divergência e os tempos (o do motor sem as análises novas, que ficam em 'extra_seconds');
+    'guarantee' traz a comparação de check_guarantee_status.
+    """
+    reports = {'guarantee': check_guarantees()}
+    for mode in modes:
+        if mode == 'random':
+            reports[mode] = run_random(engine_names, settings['random_cases'], settings['max_random_length'], seed)
+        elif mode == 'exhaustive':
+            reports[mode] = run_exhaustive(engine_names, settings['max_length'], workers)
+        else:
+            reports[mode] = run_long(engine_names, settings['long_histories'], settings['long_rounds'], seed)
+    for report in reports.values():
+        for entry in report.values():
+            entry['speedup'] = round(entry['oracle_seconds'] / entry['engine_seconds'], 2) if entry['engine_seconds'] else None
+    return reports
+
+def format_reports(reports):
+    lines = [f"Oráculo congelado na revisão {oracle.REVISION}", "",
+             f"{'modo':<11} {'motor':<12} {'casos':>9}  {'resultado':<10} {'oráculo':>10} {'motor':>10} {'ganho':>7} {'novas':>10}"]
+    details = []
+    intended = {}
+    for mode, report in reports.items():
+        for name, entry in report.items():
+            status = 'OK' if entry['divergence'] is None else 'DIVERGE'
+            speedup = f"{entry['speedup']:.2f}x" if entry['speedup'] else '-'
+            lines.append(f"{mode:<11} {name:<12} {entry['cases']:>9}  {status:<10} {entry['oracle_seconds']:>9.2f}s "
+                         f"{entry['engine_seconds']:>9.2f}s {speedup:>7} {entry['extra_seconds']:>9.2f}s")
+            for change, count in entry['intended'].items():
+                intended.setdefault(change, []).append(f"{mode}/{name} {count}")
+            if entry['divergence'] is not None:
+                found = entry['divergence'].get('shrunk') or entry['divergence']
+                if 'arguments' in found:
+                    where = [f"{mode}/{name}: {found['analyzer']} diverge", f"  argumentos: {found['arguments']}"]
+                else:
+                    where = [f"{mode}/{name}: {found['analyzer']} diverge após {found['length']} resultados",
+                             f"  histórico (mais antigo primeiro): {found['history'] or '(vazio)'}"]
+                details += [
+                    "",
+                    *where,
+                    f"  oráculo: {found['expected']}",
+                    f"  motor:   {found['actual']}",
+                ]
+    if intended:
+        lines += ["", "Mudanças intencionais aceitas (casos por modo/motor):"]
+        for change in INTENDED_CHANGES:
+            if change.id in intended:
+                lines.append(f"  {change.id} {change.output}: {change.description}")
+                lines.append(f"    {', '.join(intended[change.id])}")
+    return "\n".join(lines + details)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='benchmarks.differential', description='Teste diferencial contra o oráculo congelado.')
+    parser.add_argument('--engine', action='append', choices=sorted(ENGINES), help='Motor a verificar (repetível; padrão: todos).')
+    parser.add_argument('--mode', action='append', choices=MODES, help='Modo (repetível; padrão: todos).')
+    parser.add_argument('--quick', action='store_true', help='Volumes reduzidos (tamanho exaustivo 8).')
+    parser.add_argument('--random-cases', type=int)
+    parser.add_argument('--max-random-length', type=int)
+    parser.add_argument('--max-length', type=int, help='Maior tamanho do modo exaustivo.')
+    parser.add_argument('--long-histories', type=int)
+    parser.add_argument('--long-rounds', type=int)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--workers', type=int, default=1, help='Processos no modo exaustivo (0 = todos os núcleos).')
+    parser.add_argument('--json', action='store_true', help='Relatório em JSON.')
+    args = parser.parse_args(argv)
+
+    settings = dict(QUICK if args.quick else DEFAULTS)
+    for key in settings:
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+    engine_names = args.engine or list(ENGINES)
+    reports = run(engine_names, args.mode or MODES, settings, args.seed, args.workers or None)
+    if args.json:
+        changes = {change.id: {'output': change.output, 'description': change.description} for change in INTENDED_CHANGES}
+        print(json.dumps({'oracle_revision': oracle.REVISION, 'intended_changes': changes, 'settings': settings,
+                          'reports': reports},
+                         ensure_ascii=False, indent=2))
+    else:
+        print(format_reports(reports))
+    diverged = any(entry['divergence'] is not None for report in reports.values() for entry in report.values())
+    return 1 if diverged else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Congela o oráculo do teste diferencial (benchmarks/differential.py).
+
+O oráculo são as funções de análise do teste_teste.py original (revisão BASELINE_REVISION, antes
+do pacote football_studio existir), tiradas do git sem a interface Streamlit: ficam só as
+constantes, as funções auxiliares, os analisadores, generate_advanced_suggestion e
+check_guarantee_status, gravados sem alterações em benchmarks/oracle.py. As mudanças de
+comportamento feitas depois, de propósito, não entram na cópia: elas são documentadas e aceitas
+em differential.INTENDED_CHANGES.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.freeze_oracle [--revision REV]
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+BASELINE_REVISION = '342f832'
+BASELINE_FILE = 'teste_teste.py'
+ORACLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'oracle.py')
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI_MODULES = ('streamlit', 'pandas') # Importados pelo app, mas não usados pelas análises
+
+def baseline_source(revision=BASELINE_REVISION):
+    """Conteúdo de teste_teste.py na revisão 'revision'."""
+    return subprocess.run(['git', 'show', f'{revision}:{BASELINE_FILE}'], cwd=REPOSITORY_DIR, capture_output=True,
+                          text=True, check=True).stdout
+
+def is_ui_import(node):
+    names = [alias.name for alias in node.names] if isinstance(node, ast.Import) else [node.module]
+    return all(name.split('.')[0] in UI_MODULES for name in names)
+
+def analysis_source(source):
+    """
+    As linhas de 'source' antes do primeiro comando de nível superior (o início da interface), sem
+    os imports da interface. Lança ValueError se sobrar algo além de imports, constantes e funções.
+    """
+    lines = source.splitlines(keepends=True)
+    end = len(lines)
+    dropped = set()
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if is_ui_import(node):
+                dropped.update(range(node.lineno - 1, node.end_lineno))
+        elif not isinstance(node, (ast.FunctionDef, ast.Assign)):
+            end = node.lineno - 1
+            break
+    # Comentários logo antes da interface (por exemplo '# --- Streamlit UI ---') ficam de fora
+    while end and (lines[end - 1].strip().startswith('#') or not lines[end - 1].strip()):
+        end -= 1
+    kept = ''.join(line for index, line in enumerate(lines[:end]) if index not in dropped)
+    for node in ast.parse(kept).body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.Assign)):
+            raise ValueError(f"Comando inesperado na linha {node.lineno} da cópia do oráculo")
+    return kept
+
+def freeze(revision=BASELINE_REVISION, path=ORACLE_PATH):
+    """Grava em 'path' as funções de análise de teste_teste.py na revisão 'revision'."""
+    source = analysis_source(baseline_source(revision))
+    with open(path, 'w', encoding='utf-8') as stream:
+        stream.write(f'"""\nOráculo do teste diferencial: funções de análise de {BASELINE_FILE} na revisão {revision},\n'
+                     f"sem a interface Streamlit. Gerado por 'python -m benchmarks.freeze_oracle'; não editar.\n"
+                     f'"""\n\nREVISION = {revision!r}\n\n')
+        stream.write(source.rstrip() + '\n')
+    return revision
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='benchmarks.freeze_oracle', description='Congela o oráculo do teste diferencial.')
+    parser.add_argument('--revision', default=BASELINE_REVISION, help='Revisão do git de onde sai o oráculo.')
+    args = parser.parse_args(argv)
+    try:
+        revision = freeze(args.revision)
+    except (OSError, subprocess.CalledProcessError, SyntaxError, ValueError) as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 1
+    print(f"Oráculo congelado na revisão {revision} em {ORACLE_PATH}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Benchmarks dos analisadores, do pipeline completo de sugestão e do caminho de inclusão de resultados.
+
+Os históricos sintéticos são gerados com semente fixa, de 27 a 10^6 rodadas, e incluem entradas
+adversariais (sequências longas, alternância estrita, só empates). Cada caso mede o tempo por
+chamada (melhor de várias repetições); os casos de custo quadrático ou de preparação cara só
+rodam até SCAN_MAX_SIZE / INCREMENTAL_MAX_SIZE rodadas.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.run                         # executa e imprime
+    python -m benchmarks.run --save baseline.json    # grava a linha de base
+    python -m benchmarks.run --compare baseline.json # falha (código 1) se algum caso regrediu
+    python -m benchmarks.run --quick --filter surf   # só históricos até 10^5 e casos com 'surf'
+"""
+
+import argparse
+import functools
+import json
+import platform
+import random
+import sys
+import time
+
+from football_studio import (
+    ResultHistory,
+    IncrementalAnalyzer,
+    analyze_surf,
+    analyze_colors,
+    find_complex_patterns,
+    analyze_break_probability,
+    analyze_draw_specifics,
+    analyze_transitions,
+    analyze_longest_match,
+    analyze_windows,
+    generate_advanced_suggestion,
+    analyze_all,
+    PackedHistory,
+)
+from football_studio import bitpacked
+
+SEED = 20240601
+SIZES = (27, 1_000, 100_000, 1_000_000)
+QUICK_MAX_SIZE = 100_000
+DEFAULT_THRESHOLD = 0.25 # Regressão: mais de 25% acima da linha de base
+MIN_MEASURE_SECONDS = 0.2
+REPEATS = 5
+
+def random_history(size, seed=SEED, weights=(45, 45, 10)):
+    rng = random.Random(seed + size)
+    return rng.choices(('home', 'away', 'draw'), weights, k=size)
+
+def long_streaks(size, streak=50):
+    return [('home', 'away')[(i // streak) % 2] for i in range(size)]
+
+def alternation(size):
+    return [('home', 'away')[i % 2] for i in range(size)]
+
+def all_draws(size):
+    return ['draw'] * size
+
+GENERATORS = {
+    'random': random_history,
+    'streaks': long_streaks,
+    'alternation': alternation,
+    'draws': all_draws,
+}
+
+def make_history(results):
+    """ResultHistory com 'results' (cronológico) e capacidade igual ao tamanho."""
+    history = ResultHistory(max(len(results), 1))
+    for result in results:
+        history.push(result)
+    return history
+
+# Tamanho máximo dos casos caros de preparar ou de medir: analyze_transitions e
+# analyze_longest_match comparam o contexto final em cada posição do histórico (a análise completa
+# também as executa), e montar o estado incremental com 10^6 rodadas leva cerca de um minuto
+SCAN_MAX_SIZE = 10_000
+INCREMENTAL_MAX_SIZE = 100_000
+
+class HistoryInputs:
+    """Entradas dos casos de um histórico sintético, montadas só quando algum caso selecionado as pede."""
+
+    def __init__(self, generator, size):
+        self.generator = generator
+        self.size = size
+
+    @functools.cached_property
+    def history(self):
+        return make_history(self.generator(self.size))
+
+    @functools.cached_property
+    def analyses(self):
+        return analyze_all(self.history)
+
+    @functools.cached_property
+    def packed(self):
+        return PackedHistory.from_results(self.history)
+
+def push_round_case(inputs):
+    """Caminho por rodada do app: inclui o resultado e lê a sugestão do estado incremental."""
+    history = inputs.history
+    analyzer = IncrementalAnalyzer.from_results(history, max(inputs.size, 27))
+    pending = random_history(4096, seed=SEED + 1)
+    position = [0]
+    def push_round():
+        result = pending[position[0] % len(pending)]
+        position[0] += 1
+        history.push(result)
+        analyzer.push(result)
+        return generate_advanced_suggestion(history, *analyzer.analyze_all())
+    return push_round
+
+# (caso, maior tamanho de histórico ou None, função que recebe as HistoryInputs e devolve o que é medido)
+CASES = (
+    ('analyze_surf', None, lambda inputs: functools.partial(analyze_surf, inputs.history)),
+    ('analyze_colors', None, lambda inputs: functools.partial(analyze_colors, inputs.history)),
+    ('find_complex_patterns', None, lambda inputs: functools.partial(find_complex_patterns, inputs.history)),
+    ('analyze_break_probability', None, lambda inputs: functools.partial(analyze_break_probability, inputs.history)),
+    ('analyze_draw_specifics', None, lambda inputs: functools.partial(analyze_draw_specifics, inputs.history)),
+    ('analyze_transitions', SCAN_MAX_SIZE, lambda inputs: functools.partial(analyze_transitions, inputs.history)),
+    ('analyze_longest_match', SCAN_MAX_SIZE, lambda inputs: functools.partial(analyze_longest_match, inputs.history)),
+    ('analyze_windows', None, lambda inputs: functools.partial(analyze_windows, inputs.history)),
+    ('generate_advanced_suggestion', SCAN_MAX_SIZE,
+     lambda inputs: functools.partial(generate_advanced_suggestion, inputs.history, *inputs.analyses)),
+    ('pipeline', SCAN_MAX_SIZE, lambda inputs: lambda h=inputs.history: generate_advanced_suggestion(h, *analyze_all(h))),
+    ('push_round', INCREMENTAL_MAX_SIZE, push_round_case),
+    # Núcleo de bits sobre o histórico inteiro (empacotamento medido à parte)
+    ('pack_history', None, lambda inputs: functools.partial(PackedHistory.from_results, inputs.history)),
+    ('packed_analyze_surf', None, lambda inputs: functools.partial(bitpacked.analyze_surf, inputs.packed)),
+    ('packed_history_patterns', None, lambda inputs: functools.partial(bitpacked.history_pattern_counts, inputs.packed)),
+)
+
+def iter_cases(sizes, name_filter=None):
+    """
+    Gera (nome, função sem argumentos a ser medida) para os casos que passam pelo filtro e pelo
+    tamanho máximo. Cada caso é preparado só quando chega a sua vez, e o histórico (e o que é
+    derivado dele) só é montado se algum caso selecionado o usar e existe só enquanto é medido.
+    """
+    for kind, generator in GENERATORS.items():
+        for size in sizes:
+            inputs = HistoryInputs(generator, size)
+            for case, max_size, setup in CASES:
+                name = f"{kind}/{size}/{case}"
+                if max_size is not None and size > max_size:
+                    continue
+                if name_filter and name_filter not in name:
+                    continue
+                yield name, setup(inputs)
+
+def measure(function):
+    """Segundos por chamada: melhor média entre REPEATS rodadas de pelo menos MIN_MEASURE_SECONDS."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_MEASURE_SECONDS / REPEATS or number >= 1 << 20:
+            break
+        number *= 4
+    best = elapsed / number
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+def run(sizes, name_filter=None):
+    results = {}
+    for name, function in iter_cases(sizes, name_filter):
+        results[name] = measure(function)
+        print(f"{name:<60} {results[name] * 1e6:>12.2f} µs", flush=True)
+    return results
+
+def compare(current, baseline, threshold):
+    """Lista de (caso, base, atual, razão) que ficaram mais lentos que base * (1 + threshold)."""
+    regressions = []
+    for name, seconds in current.items():
+        base = baseline.get(name)
+        if base and seconds > base * (1 + threshold):
+            regressions.append((name, base, seconds, seconds / base))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='benchmarks.run', description='Benchmarks do motor de análise.')
+    parser.add_argument('--quick', action='store_true', help=f'Limita os históricos a {QUICK_MAX_SIZE} rodadas.')
+    parser.add_argument('--filter', help='Só executa casos cujo nome contém este texto.')
+    parser.add_argument('--save', metavar='ARQUIVO', help='Grava os tempos como linha de base (JSON).')
+    parser.add_argument('--compare', metavar='ARQUIVO', help='Compara com uma linha de base gravada.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Aumento relativo tolerado antes de acusar regressão (padrão: {DEFAULT_THRESHOLD}).')
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in SIZES if not args.quick or size <= QUICK_MAX_SIZE]
+    current = run(sizes, args.filter)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as stream:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'seconds_per_call': current,
+            }, stream, indent=2, sort_keys=True)
+        print(f"Linha de base gravada em {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as stream:
+            baseline = json.load(stream)['seconds_per_call']
+        regressions = compare(current, baseline, args.threshold)
+        for name, base, seconds, ratio in regressions:
+            print(f"REGRESSÃO {name}: {base * 1e6:.2f} µs -> {seconds * 1e6:.2f} µs ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"Nenhuma regressão acima de {args.threshold:.0%} em {len(current)} casos.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
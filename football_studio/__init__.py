@@ -0,0 +1,45 @@
+"""
+Motor de análise do Football Studio, importável sem Streamlit.
+
+A interface em teste_teste.py é apenas uma camada fina sobre este pacote; jobs em lote e
+workers podem usar as funções diretamente ou a linha de comando (python -m football_studio).
+"""
+
+from football_studio.common import (
+    NUM_RECENT_RESULTS_FOR_ANALYSIS,
+    MAX_HISTORY_TO_STORE,
+    NUM_HISTORY_TO_DISPLAY,
+    EMOJIS_PER_ROW,
+    MIN_RESULTS_FOR_SUGGESTION,
+    get_color,
+    get_color_emoji,
+    get_result_emoji,
+)
+from football_studio.history import ResultHistory, HistoryView
+from football_studio.analysis import (
+    analyze_surf,
+    analyze_colors,
+    find_complex_patterns,
+    find_block_patterns,
+    analyze_break_probability,
+    analyze_draw_specifics,
+    analyze_transitions,
+    analyze_longest_match,
+    analyze_windows,
+    ANALYZERS,
+    generate_advanced_suggestion,
+    PATTERN_RULES,
+    check_guarantee_status,
+    analyze_all,
+    suggest,
+)
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.runs import RunHistory, run_lengths
+from football_studio.markov import TransitionIndex
+from football_studio.suffix import SuffixIndex
+from football_studio.windows import WindowStats
+from football_studio.bitpacked import PackedHistory
+from football_studio.patterns import Pattern, PATTERN_LABELS, pattern_label, break_label
+from football_studio.rules import WindowRule, WINDOW_RULES, PATTERN_TABLE, compile_rules
+from football_studio.parsing import parse_results
+from football_studio.params import SuggestionParams, DEFAULT_PARAMS, params_from_dict
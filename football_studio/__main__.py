@@ -0,0 +1,5 @@
+import sys
+
+from football_studio.cli import main
+
+sys.exit(main())
@@ -0,0 +1,613 @@
+"""Funções de análise e geração de sugestões (independentes de Streamlit)."""
+
+import collections
+
+from football_studio.common import (
+    NUM_RECENT_RESULTS_FOR_ANALYSIS,
+    MIN_RESULTS_FOR_SUGGESTION,
+    TRANSITION_ORDER,
+    MIN_TRANSITION_SAMPLES,
+    MAX_MATCH_LENGTH,
+    STAT_WINDOWS,
+    RESULTS,
+    RESULT_CODES,
+    get_color,
+)
+from football_studio.rules import window_matches
+from football_studio.runs import BLOCK_PATTERN_SPAN, BLOCK_PATTERN_RUNS, run_lengths, current_run_length
+from football_studio.params import DEFAULT_PARAMS
+from football_studio.patterns import Pattern, pattern_label, break_label
+from football_studio.windows import window_row
+
+# --- Funções de Análise ---
+
+def analyze_surf(results):
+    """
+    Analisa os padrões de "surf" (sequências de Home/Away/Draw)
+    nos últimos N resultados para 'current' e no histórico completo para 'max'.
+    """
+    current = {'home': 0, 'away': 0, 'draw': 0}
+    maxima = {'home': 0, 'away': 0, 'draw': 0}
+
+    # Uma passada pelas sequências (resultado, tamanho) em vez de uma por rodada
+    runs = run_lengths(results)
+    if runs:
+        current[runs[0][0]] = runs[0][1]
+    for result, length in runs:
+        if length > maxima[result]:
+            maxima[result] = length
+
+    return {
+        'current_home_sequence': current['home'],
+        'current_away_sequence': current['away'],
+        'current_draw_sequence': current['draw'],
+        'max_home_sequence': maxima['home'],
+        'max_away_sequence': maxima['away'],
+        'max_draw_sequence': maxima['draw']
+    }
+
+def analyze_colors(results):
+    """Analisa a contagem e as sequências de cores nos últimos N resultados."""
+    relevant_results = results[:NUM_RECENT_RESULTS_FOR_ANALYSIS]
+    if not relevant_results:
+        return {'red': 0, 'blue': 0, 'yellow': 0, 'current_color': '', 'streak': 0, 'color_pattern_27': ''}
+
+    color_counts = {'red': 0, 'blue': 0, 'yellow': 0}
+
+    for result in relevant_results:
+        color = get_color(result)
+        color_counts[color] += 1
+
+    current_color = get_color(results[0]) if results else ''
+    streak = current_run_length(results)
+
+    color_pattern_27 = ''.join([get_color(r)[0].upper() for r in relevant_results])
+
+    return {
+        'red': color_counts['red'],
+        'blue': color_counts['blue'],
+        'yellow': color_counts['yellow'],
+        'current_color': current_color,
+        'streak': streak,
+        'color_pattern_27': color_pattern_27
+    }
+
+def find_complex_patterns(results):
+    """
+    Identifica padrões de quebra e padrões específicos (2x2, 3x3, 3x1, 2x1, etc.)
+    nos últimos N resultados, incluindo o Padrão Escada.
+    """
+    patterns = collections.defaultdict(int)
+    relevant_results = results[:NUM_RECENT_RESULTS_FOR_ANALYSIS]
+
+    colors = [get_color(r) for r in relevant_results]
+
+    # Regras por posição compiladas em rules.PATTERN_TABLE; as chaves de cada grupo entram na
+    # ordem das posições e o grupo 1 (Dupla Repetida) só depois de todo o grupo 0
+    groups = collections.defaultdict(lambda: collections.defaultdict(int))
+    for position_matches in window_matches(colors):
+        for kind, size, group, rank, key in position_matches:
+            if kind == 'p':
+                groups[group][key] += 1
+    for group in sorted(groups):
+        for key, count in groups[group].items():
+            patterns[key] += count
+
+    find_block_patterns(run_lengths(relevant_results, BLOCK_PATTERN_SPAN), min(len(relevant_results), BLOCK_PATTERN_SPAN),
+                        patterns)
+
+    return dict(patterns)
+
+def find_block_patterns(runs, size, patterns):
+    """
+    Padrões ancorados no resultado mais recente (Bloco, Bloco Alternado e Escada), avaliados sobre
+    as sequências (resultado, tamanho) das 'size' cores mais recentes (no máximo BLOCK_PATTERN_SPAN),
+    da mais recente para a mais antiga. Só as BLOCK_PATTERN_RUNS primeiras sequências importam;
+    as ocorrências são somadas em 'patterns'.
+    """
+    runs = runs[:BLOCK_PATTERN_RUNS]
+    colors = [get_color(result) for result, _ in runs]
+    lengths = [length for _, length in runs]
+
+    for block_size in [2, 3]:
+        # Dois blocos de cores diferentes: a sequência atual tem exatamente 'block_size' resultados
+        # e a anterior pelo menos 'block_size'
+        if len(runs) < 2 or lengths[0] != block_size or lengths[1] < block_size:
+            continue
+        if size >= 4 * block_size:
+            # Quatro blocos alternados: os dois do meio também com exatamente 'block_size'
+            if len(runs) == 4 and lengths[1] == block_size and lengths[2] == block_size and \
+               lengths[3] >= block_size and colors[2] == colors[0] and colors[3] == colors[1]:
+                patterns[Pattern('bloco_alternado', (colors[0], colors[1]), block_size)] += 1
+        else:
+            patterns[Pattern('bloco', (colors[0], colors[1]), block_size)] += 1
+
+    # Padrão Escada Crescente 1-2-3: a regra por posição exigia colors[5] != colors[0] e
+    # colors[0] == colors[5] ao mesmo tempo, então nunca ocorria e não tem equivalente aqui.
+
+    # Padrão Escada Decrescente 3-2-1: sequências de 3 e 2 seguidas da cor da primeira
+    if len(runs) >= 3 and lengths[0] == 3 and lengths[1] == 2 and colors[2] == colors[0]:
+        patterns[Pattern('escada_decrescente', (colors[0], colors[1], colors[2]), 3)] += 1
+
+def analyze_break_probability(results):
+    """Analisa a probabilidade de quebra com base no histórico dos últimos N resultados."""
+    relevant_results = results[:NUM_RECENT_RESULTS_FOR_ANALYSIS]
+    if not relevant_results or len(relevant_results) < 2:
+        return {'break_chance': 0, 'last_break': ()}
+    
+    breaks = 0
+    total_sequences_considered = 0
+    
+    for i in range(len(relevant_results) - 1):
+        if get_color(relevant_results[i]) != get_color(relevant_results[i+1]):
+            breaks += 1
+        total_sequences_considered += 1 # Conta cada transição como uma sequência considerada
+            
+    break_chance = (breaks / total_sequences_considered) * 100 if total_sequences_considered > 0 else 0
+
+    last_break = () # (cor anterior, cor atual) quando o último resultado quebrou a sequência
+    if len(results) >= 2 and get_color(results[0]) != get_color(results[1]):
+        last_break = (get_color(results[1]), get_color(results[0]))
+    
+    return {
+        'break_chance': round(break_chance, 2),
+        'last_break': last_break
+    }
+
+def analyze_draw_specifics(results):
+    """Análise específica para empates nos últimos N resultados e padrões de recorrência."""
+    relevant_results = results[:NUM_RECENT_RESULTS_FOR_ANALYSIS]
+    if not relevant_results:
+        return {'draw_frequency_27': 0, 'time_since_last_draw': -1, 'draw_patterns': {}, 'recurrent_draw': False}
+
+    draw_count_27 = relevant_results.count('draw')
+    draw_frequency_27 = (draw_count_27 / len(relevant_results)) * 100 if len(relevant_results) > 0 else 0
+
+    time_since_last_draw = -1
+    for i, result in enumerate(results): 
+        if result == 'draw':
+            time_since_last_draw = i
+            break
+            
+    draw_patterns_found = collections.defaultdict(int)
+    for position_matches in window_matches([get_color(r) for r in relevant_results]):
+        for kind, size, group, rank, key in position_matches:
+            if kind == 'd':
+                draw_patterns_found[key] += 1
+
+    recurrent_draw = False
+    if draw_count_27 > 1: 
+        draw_indices = [i for i, r in enumerate(relevant_results) if r == 'draw']
+        
+        if len(draw_indices) >= 2:
+            intervals = []
+            for i in range(1, len(draw_indices)):
+                intervals.append(abs(draw_indices[i-1] - draw_indices[i])) 
+            
+            # Se a maioria dos intervalos entre empates for 5 ou menos
+            if intervals and sum(1 for x in intervals if x <= 5) / len(intervals) >= 0.6: 
+                recurrent_draw = True
+
+    return {
+        'draw_frequency_27': round(draw_frequency_27, 2),
+        'time_since_last_draw': time_since_last_draw,
+        'draw_patterns': dict(draw_patterns_found),
+        'recurrent_draw': recurrent_draw
+    }
+
+def analyze_transitions(results):
+    """
+    O que veio depois do contexto atual em todo o histórico: usa o maior contexto (últimos 1 a
+    TRANSITION_ORDER resultados) com pelo menos MIN_TRANSITION_SAMPLES ocorrências anteriores.
+    Sem contexto suficiente, 'order' é 0 e 'next_counts' são as contagens gerais.
+    """
+    sequence = list(reversed(results)) # Do mais antigo para o mais recente
+    base_counts = {result: 0 for result in RESULTS}
+    for result in sequence:
+        base_counts[result] += 1
+
+    for order in range(min(TRANSITION_ORDER, len(sequence) - 1), 0, -1):
+        context = sequence[len(sequence) - order:]
+        next_counts = {result: 0 for result in RESULTS}
+        for i in range(order, len(sequence)):
+            if sequence[i - order:i] == context:
+                next_counts[sequence[i]] += 1
+        samples = sum(next_counts.values())
+        if samples >= MIN_TRANSITION_SAMPLES:
+            return {
+                'order': order,
+                'context': ''.join(get_color(r)[0].upper() for r in reversed(context)),
+                'next_counts': next_counts,
+                'samples': samples,
+                'base_counts': base_counts,
+            }
+    return {'order': 0, 'context': '', 'next_counts': dict(base_counts), 'samples': len(sequence), 'base_counts': base_counts}
+
+def analyze_longest_match(results):
+    """
+    Maior trecho final do histórico (até MAX_MATCH_LENGTH resultados) que já tinha ocorrido antes,
+    quantas vezes ocorreu e o que veio depois de cada ocorrência.
+    """
+    sequence = list(reversed(results)) # Do mais antigo para o mais recente
+    length = 0
+    next_counts = {result: 0 for result in RESULTS}
+    for size in range(1, min(MAX_MATCH_LENGTH, len(sequence)) + 1):
+        context = sequence[len(sequence) - size:]
+        counts = {result: 0 for result in RESULTS}
+        for i in range(size, len(sequence)):
+            if sequence[i - size:i] == context:
+                counts[sequence[i]] += 1
+        if not any(counts.values()):
+            break
+        length = size
+        next_counts = counts
+    return {
+        'length': length,
+        'context': ''.join(get_color(r)[0].upper() for r in sequence[:len(sequence) - length - 1:-1]) if length else '',
+        'occurrences': sum(next_counts.values()),
+        'next_counts': next_counts,
+    }
+
+def analyze_windows(results, windows=STAT_WINDOWS):
+    """
+    Contagens por cor, frequência de empates e chance de quebra de cada janela de STAT_WINDOWS,
+    lado a lado. Uma passada monta as somas acumuladas a partir do resultado mais recente e cada
+    janela é uma diferença em tempo constante.
+    """
+    color_sums = [[0], [0], [0]] # color_sums[c][n]: resultados da cor c entre os n mais recentes
+    break_sums = [0] # break_sums[n]: quebras de cor entre os n mais recentes
+    previous = None
+    for result in results:
+        code = RESULT_CODES[result]
+        for color, sums in enumerate(color_sums):
+            sums.append(sums[-1] + (color == code))
+        break_sums.append(break_sums[-1] + (previous is not None and code != previous))
+        previous = code
+
+    rows = []
+    for window in windows:
+        size = len(results) if window is None else min(window, len(results))
+        rows.append(window_row(window, size, [sums[size] for sums in color_sums], break_sums[size]))
+    return rows
+
+def transition_signal(transition_analysis, params=DEFAULT_PARAMS):
+    """
+    (aposta, pontos, motivo) quando o resultado mais frequente após o contexto atual supera a sua
+    frequência geral por 'transition_min_lift'; None caso contrário.
+    """
+    if not transition_analysis or not transition_analysis['order']:
+        return None
+    samples = transition_analysis['samples']
+    total = sum(transition_analysis['base_counts'].values())
+    bet_type = max(RESULTS, key=lambda result: transition_analysis['next_counts'][result])
+    probability = transition_analysis['next_counts'][bet_type] / samples
+    base_probability = transition_analysis['base_counts'][bet_type] / total
+    if base_probability == 0 or probability < base_probability * params.transition_min_lift:
+        return None
+    color_name = {'home': 'Vermelho', 'away': 'Azul', 'draw': 'Empate'}[bet_type]
+    reason = (f"Transições: após '{transition_analysis['context']}' veio {color_name} "
+              f"em {probability * 100:.1f}% de {samples} vezes (geral: {base_probability * 100:.1f}%).")
+    return bet_type, params.transition_score, reason
+
+def match_signal(match_analysis, params=DEFAULT_PARAMS):
+    """
+    (aposta, pontos, motivo) quando o trecho final já ocorreu antes com pelo menos 'match_min_length'
+    resultados e 'match_min_occurrences' vezes, e uma fração 'match_min_share' delas foi seguida
+    pelo mesmo resultado; None caso contrário.
+    """
+    if not match_analysis or match_analysis['length'] < params.match_min_length:
+        return None
+    occurrences = match_analysis['occurrences']
+    if occurrences < params.match_min_occurrences:
+        return None
+    bet_type = max(RESULTS, key=lambda result: match_analysis['next_counts'][result])
+    share = match_analysis['next_counts'][bet_type] / occurrences
+    if share < params.match_min_share:
+        return None
+    color_name = {'home': 'Vermelho', 'away': 'Azul', 'draw': 'Empate'}[bet_type]
+    reason = (f"Repetição: os últimos {match_analysis['length']} resultados já ocorreram {occurrences} vezes "
+              f"e foram seguidos de {color_name} em {share * 100:.1f}% delas.")
+    return bet_type, params.match_score, reason
+
+# --- Regras de Sugestão por Tipo de Padrão ---
+
+# Cor -> aposta, para as regras de padrão (que só apostam em Casa ou Visitante)
+COLOR_BET_TYPES = {'red': 'home', 'blue': 'away'}
+COLOR_NAMES = {'red': 'Vermelho', 'blue': 'Azul'}
+
+def block_break_rule(pattern, count, recent_colors, current_streak, params):
+    """2x1 / 3x1: a cor atual completou o bloco do padrão, que costuma quebrar para a outra cor."""
+    from_color, to_color = pattern.colors
+    if from_color not in COLOR_BET_TYPES or to_color not in COLOR_BET_TYPES:
+        return None
+    if recent_colors[0] != from_color or current_streak != pattern.size:
+        return None
+    label = pattern_label(pattern)
+    if pattern.size == 2:
+        reason = f"Padrão '{label}' (2x1) recorrente ({count}x). Sugere quebra para {COLOR_NAMES[to_color]}."
+        return COLOR_BET_TYPES[to_color], params.pattern_2x1_score, reason
+    reason = f"Padrão '{label}' (3x1) altamente recorrente ({count}x). Forte sugestão de quebra para {COLOR_NAMES[to_color]}."
+    return COLOR_BET_TYPES[to_color], params.pattern_3x1_score, reason
+
+def block_repeat_rule(pattern, count, recent_colors, current_streak, params):
+    """2x2 / 3x3: os últimos resultados reproduzem o padrão, que pode se repetir ou continuar."""
+    first_color, second_color = pattern.colors
+    if first_color not in COLOR_BET_TYPES or second_color not in COLOR_BET_TYPES:
+        return None
+    label = pattern_label(pattern)
+    if pattern.size == 2:
+        if len(recent_colors) < 4 or recent_colors[:4] != [first_color, first_color, second_color, second_color]:
+            return None
+        sequence = f"{first_color.capitalize()} {first_color.capitalize()}"
+        reason = f"Padrão '{label}' (2x2) recorrente ({count}x). Pode repetir a sequência '{sequence}'."
+        return COLOR_BET_TYPES[first_color], params.pattern_2x2_score, reason
+    if len(recent_colors) < 6 or recent_colors[:5] != [first_color] * 3 + [second_color] * 2:
+        return None
+    sequence = " ".join([second_color.capitalize()] * 3)
+    reason = f"Padrão '{label}' (3x3) recorrente ({count}x). Pode continuar a sequência '{sequence}'."
+    return COLOR_BET_TYPES[second_color], params.pattern_3x3_score, reason
+
+def alternating_block_rule(pattern, count, recent_colors, current_streak, params):
+    """Bloco Alternado: o bloco atual está completo e o ciclo segue com a outra cor."""
+    if current_streak != pattern.size or len(recent_colors) < pattern.size:
+        return None
+    first_color, second_color = pattern.colors
+    current_block = recent_colors[:pattern.size]
+    if all(c == first_color for c in current_block):
+        next_color = second_color
+    elif all(c == second_color for c in current_block):
+        next_color = first_color
+    else:
+        return None
+    if next_color not in COLOR_BET_TYPES:
+        return None
+    reason = f"Padrão '{pattern_label(pattern)}' detectado. Espera-se a continuação do ciclo com {next_color.capitalize()}."
+    return COLOR_BET_TYPES[next_color], params.alternating_block_score, reason
+
+# Pattern.kind -> regra; cada regra recebe (pattern, contagem, cores mais recentes, sequência atual,
+# params) e devolve (aposta, pontos, motivo) ou None. Tipos sem regra não pontuam.
+PATTERN_RULES = {
+    'n_para_1': block_break_rule,
+    'n_para_n': block_repeat_rule,
+    'bloco_alternado': alternating_block_rule,
+}
+
+def window_signal(window_stats, params=DEFAULT_PARAMS):
+    """
+    (aposta, pontos, motivo) quando Vermelho ou Azul está abaixo de 'imbalance_low_pct' em todas as
+    janelas completas com pelo menos 'multi_window_min_size' resultados (no mínimo duas); None caso
+    contrário.
+    """
+    rows = [
+        row for row in window_stats or ()
+        if row['size'] >= params.multi_window_min_size and row['window'] in (None, row['size'])
+    ]
+    if len(rows) < 2:
+        return None
+    for bet_type, color in (('home', 'red'), ('away', 'blue')):
+        if all(row[color] / row['size'] * 100 < params.imbalance_low_pct for row in rows):
+            sizes = ", ".join(str(row['size']) for row in rows)
+            reason = (f"Desequilíbrio em várias janelas: {COLOR_NAMES[color]} abaixo de {params.imbalance_low_pct}% "
+                      f"nos últimos {sizes} resultados.")
+            return bet_type, params.multi_window_score, reason
+    return None
+
+def generate_advanced_suggestion(results, surf_analysis, color_analysis, complex_patterns, break_probability, draw_specifics,
+                                 transition_analysis=None, match_analysis=None, window_stats=None, params=DEFAULT_PARAMS):
+    """
+    Gera uma sugestão de aposta baseada em múltiplas análises usando um sistema de pontuação,
+    com foco em segurança e incorporando os novos padrões. Prioriza sugestões mais fortes e evita conflitos.
+    Pesos e limiares vêm de 'params' (ver football_studio.params).
+    """
+    if not results or len(results) < MIN_RESULTS_FOR_SUGGESTION: 
+        return {'suggestion': f'Aguardando no mínimo {MIN_RESULTS_FOR_SUGGESTION} resultados para análise detalhada.', 'confidence': 0, 'reason': '', 'guarantee_pattern': 'N/A', 'bet_type': 'none'}
+
+    last_result = results[0]
+    last_result_color = get_color(last_result)
+    current_streak = color_analysis['streak']
+    
+    bet_scores = {'home': 0, 'away': 0, 'draw': 0}
+    reasons = collections.defaultdict(list)
+    guarantees = collections.defaultdict(list)
+
+    # --- Definição do Limiar de "Surf Longo/Crítico" ---
+    MIN_CRITICAL_SURF_THRESHOLD = params.critical_surf_threshold
+
+    # --- Pontuação para Continuação de Surf (a partir de 4x até o limiar crítico) ---
+    # Prioriza continuar o surf se ele não atingiu o ponto de "alto risco de quebra"
+    if current_streak >= params.continuation_min_streak and current_streak < MIN_CRITICAL_SURF_THRESHOLD:
+        score_for_continuation = params.continuation_base_score # Pontos base para seguir o surf
+        # Aumenta a pontuação progressivamente: 4x=60, 5x=70, 6x=80
+        score_for_continuation += (current_streak - params.continuation_min_streak) * params.continuation_step_score
+
+        if last_result_color == 'red':
+            bet_scores['home'] += score_for_continuation
+            reasons['home'].append(f"Continuação de Surf: Vermelho em sequência de {current_streak}x. Seguir a tendência observada.")
+            guarantees['home'].append(f"Continuação de Surf ({last_result_color.capitalize()})")
+        elif last_result_color == 'blue':
+            bet_scores['away'] += score_for_continuation
+            reasons['away'].append(f"Continuação de Surf: Azul em sequência de {current_streak}x. Seguir a tendência observada.")
+            guarantees['away'].append(f"Continuação de Surf ({last_result_color.capitalize()})")
+        # Para Empate, não "surfamos" ativamente, pois aposta é mais específica.
+
+    # --- Pontuação para Quebra de Surf (Surf Longo/Crítico ou Recorde Histórico) ---
+    # Só adicionamos pontos para quebra se a sequência atingiu o limiar crítico OU o máximo histórico
+    if last_result_color == 'red':
+        if current_streak >= MIN_CRITICAL_SURF_THRESHOLD: 
+            # Verifica se já há uma pontuação alta para quebra para não somar desnecessariamente
+            if bet_scores['away'] < params.long_break_score:
+                bet_scores['away'] = max(bet_scores['away'], params.long_break_score) # Garante que seja pelo menos 130
+            reasons['away'].append(f"ALERTA DE QUEBRA: Sequência de Vermelho excepcionalmente longa ({current_streak}x). Forte sugestão de quebra para Azul.")
+            guarantees['away'].append(f"Quebra de Surf Longo ({last_result_color.capitalize()})")
+        if surf_analysis['max_home_sequence'] > 0 and current_streak >= surf_analysis['max_home_sequence'] and current_streak >= params.record_break_min_streak:
+            # Garante que essa pontuação (150) sobrescreva ou seja adicionada corretamente
+            if bet_scores['away'] < params.record_break_score: # Se já pontuou 130, garante que a nova pontuação seja 150
+                bet_scores['away'] = max(bet_scores['away'], params.record_break_score)
+            reasons['away'].append(f"ALERTA MÁXIMO DE QUEBRA: Sequência de Vermelho ({current_streak}x) atingiu/superou o máximo histórico ({surf_analysis['max_home_sequence']}x).")
+            guarantees['away'].append(f"Quebra de Surf Recorde ({last_result_color.capitalize()})")
+
+    elif last_result_color == 'blue':
+        if current_streak >= MIN_CRITICAL_SURF_THRESHOLD: 
+            if bet_scores['home'] < params.long_break_score:
+                bet_scores['home'] = max(bet_scores['home'], params.long_break_score)
+            reasons['home'].append(f"ALERTA DE QUEBRA: Sequência de Azul excepcionalmente longa ({current_streak}x). Forte sugestão de quebra para Vermelho.")
+            guarantees['home'].append(f"Quebra de Surf Longo ({last_result_color.capitalize()})")
+        if surf_analysis['max_away_sequence'] > 0 and current_streak >= surf_analysis['max_away_sequence'] and current_streak >= params.record_break_min_streak:
+            if bet_scores['home'] < params.record_break_score:
+                bet_scores['home'] = max(bet_scores['home'], params.record_break_score)
+            reasons['home'].append(f"ALERTA MÁXIMO DE QUEBRA: Sequência de Azul ({current_streak}x) atingiu/superou o máximo histórico ({surf_analysis['max_away_sequence']}x).")
+            guarantees['home'].append(f"Quebra de Surf Recorde ({last_result_color.capitalize()})")
+
+    # Para Empate, a lógica de quebra é a mesma, mas não temos uma aposta "seguir empate" primária forte aqui
+    elif last_result_color == 'yellow' and surf_analysis['max_draw_sequence'] > 0 and current_streak >= surf_analysis['max_draw_sequence'] and current_streak >= params.draw_record_break_min_streak:
+        # A pontuação para quebra de empate é distribuída, não diretamente para uma cor.
+        bet_scores['home'] += params.draw_record_break_score
+        bet_scores['away'] += params.draw_record_break_score
+        reasons['home'].append(f"Quebra de Surf: Sequência atual de Empate ({current_streak}x) atingiu ou superou o máximo histórico.")
+        reasons['away'].append(f"Quebra de Surf: Sequência atual de Empate ({current_streak}x) atingiu ou superou o máximo histórico.")
+        guarantees['home'].append(f"Quebra de Surf Max (Empate)")
+        guarantees['away'].append(f"Quebra de Surf Max (Empate)")
+
+    # --- Nível 2: Padrões Recorrentes e Fortes (Pontuação 70-130) ---
+    # 2. Reação a Quebra Recente (Se houve quebra, e o próximo resultado é o esperado pela quebra)
+    last_break = break_probability['last_break']
+    if last_break and len(results) >= 2:
+        to_color = last_break[1]
+        if to_color in COLOR_BET_TYPES:
+            bet_scores[COLOR_BET_TYPES[to_color]] += params.break_reaction_score
+            reasons[COLOR_BET_TYPES[to_color]].append(f"Aposta a favor da recente quebra de tendência: {break_label(last_break)}.")
+
+    # 3. Padrões recorrentes (2x1, 3x1, 2x2, 3x3, Bloco Alternado) - Se há ocorrências suficientes e o cenário é o esperado.
+    # Cada padrão vai direto para a regra do seu tipo em PATTERN_RULES.
+    recent_colors = [get_color(r) for r in results[:6]]
+    for pattern, count in complex_patterns.items():
+        rule = PATTERN_RULES.get(pattern.kind)
+        if rule is None or count < params.pattern_min_count:
+            continue
+        signal = rule(pattern, count, recent_colors, current_streak, params)
+        if signal is not None:
+            bet_type, score, reason = signal
+            bet_scores[bet_type] += score
+            reasons[bet_type].append(reason)
+            guarantees[bet_type].append(pattern_label(pattern))
+
+    # --- Nível 3: Análise de Frequência e Probabilidade (Pontuação 30-70) ---
+
+    # 6. Frequência de Cores Recentes (Desequilíbrio de curto prazo)
+    total_relevant = color_analysis['red'] + color_analysis['blue'] + color_analysis['yellow']
+    if total_relevant > 0:
+        red_pct = (color_analysis['red'] / total_relevant) * 100
+        blue_pct = (color_analysis['blue'] / total_relevant) * 100
+
+        if red_pct < params.imbalance_low_pct and blue_pct > params.imbalance_high_pct:
+            bet_scores['home'] += params.imbalance_score
+            reasons['home'].append(f"Desequilíbrio recente: Vermelho ({red_pct:.1f}%) está sub-representado nos últimos {params.window} resultados.")
+        elif blue_pct < params.imbalance_low_pct and red_pct > params.imbalance_high_pct:
+            bet_scores['away'] += params.imbalance_score
+            reasons['away'].append(f"Desequilíbrio recente: Azul ({blue_pct:.1f}%) está sub-representado nos últimos {params.window} resultados.")
+    
+    # 7. Empate Recorrente / Empate "Atrasado"
+    if draw_specifics['recurrent_draw']:
+        # Pontuação ligeiramente reduzida para 60 para não dominar outras sugestões fortes.
+        bet_scores['draw'] += params.recurrent_draw_score
+        reasons['draw'].append(f"Empate Recorrente: Padrão de empates em intervalos curtos detectado.")
+        guarantees['draw'].append("Empate Recorrente")
+    
+    if draw_specifics['time_since_last_draw'] != -1 and draw_specifics['time_since_last_draw'] >= params.overdue_draw_rounds:
+        bet_scores['draw'] += params.overdue_draw_score
+        reasons['draw'].append(f"Empate 'Atrasado': {draw_specifics['time_since_last_draw']} rodadas sem empate. Probabilidade crescente.")
+        guarantees['draw'].append("Empate Atrasado")
+
+    # 8. Transições de ordem k sobre todo o histórico
+    signal = transition_signal(transition_analysis, params)
+    if signal is not None:
+        bet_type, score, reason = signal
+        bet_scores[bet_type] += score
+        reasons[bet_type].append(reason)
+        guarantees[bet_type].append(f"Transição Ordem {transition_analysis['order']}")
+
+    # 9. Repetição do trecho final do histórico
+    signal = match_signal(match_analysis, params)
+    if signal is not None:
+        bet_type, score, reason = signal
+        bet_scores[bet_type] += score
+        reasons[bet_type].append(reason)
+        guarantees[bet_type].append(f"Repetição de {match_analysis['length']}")
+
+    # 10. Desequilíbrio de cores confirmado em várias janelas
+    signal = window_signal(window_stats, params)
+    if signal is not None:
+        bet_type, score, reason = signal
+        bet_scores[bet_type] += score
+        reasons[bet_type].append(reason)
+        guarantees[bet_type].append("Desequilíbrio em Várias Janelas")
+
+    # --- Determinar a Sugestão Final ---
+    
+    max_score = 0
+    suggested_bet_type = 'none'
+    
+    for bet_type, score in bet_scores.items():
+        if score > max_score:
+            max_score = score
+            suggested_bet_type = bet_type
+        # Em caso de empate de pontuação, prioriza Casa/Visitante sobre Empate, e Casa sobre Visitante (arbitrário, pode ser ajustado)
+        elif score == max_score:
+            if suggested_bet_type == 'draw' and bet_type != 'draw': 
+                max_score = score
+                suggested_bet_type = bet_type
+            elif suggested_bet_type == 'away' and bet_type == 'home': 
+                max_score = score
+                suggested_bet_type = bet_type
+
+    if suggested_bet_type == 'none' or max_score < params.min_suggestion_score:
+        return {'suggestion': 'Manter Observação', 'confidence': 0, 'reason': 'Nenhum padrão forte ou combinação de padrões detectada.', 'guarantee_pattern': 'N/A', 'bet_type': 'none'}
+
+    # Concatena todas as razões para a sugestão final
+    final_reason = " ".join(reasons[suggested_bet_type])
+    final_guarantee = ", ".join(guarantees[suggested_bet_type])
+
+    confidence = min(params.max_confidence, max(0, int(max_score * params.confidence_factor))) # Ajusta a confiança para ser entre 0-95%
+
+    return {
+        'suggestion': suggested_bet_type.upper(),
+        'confidence': confidence,
+        'reason': final_reason,
+        'guarantee_pattern': final_guarantee if final_guarantee else 'N/A',
+        'bet_type': suggested_bet_type
+    }
+
+def check_guarantee_status(latest_result, suggested_bet_type, guarantee_pattern):
+    """Verifica se a aposta sugerida pelo 'guarantee_pattern' foi bem-sucedida."""
+    if suggested_bet_type == 'none' or guarantee_pattern == 'N/A' or not latest_result:
+        return {'status': 'N/A', 'message': ''}
+
+    # bet_type usa os mesmos nomes dos resultados ('home', 'away', 'draw'), não as cores
+    if suggested_bet_type == latest_result:
+        return {'status': 'SUCESSO', 'message': f"Aposta em {suggested_bet_type.upper()} foi bem-sucedida!"}
+    else:
+        return {'status': 'FALHA', 'message': f"Aposta em {suggested_bet_type.upper()} falhou. Resultado foi {latest_result.upper()}."}
+
+# Análises executadas por analyze_all, na ordem de argumentos de generate_advanced_suggestion
+ANALYZERS = (
+    analyze_surf,
+    analyze_colors,
+    find_complex_patterns,
+    analyze_break_probability,
+    analyze_draw_specifics,
+    analyze_transitions,
+    analyze_longest_match,
+    analyze_windows,
+)
+
+def analyze_all(results):
+    """
+    Executa todas as análises sobre o histórico (mais recente primeiro), na ordem de argumentos
+    esperada por generate_advanced_suggestion: surf, cores, padrões complexos, quebra, empates,
+    transições, maior repetição do trecho final e estatísticas por janela.
+    """
+    return tuple(analyzer(results) for analyzer in ANALYZERS)
+
+def suggest(results):
+    """Atalho que executa todas as análises e devolve a sugestão avançada."""
+    return generate_advanced_suggestion(results, *analyze_all(results))
@@ -0,0 +1,180 @@
+"""
+Backtest: reproduz um histórico gravado rodada a rodada pelo pipeline completo de análise e por
+generate_advanced_suggestion, comparando cada sugestão com o resultado seguinte.
+
+O histórico é dividido em blocos processados em paralelo. Cada bloco começa com um aquecimento
+de MAX_HISTORY_TO_STORE - 1 resultados, de modo que o estado analisado em cada rodada (janela de
+27, máximos históricos, tempo desde o último empate) é o mesmo de uma execução sequencial.
+
+Uso: python -m football_studio.backtest historico.csv [--workers N] [--chunk-size N] [--json]
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+
+from football_studio.common import MAX_HISTORY_TO_STORE, MIN_RESULTS_FOR_SUGGESTION, RESULTS, CONFIDENCE_BUCKET_SIZE
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.analysis import generate_advanced_suggestion
+from football_studio.parsing import load_results, encode_results
+
+def empty_stats():
+    """Contadores parciais de um bloco; somados por merge_stats."""
+    return {
+        'rounds': 0, # Rodadas com sugestão avaliada (incluindo 'Manter Observação')
+        'bets': 0,
+        'hits': 0,
+        'by_bet_type': {}, # bet_type -> [apostas, acertos]
+        'calibration': {}, # faixa de confiança -> [apostas, acertos, soma das confianças]
+        'patterns': {}, # componente de guarantee_pattern -> [apostas, acertos]
+    }
+
+def record_round(stats, suggestion, outcome):
+    """Acumula uma sugestão e o resultado que veio a seguir."""
+    stats['rounds'] += 1
+    bet_type = suggestion['bet_type']
+    if bet_type == 'none':
+        return
+    hit = int(bet_type == outcome)
+    stats['bets'] += 1
+    stats['hits'] += hit
+
+    by_type = stats['by_bet_type'].setdefault(bet_type, [0, 0])
+    by_type[0] += 1
+    by_type[1] += hit
+
+    bucket = suggestion['confidence'] // CONFIDENCE_BUCKET_SIZE * CONFIDENCE_BUCKET_SIZE
+    calibration = stats['calibration'].setdefault(bucket, [0, 0, 0])
+    calibration[0] += 1
+    calibration[1] += hit
+    calibration[2] += suggestion['confidence']
+
+    if suggestion['guarantee_pattern'] != 'N/A':
+        for pattern in suggestion['guarantee_pattern'].split(', '):
+            counters = stats['patterns'].setdefault(pattern, [0, 0])
+            counters[0] += 1
+            counters[1] += hit
+
+def merge_stats(total, partial):
+    """Soma os contadores de 'partial' em 'total'."""
+    for key in ('rounds', 'bets', 'hits'):
+        total[key] += partial[key]
+    for key in ('by_bet_type', 'calibration', 'patterns'):
+        for name, counters in partial[key].items():
+            merged = total[key].setdefault(name, [0] * len(counters))
+            for i, value in enumerate(counters):
+                merged[i] += value
+    return total
+
+def backtest_chunk(encoded, first_round, warmup_start, max_history=MAX_HISTORY_TO_STORE):
+    """
+    Avalia as rodadas [first_round, len - 1) de 'encoded' (bytes, do mais antigo para o mais recente).
+    A posição 0 de 'encoded' corresponde à rodada absoluta 'warmup_start'; os resultados antes de
+    'first_round' servem apenas de aquecimento.
+    """
+    stats = empty_stats()
+    history = ResultHistory(max_history)
+    analyzer = IncrementalAnalyzer(max_history)
+    for position in range(len(encoded) - 1):
+        result = RESULTS[encoded[position]]
+        history.push(result)
+        analyzer.push(result)
+        if warmup_start + position < first_round or len(history) < MIN_RESULTS_FOR_SUGGESTION:
+            continue
+        suggestion = generate_advanced_suggestion(history, *analyzer.analyze_all())
+        record_round(stats, suggestion, RESULTS[encoded[position + 1]])
+    return stats
+
+def run_backtest(results, workers=None, chunk_size=50_000, max_history=MAX_HISTORY_TO_STORE):
+    """
+    Executa o backtest sobre 'results' (do mais antigo para o mais recente) e devolve os contadores
+    agregados. Com workers=1 roda no processo atual.
+    """
+    encoded = encode_results(results)
+    warmup = max_history - 1
+    jobs = []
+    for first_round in range(0, max(len(encoded) - 1, 0), chunk_size):
+        warmup_start = max(0, first_round - warmup)
+        # Inclui o resultado seguinte à última rodada do bloco, usado para avaliar a sugestão
+        jobs.append((encoded[warmup_start:first_round + chunk_size + 1], first_round, warmup_start, max_history))
+
+    stats = empty_stats()
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            merge_stats(stats, backtest_chunk(*job))
+        return stats
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(backtest_chunk, *zip(*jobs)):
+            merge_stats(stats, partial)
+    return stats
+
+def percentage(hits, total):
+    return round(hits / total * 100, 2) if total else 0
+
+def build_report(stats):
+    """Relatório com taxa de acerto geral, calibração da confiança e acerto por padrão de garantia."""
+    return {
+        'rounds': stats['rounds'],
+        'bets': stats['bets'],
+        'hits': stats['hits'],
+        'hit_rate': percentage(stats['hits'], stats['bets']),
+        'by_bet_type': {
+            bet_type: {'bets': bets, 'hits': hits, 'hit_rate': percentage(hits, bets)}
+            for bet_type, (bets, hits) in sorted(stats['by_bet_type'].items())
+        },
+        'calibration': [
+            {
+                'confidence': f"{bucket}-{bucket + CONFIDENCE_BUCKET_SIZE - 1}%",
+                'bets': bets,
+                'mean_confidence': round(confidence_sum / bets, 2),
+                'hit_rate': percentage(hits, bets),
+            }
+            for bucket, (bets, hits, confidence_sum) in sorted(stats['calibration'].items())
+        ],
+        'patterns': {
+            pattern: {'bets': bets, 'hits': hits, 'hit_rate': percentage(hits, bets)}
+            for pattern, (bets, hits) in sorted(stats['patterns'].items(), key=lambda item: -item[1][0])
+        },
+    }
+
+def format_report(report):
+    lines = [
+        f"Rodadas avaliadas: {report['rounds']}",
+        f"Apostas sugeridas: {report['bets']} - Acertos: {report['hits']} ({report['hit_rate']}%)",
+        "",
+        "Por tipo de aposta:",
+    ]
+    for bet_type, row in report['by_bet_type'].items():
+        lines.append(f"  {bet_type.upper():<6} {row['bets']:>9} apostas  {row['hit_rate']:>6}% acerto")
+    lines += ["", "Calibração da confiança:"]
+    for row in report['calibration']:
+        lines.append(f"  {row['confidence']:<8} {row['bets']:>9} apostas  confiança média {row['mean_confidence']:>6}%  acerto {row['hit_rate']:>6}%")
+    lines += ["", "Acerto por padrão de garantia:"]
+    for pattern, row in report['patterns'].items():
+        lines.append(f"  {pattern:<45} {row['bets']:>9} apostas  {row['hit_rate']:>6}% acerto")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='football_studio.backtest', description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('history', help='Histórico gravado (.csv/.txt em texto ou .bin/.log com um byte por rodada).')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Processos paralelos (padrão: número de CPUs).')
+    parser.add_argument('--chunk-size', type=int, default=50_000, help='Rodadas por bloco (padrão: 50000).')
+    parser.add_argument('--max-history', type=int, default=MAX_HISTORY_TO_STORE,
+                        help=f'Resultados mantidos no histórico, como no app (padrão: {MAX_HISTORY_TO_STORE}).')
+    parser.add_argument('--json', action='store_true', help='Imprime o relatório em JSON.')
+    args = parser.parse_args(argv)
+
+    try:
+        results = load_results(args.history)
+    except (OSError, ValueError) as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 2
+    report = build_report(run_backtest(results, args.workers, args.chunk_size, args.max_history))
+    print(json.dumps(report, ensure_ascii=False, indent=2) if args.json else format_report(report))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Detecção de padrões em lote com NumPy, para análise offline de históricos muito longos.
+
+As cores são codificadas como inteiros pequenos (0 = Red, 1 = Blue, 2 = Yellow) em ordem
+cronológica (do mais antigo para o mais recente). Cada regra de find_complex_patterns vira uma
+comparação entre cópias deslocadas do array, e as contagens por janela saem de somas acumuladas.
+A janela t corresponde ao histórico logo após o resultado t, ou seja, ao que
+find_complex_patterns recebe como results[:NUM_RECENT_RESULTS_FOR_ANALYSIS].
+
+Este módulo depende de NumPy e não é importado por football_studio/__init__.py.
+"""
+
+import numpy as np
+
+from football_studio.common import NUM_RECENT_RESULTS_FOR_ANALYSIS, RESULT_CODES
+from football_studio.patterns import Pattern
+from football_studio.rules import COLORS
+
+RED, BLUE, YELLOW = RESULT_CODES['home'], RESULT_CODES['away'], RESULT_CODES['draw']
+PAIRS = [(a, b) for a in range(3) for b in range(3) if a != b]
+
+# Famílias de padrões: (nome, tamanho da janela, Pattern a partir das cores a e b, combinações de cores possíveis).
+# Os tamanhos 'prefix' são avaliados apenas a partir do resultado mais recente da janela.
+FAMILIES = [
+    ('quebra_simples', 2, lambda a, b: Pattern('quebra_simples', (a, b), 1), PAIRS),
+    ('2x1', 3, lambda a, b: Pattern('n_para_1', (a, b), 2), PAIRS),
+    ('zig_zag', 3, lambda a, b: Pattern('zig_zag', (a, b, a), 1), PAIRS),
+    ('alternancia_empate', 3, lambda a, b: Pattern('alternancia_empate', (a, b), 1), [(RED, BLUE), (BLUE, RED)]),
+    ('3x1', 4, lambda a, b: Pattern('n_para_1', (a, b), 3), PAIRS),
+    ('2x2', 4, lambda a, b: Pattern('n_para_n', (a, b), 2), PAIRS),
+    ('espelho', 4, lambda a, b: Pattern('espelho', (a, b, b, a), 1), PAIRS),
+    ('onda', 4, lambda a, b: Pattern('onda', (a, b, b, a), 1), PAIRS),
+    ('3x3', 6, lambda a, b: Pattern('n_para_n', (a, b), 3), PAIRS),
+    ('dupla', 2, lambda a, b: Pattern('dupla', (a,), 2), [(c, c) for c in range(3)]),
+    ('bloco_2', 'prefix', lambda a, b: Pattern('bloco', (a, b), 2), PAIRS),
+    ('bloco_alternado_2', 'prefix', lambda a, b: Pattern('bloco_alternado', (a, b), 2), PAIRS),
+    ('bloco_3', 'prefix', lambda a, b: Pattern('bloco', (a, b), 3), PAIRS),
+    ('bloco_alternado_3', 'prefix', lambda a, b: Pattern('bloco_alternado', (a, b), 3), PAIRS),
+    ('escada_decrescente', 'prefix', lambda a, b: Pattern('escada_decrescente', (a, b, a), 3), PAIRS),
+]
+
+# Colunas das matrizes de contagem, na ordem de FAMILIES
+KEYS = []
+FAMILY_COLUMNS = {}
+for _name, _size, _make_pattern, _combos in FAMILIES:
+    _lookup = np.full((3, 3), -1, dtype=np.int16)
+    for _a, _b in _combos:
+        _lookup[_a, _b] = len(KEYS)
+        KEYS.append(_make_pattern(COLORS[_a], COLORS[_b]))
+    FAMILY_COLUMNS[_name] = _lookup
+
+def encode_results(results, newest_first=True):
+    """
+    Codifica resultados ('home'/'away'/'draw') em um array int8 cronológico.
+    Por padrão a entrada segue a ordem de st.session_state.results (mais recente primeiro).
+    """
+    codes = np.fromiter((RESULT_CODES.get(r, YELLOW) for r in results), dtype=np.int8)
+    return codes[::-1].copy() if newest_first else codes
+
+def lagged(codes, lag):
+    """Array com codes[t - lag] na posição t; posições sem dado recebem -1."""
+    shifted = np.full(len(codes), -1, dtype=np.int8)
+    if lag < len(codes):
+        shifted[lag:] = codes[:len(codes) - lag]
+    return shifted
+
+def family_matches(codes):
+    """
+    Para cada família, devolve (ocorreu, cor a, cor b) por posição s, onde s é o resultado
+    mais recente da janela de cores do padrão (color1 em find_complex_patterns).
+    """
+    c1, c2, c3, c4, c5, c6 = (lagged(codes, lag) for lag in range(6))
+    valid = {size: np.arange(len(codes)) >= size - 1 for size in (2, 3, 4, 6)}
+    return {
+        'quebra_simples': (valid[2] & (c1 != c2), c1, c2),
+        '2x1': (valid[3] & (c1 == c2) & (c1 != c3), c1, c3),
+        'zig_zag': (valid[3] & (c1 != c2) & (c2 != c3) & (c1 == c3), c1, c2),
+        'alternancia_empate': (valid[3] & (c2 == YELLOW) & (c1 != YELLOW) & (c3 != YELLOW) & (c1 != c3), c1, c3),
+        '3x1': (valid[4] & (c1 == c2) & (c2 == c3) & (c1 != c4), c1, c4),
+        '2x2': (valid[4] & (c1 == c2) & (c3 == c4) & (c1 != c3), c1, c3),
+        'espelho': (valid[4] & (c1 != c2) & (c2 == c3) & (c1 == c4), c1, c2),
+        'onda': (valid[4] & (c1 != c2) & (c2 == c3) & (c3 != c4) & (c1 == c4), c1, c2),
+        '3x3': (valid[6] & (c1 == c2) & (c2 == c3) & (c4 == c5) & (c5 == c6) & (c1 != c4), c1, c4),
+        'dupla': (valid[2] & (c1 == c2), c1, c1),
+    }
+
+def prefix_matches(codes, lengths):
+    """
+    Padrões ancorados no início da janela (find_block_patterns), para cada posição t.
+    'lengths' é o tamanho da janela em cada posição (min(t + 1, janela)).
+    """
+    c = [lagged(codes, lag) for lag in range(12)]
+
+    def uniform(start, size):
+        same = np.ones(len(codes), dtype=bool)
+        for j in range(start + 1, start + size):
+            same &= c[j] == c[start]
+        return same
+
+    matches = {}
+    for block_size in (2, 3):
+        pair = (lengths >= 4) & (lengths >= 2 * block_size) & uniform(0, block_size) & \
+            uniform(block_size, block_size) & (c[0] != c[block_size])
+        long_window = lengths >= 4 * block_size
+        alternated = uniform(2 * block_size, block_size) & uniform(3 * block_size, block_size) & \
+            (c[0] == c[2 * block_size]) & (c[block_size] == c[3 * block_size])
+        matches[f'bloco_alternado_{block_size}'] = (pair & long_window & alternated, c[0], c[block_size])
+        matches[f'bloco_{block_size}'] = (pair & ~long_window, c[0], c[block_size])
+
+    has_six = lengths >= 6
+    matches['escada_decrescente'] = (
+        has_six & (c[0] == c[1]) & (c[1] == c[2]) & (c[3] == c[4]) & (c[3] != c[0]) &
+        (c[5] != c[3]) & (c[5] == c[0]),
+        c[0], c[3]
+    )
+    return matches
+
+def window_pattern_counts(codes, window=NUM_RECENT_RESULTS_FOR_ANALYSIS, start=0, stop=None):
+    """
+    Matriz (janelas x len(KEYS)) com as contagens de find_complex_patterns para cada janela
+    t em [start, stop). Só lê codes[start - window + 1:stop], então pode ser chamada por blocos.
+    """
+    codes = np.asarray(codes, dtype=np.int8)
+    stop = len(codes) if stop is None else stop
+    offset = max(0, start - window + 1)
+    local = codes[offset:stop]
+    positions = np.arange(offset, stop)
+    lengths = np.minimum(positions + 1, window)
+    counts = np.zeros((max(0, stop - start), len(KEYS)), dtype=np.uint8 if window < 256 else np.int32)
+    if not len(counts):
+        return counts
+
+    # As janelas de tamanho 'size' contadas na janela t terminam em s >= t - window + size
+    sizes = {name: size for name, size, _, _ in FAMILIES}
+    ends = np.arange(start, stop)
+    for name, (matched, color_a, color_b) in family_matches(local).items():
+        columns = FAMILY_COLUMNS[name][np.where(matched, color_a, 0), np.where(matched, color_b, 0)]
+        low = np.maximum(ends - window + sizes[name], offset) - offset
+        high = ends + 1 - offset
+        for column in np.unique(columns[matched]):
+            cumulative = np.concatenate(([0], np.cumsum(matched & (columns == column), dtype=np.int64)))
+            counts[:, column] = cumulative[high] - cumulative[np.minimum(low, high)]
+
+    tail = slice(start - offset, stop - offset)
+    for name, (matched, color_a, color_b) in prefix_matches(local, lengths).items():
+        matched = matched[tail]
+        columns = FAMILY_COLUMNS[name][np.where(matched, color_a[tail], 0), np.where(matched, color_b[tail], 0)]
+        counts[np.nonzero(matched)[0], columns[matched]] += 1
+    return counts
+
+def iter_window_pattern_counts(codes, chunk_size=100_000, window=NUM_RECENT_RESULTS_FOR_ANALYSIS):
+    """Gera (início, matriz) por blocos de janelas, com memória limitada a 'chunk_size' linhas."""
+    for start in range(0, len(codes), chunk_size):
+        yield start, window_pattern_counts(codes, window, start, min(start + chunk_size, len(codes)))
+
+def history_pattern_counts(codes):
+    """Contagens de todos os padrões ao longo do histórico inteiro (uma única janela com tudo)."""
+    if len(codes) == 0:
+        return {}
+    return counts_to_dict(window_pattern_counts(codes, window=len(codes), start=len(codes) - 1)[0])
+
+def counts_to_dict(row):
+    """Converte uma linha da matriz no dicionário de find_complex_patterns (apenas contagens > 0)."""
+    return {KEYS[column]: int(row[column]) for column in np.nonzero(row)[0]}
@@ -0,0 +1,261 @@
+"""
+Núcleo de análise sobre o histórico empacotado em 2 bits por rodada, sem dependências.
+
+Os códigos de RESULT_CODES (0 = Red, 1 = Blue, 2 = Yellow) ficam em dois inteiros do Python: 'low'
+com o bit menos significativo de cada código e 'high' com o mais significativo. O bit i de cada
+inteiro é a rodada results[i] (bit 0 = resultado mais recente), então 'x >> k' alinha em i a cor
+de results[i + k] e uma operação sobre os inteiros compara todas as posições de uma vez, palavra
+a palavra, em C. As contagens saem de int.bit_count() e as posições de bit_length().
+
+Cada regra de rules.WINDOW_RULES é compilada na importação em conjunções do tipo
+red & (red >> 1) & (blue >> 2) (uma por combinação de cores que satisfaz a condição), de modo que
+Dupla, 2x1, 3x1, 2x2, Zig-Zag, Espelho e as demais acompanham a tabela de regras automaticamente.
+
+Serve para varrer o histórico inteiro (window=None) em vez de só os últimos 27 resultados, como
+alternativa em Python puro a batch.history_pattern_counts (NumPy). analyze_all() permite escolher,
+análise por análise, quais usam este núcleo.
+"""
+
+import collections
+import itertools
+
+from football_studio.common import NUM_RECENT_RESULTS_FOR_ANALYSIS, MAX_HISTORY_TO_STORE, RESULTS
+from football_studio.rules import WINDOW_RULES, COLORS
+from football_studio.runs import run_lengths, BLOCK_PATTERN_SPAN
+from football_studio import analysis
+
+LOW_BITS = {'home': '0', 'away': '1', 'draw': '0'}
+HIGH_BITS = {'home': '0', 'away': '0', 'draw': '1'}
+LOW_TABLE = bytes.maketrans(b'\x00\x01\x02', b'010')
+HIGH_TABLE = bytes.maketrans(b'\x00\x01\x02', b'001')
+
+def compile_bit_rules(rules):
+    """
+    Lista de (kind, group, rank, size, key, cores) com uma entrada por combinação de cores
+    (c[0], ..., c[size - 1]) que satisfaz a regra; 'rank' é a posição da regra na lista.
+    """
+    compiled = []
+    for rank, rule in enumerate(rules):
+        if rule.kind == 'b':
+            continue
+        for colors in itertools.product(COLORS, repeat=rule.size):
+            if rule.condition(colors):
+                compiled.append((rule.kind, rule.group, rank, rule.size, rule.key(colors), colors))
+    return compiled
+
+BIT_RULES = compile_bit_rules(WINDOW_RULES)
+
+class PackedHistory:
+    """Últimos 'max_history' resultados em dois planos de bits (bit 0 = mais recente)."""
+
+    def __init__(self, max_history=MAX_HISTORY_TO_STORE):
+        self.max_history = max_history
+        self.mask = (1 << max_history) - 1
+        self.low = 0
+        self.high = 0
+        self.size = 0
+
+    @classmethod
+    def from_results(cls, results, max_history=None):
+        """Empacota 'results' (mais recente primeiro, como st.session_state.results) de uma vez."""
+        results = list(results)
+        packed = cls(max(len(results), 1) if max_history is None else max_history)
+        results = results[:packed.max_history]
+        if results:
+            # int(texto, 2) lê o primeiro dígito como o bit mais significativo, ou seja, o mais antigo
+            packed.low = int(''.join(map(LOW_BITS.__getitem__, reversed(results))), 2)
+            packed.high = int(''.join(map(HIGH_BITS.__getitem__, reversed(results))), 2)
+        packed.size = len(results)
+        return packed
+
+    @classmethod
+    def from_codes(cls, codes, max_history=None):
+        """Empacota bytes de parsing.encode_results em ordem cronológica (mais antigo primeiro)."""
+        codes = bytes(codes)
+        packed = cls(max(len(codes), 1) if max_history is None else max_history)
+        codes = codes[max(0, len(codes) - packed.max_history):]
+        if codes:
+            packed.low = int(codes.translate(LOW_TABLE), 2)
+            packed.high = int(codes.translate(HIGH_TABLE), 2)
+        packed.size = len(codes)
+        return packed
+
+    def push(self, result):
+        """Inclui o resultado mais recente; o mais antigo sai quando o histórico está cheio."""
+        self.low = ((self.low << 1) | (result == 'away')) & self.mask
+        self.high = ((self.high << 1) | (result == 'draw')) & self.mask
+        self.size = min(self.size + 1, self.max_history)
+
+    def planes(self):
+        """Bits de cada cor na ordem de rules.COLORS: {'red': ..., 'blue': ..., 'yellow': ...}."""
+        red = ~(self.low | self.high) & ((1 << self.size) - 1)
+        return {'red': red, 'blue': self.low, 'yellow': self.high}
+
+    def code_at(self, position):
+        return (self.low >> position & 1) | (self.high >> position & 1) << 1
+
+    def recent(self, limit):
+        """Os 'limit' resultados mais recentes, mais recente primeiro."""
+        return [RESULTS[self.code_at(i)] for i in range(min(limit, self.size))]
+
+def window_size(packed, window):
+    return packed.size if window is None else min(window, packed.size)
+
+def low_mask(count):
+    """Bits 0 .. count - 1."""
+    return (1 << count) - 1 if count > 0 else 0
+
+def trailing_ones(bits):
+    return (bits ^ (bits + 1)).bit_length() - 1
+
+def longest_run(bits):
+    """Maior sequência de bits 1 consecutivos, em O(log n) operações sobre o inteiro inteiro."""
+    if not bits:
+        return 0
+    # levels[k]: posições onde começam pelo menos 2^k bits 1 seguidos
+    levels = [bits]
+    while True:
+        longer = levels[-1] & (levels[-1] >> (1 << (len(levels) - 1)))
+        if not longer:
+            break
+        levels.append(longer)
+    # Busca binária: estende o comprimento com as potências menores enquanto houver posição válida
+    length = 1 << (len(levels) - 1)
+    current = levels[-1]
+    for k in range(len(levels) - 2, -1, -1):
+        longer = current & (levels[k] >> length)
+        if longer:
+            current = longer
+            length += 1 << k
+    return length
+
+def break_bits(packed):
+    """Bit i ligado quando results[i] e results[i + 1] têm cores diferentes."""
+    differ = (packed.low ^ (packed.low >> 1)) | (packed.high ^ (packed.high >> 1))
+    return differ & low_mask(packed.size - 1)
+
+def rule_counts(packed, kind, window):
+    """
+    Contagens das regras 'kind' ('p' ou 'd') nas posições que cabem nos 'window' resultados mais
+    recentes, com as chaves na ordem em que a varredura posição a posição as inseriria.
+    """
+    size = window_size(packed, window)
+    planes = packed.planes()
+    counts = {}
+    first = {}
+    for rule_kind, group, rank, rule_size, key, colors in BIT_RULES:
+        if rule_kind != kind or rule_size > size:
+            continue
+        matched = low_mask(size - rule_size + 1)
+        for offset, color in enumerate(colors):
+            matched &= planes[color] >> offset
+            if not matched:
+                break
+        if not matched:
+            continue
+        counts[key] = counts.get(key, 0) + matched.bit_count()
+        order = (group, (matched & -matched).bit_length() - 1, rank)
+        first[key] = min(first.get(key, order), order)
+    return {key: counts[key] for key in sorted(counts, key=first.__getitem__)}
+
+def analyze_surf(packed):
+    """Equivalente a analysis.analyze_surf."""
+    planes = packed.planes()
+    current = {'home': 0, 'away': 0, 'draw': 0}
+    if packed.size:
+        code = packed.code_at(0)
+        current[RESULTS[code]] = trailing_ones(planes[COLORS[code]])
+    maxima = {result: longest_run(planes[color]) for result, color in zip(RESULTS, COLORS)}
+    return {
+        'current_home_sequence': current['home'],
+        'current_away_sequence': current['away'],
+        'current_draw_sequence': current['draw'],
+        'max_home_sequence': maxima['home'],
+        'max_away_sequence': maxima['away'],
+        'max_draw_sequence': maxima['draw']
+    }
+
+def analyze_colors(packed, window=NUM_RECENT_RESULTS_FOR_ANALYSIS):
+    """Equivalente a analysis.analyze_colors (window=None conta o histórico inteiro)."""
+    size = window_size(packed, window)
+    if not size:
+        return {'red': 0, 'blue': 0, 'yellow': 0, 'current_color': '', 'streak': 0, 'color_pattern_27': ''}
+    planes = packed.planes()
+    mask = low_mask(size)
+    current_color = COLORS[packed.code_at(0)]
+    return {
+        'red': (planes['red'] & mask).bit_count(),
+        'blue': (planes['blue'] & mask).bit_count(),
+        'yellow': (planes['yellow'] & mask).bit_count(),
+        'current_color': current_color,
+        'streak': trailing_ones(planes[current_color]),
+        'color_pattern_27': ''.join(COLORS[packed.code_at(i)][0].upper() for i in range(size))
+    }
+
+def find_complex_patterns(packed, window=NUM_RECENT_RESULTS_FOR_ANALYSIS):
+    """Equivalente a analysis.find_complex_patterns (window=None varre o histórico inteiro)."""
+    span = min(window_size(packed, window), BLOCK_PATTERN_SPAN)
+    patterns = collections.defaultdict(int, rule_counts(packed, 'p', window))
+    analysis.find_block_patterns(run_lengths(packed.recent(span)), span, patterns)
+    return dict(patterns)
+
+def analyze_break_probability(packed, window=NUM_RECENT_RESULTS_FOR_ANALYSIS):
+    """Equivalente a analysis.analyze_break_probability."""
+    size = window_size(packed, window)
+    if size < 2:
+        return {'break_chance': 0, 'last_break': ()}
+    differ = break_bits(packed)
+    breaks = (differ & low_mask(size - 1)).bit_count()
+    last_break = (COLORS[packed.code_at(1)], COLORS[packed.code_at(0)]) if differ & 1 else ()
+    return {
+        'break_chance': round(breaks / (size - 1) * 100, 2),
+        'last_break': last_break
+    }
+
+def analyze_draw_specifics(packed, window=NUM_RECENT_RESULTS_FOR_ANALYSIS):
+    """Equivalente a analysis.analyze_draw_specifics."""
+    size = window_size(packed, window)
+    if not size:
+        return {'draw_frequency_27': 0, 'time_since_last_draw': -1, 'draw_patterns': {}, 'recurrent_draw': False}
+    draws = packed.high & low_mask(size)
+    draw_count = draws.bit_count()
+
+    # Posições dos empates da janela: o bit mais baixo de cada vez
+    positions = []
+    remaining = draws
+    while remaining:
+        lowest = remaining & -remaining
+        positions.append(lowest.bit_length() - 1)
+        remaining ^= lowest
+    intervals = [b - a for a, b in zip(positions, positions[1:])]
+
+    return {
+        'draw_frequency_27': round(draw_count / size * 100, 2),
+        'time_since_last_draw': (packed.high & -packed.high).bit_length() - 1 if packed.high else -1,
+        'draw_patterns': rule_counts(packed, 'd', window),
+        'recurrent_draw': bool(intervals) and sum(1 for x in intervals if x <= 5) / len(intervals) >= 0.6
+    }
+
+def history_pattern_counts(packed):
+    """Contagens de todos os padrões ao longo do histórico inteiro; como batch.history_pattern_counts."""
+    return find_complex_patterns(packed, window=None) if packed.size else {}
+
+PACKED_ANALYZERS = {
+    'analyze_surf': analyze_surf,
+    'analyze_colors': analyze_colors,
+    'find_complex_patterns': find_complex_patterns,
+    'analyze_break_probability': analyze_break_probability,
+    'analyze_draw_specifics': analyze_draw_specifics,
+}
+
+def analyze_all(results, analyzers=tuple(PACKED_ANALYZERS)):
+    """
+    Como analysis.analyze_all, mas as análises cujo nome está em 'analyzers' usam o histórico
+    empacotado (montado uma única vez); as demais, e as que não têm versão aqui, usam a varredura.
+    """
+    packed = PackedHistory.from_results(results) if analyzers else None
+    return tuple(
+        PACKED_ANALYZERS[analyzer.__name__](packed)
+        if analyzer.__name__ in analyzers and analyzer.__name__ in PACKED_ANALYZERS else analyzer(results)
+        for analyzer in analysis.ANALYZERS
+    )
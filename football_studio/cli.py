@@ -0,0 +1,63 @@
+"""Linha de comando: lê resultados de um arquivo ou stdin e imprime a sugestão."""
+
+import argparse
+import json
+import sys
+
+from football_studio.common import MAX_HISTORY_TO_STORE, MIN_RESULTS_FOR_SUGGESTION
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.analysis import generate_advanced_suggestion
+from football_studio.parsing import parse_results
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='football_studio',
+        description='Analisa resultados de Football Studio e imprime a sugestão de aposta.'
+    )
+    parser.add_argument('input', nargs='?', default='-',
+                        help="Arquivo com resultados (H/A/D, home/away/draw, cores ou emojis). '-' lê de stdin.")
+    parser.add_argument('--newest-first', action='store_true',
+                        help='O arquivo lista o resultado mais recente primeiro (padrão: do mais antigo para o mais recente).')
+    parser.add_argument('--every-round', action='store_true',
+                        help='Imprime a sugestão após cada resultado, não apenas ao final.')
+    parser.add_argument('--json', action='store_true', help='Saída em JSON (uma linha por sugestão).')
+    parser.add_argument('--max-history', type=int, default=MAX_HISTORY_TO_STORE,
+                        help=f'Resultados mantidos no histórico (padrão: {MAX_HISTORY_TO_STORE}).')
+    return parser
+
+def format_suggestion(round_number, suggestion, as_json):
+    if as_json:
+        return json.dumps(dict(suggestion, round=round_number), ensure_ascii=False)
+    if suggestion['bet_type'] == 'none':
+        return f"[{round_number}] {suggestion['suggestion']}"
+    return (f"[{round_number}] {suggestion['suggestion']} (Confiança: {suggestion['confidence']}%) - "
+            f"Garantia: {suggestion['guarantee_pattern']} - Motivo: {suggestion['reason']}")
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    stream = sys.stdin
+    try:
+        if args.input != '-':
+            stream = open(args.input, encoding='utf-8')
+        results = parse_results(stream)
+        if args.newest_first:
+            results = reversed(list(results))
+
+        history = ResultHistory(args.max_history)
+        analyzer = IncrementalAnalyzer(args.max_history)
+        for result in results:
+            history.push(result)
+            analyzer.push(result)
+            if args.every_round and len(history) >= MIN_RESULTS_FOR_SUGGESTION:
+                print(format_suggestion(analyzer.total, generate_advanced_suggestion(history, *analyzer.analyze_all()), args.json))
+    except (OSError, ValueError) as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 2
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    if not args.every_round:
+        print(format_suggestion(analyzer.total, generate_advanced_suggestion(history, *analyzer.analyze_all()), args.json))
+    return 0
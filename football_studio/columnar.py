@@ -0,0 +1,287 @@
+"""
+Exportação colunar (Arrow IPC ou Parquet) do histórico com as análises de cada rodada, e a
+leitura de volta.
+
+Cada linha é o estado logo após uma rodada: o resultado, as sequências (surf), as contagens de
+cores, a chance de quebra e os dados de empate da janela de 27, a contagem de cada padrão (uma
+coluna por Pattern possível, ver pattern_column) e a sugestão gerada para a rodada seguinte. As
+rodadas são calculadas pelo IncrementalAnalyzer e gravadas em blocos de 'chunk_size' linhas (um
+row group do Parquet ou um record batch do Arrow), então só alguns blocos ficam na memória; os
+blocos podem ser calculados em paralelo e são gravados em ordem.
+
+Para anexar rodadas novas a uma exportação, grave apenas as rodadas a partir de 'first_round'
+em outro arquivo do mesmo diretório (como no backtest, os MAX_HISTORY_TO_STORE - 1 resultados
+anteriores servem de aquecimento); read_snapshots lê um diretório como uma única tabela.
+
+Este módulo depende de pyarrow (instalado junto com o Streamlit) e não é importado por
+football_studio/__init__.py.
+
+Uso:
+    python -m football_studio.columnar export historico.log analises.parquet [--first-round N]
+    python -m football_studio.columnar import analises.parquet [--output historico.txt]
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import os
+import sys
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from football_studio.common import MAX_HISTORY_TO_STORE, RESULTS, RESULT_CODES
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.memo import SuggestionCache
+from football_studio.patterns import Pattern
+from football_studio.rules import COLORS
+from football_studio.bitpacked import BIT_RULES
+from football_studio.parsing import load_results, encode_results, decode_results
+
+DEFAULT_CHUNK_SIZE = 65_536
+BET_TYPES = RESULTS + ('none',)
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+def pattern_keys():
+    """Todos os Pattern que find_complex_patterns e analyze_draw_specifics podem contar."""
+    keys = [key for kind, group, rank, size, key, colors in BIT_RULES]
+    for a, b in itertools.permutations(COLORS, 2):
+        for block_size in (2, 3):
+            keys.append(Pattern('bloco', (a, b), block_size))
+            keys.append(Pattern('bloco_alternado', (a, b), block_size))
+        keys.append(Pattern('escada_decrescente', (a, b, a), 3))
+    return list(dict.fromkeys(keys))
+
+def pattern_column(pattern):
+    """Nome da coluna de contagem do padrão, por exemplo 'pattern:n_para_1:red-blue:2'."""
+    return f"pattern:{pattern.kind}:{'-'.join(pattern.colors)}:{pattern.size}"
+
+def column_pattern(name):
+    """Inverso de pattern_column."""
+    _, kind, colors, size = name.split(':')
+    return Pattern(kind, tuple(colors.split('-')), int(size))
+
+PATTERN_KEYS = pattern_keys()
+
+def dictionary_type():
+    return pa.dictionary(pa.int8(), pa.string())
+
+SCHEMA = pa.schema([
+    ('round', pa.int64()), # Rodada absoluta, a partir de 1
+    ('result', dictionary_type()),
+    ('current_home_sequence', pa.int32()),
+    ('current_away_sequence', pa.int32()),
+    ('current_draw_sequence', pa.int32()),
+    ('max_home_sequence', pa.int32()),
+    ('max_away_sequence', pa.int32()),
+    ('max_draw_sequence', pa.int32()),
+    ('current_color', dictionary_type()),
+    ('streak', pa.int32()),
+    ('red', pa.int8()),
+    ('blue', pa.int8()),
+    ('yellow', pa.int8()),
+    ('break_chance', pa.float64()),
+    ('draw_frequency_27', pa.float64()),
+    ('time_since_last_draw', pa.int32()),
+    ('recurrent_draw', pa.bool_()),
+    ('bet_type', dictionary_type()), # Sugestão para a rodada seguinte
+    ('confidence', pa.int8()),
+    ('guarantee_pattern', pa.string()),
+] + [(pattern_column(pattern), pa.uint8()) for pattern in PATTERN_KEYS])
+
+DICTIONARIES = {'result': RESULTS, 'current_color': COLORS, 'bet_type': BET_TYPES}
+
+def snapshot_row(round_number, result, analyses, suggestion):
+    """Valores de uma linha (sem as colunas de padrão) a partir de analyze_all e da sugestão."""
+    surf, colors, complex_patterns, break_probability, draw_specifics = analyses[:5]
+    return (
+        round_number,
+        RESULT_CODES[result],
+        surf['current_home_sequence'],
+        surf['current_away_sequence'],
+        surf['current_draw_sequence'],
+        surf['max_home_sequence'],
+        surf['max_away_sequence'],
+        surf['max_draw_sequence'],
+        COLORS.index(colors['current_color']),
+        colors['streak'],
+        colors['red'],
+        colors['blue'],
+        colors['yellow'],
+        break_probability['break_chance'],
+        draw_specifics['draw_frequency_27'],
+        draw_specifics['time_since_last_draw'],
+        draw_specifics['recurrent_draw'],
+        BET_TYPES.index(suggestion['bet_type']),
+        suggestion['confidence'],
+        suggestion['guarantee_pattern'],
+    )
+
+def build_batch(rows, pattern_rows):
+    """RecordBatch com as linhas de um bloco; pattern_rows tem as contagens de padrões de cada linha."""
+    columns = []
+    for field, values in zip(SCHEMA, zip(*rows)):
+        if field.name in DICTIONARIES:
+            columns.append(pa.DictionaryArray.from_arrays(pa.array(values, pa.int8()), pa.array(DICTIONARIES[field.name])))
+        else:
+            columns.append(pa.array(values, field.type))
+    for pattern in PATTERN_KEYS:
+        columns.append(pa.array([counts.get(pattern, 0) for counts in pattern_rows], pa.uint8()))
+    return pa.RecordBatch.from_arrays(columns, schema=SCHEMA)
+
+def snapshot_chunk(encoded, first_round, warmup_start, max_history=MAX_HISTORY_TO_STORE):
+    """
+    Bloco com as rodadas [first_round, warmup_start + len(encoded)) de 'encoded' (bytes, do mais
+    antigo para o mais recente), cuja posição 0 é a rodada absoluta 'warmup_start'; os resultados
+    antes de 'first_round' servem apenas de aquecimento.
+    """
+    history = ResultHistory(max_history)
+    analyzer = IncrementalAnalyzer(max_history)
+    cache = SuggestionCache()
+    rows = []
+    pattern_rows = []
+    for position, code in enumerate(encoded, warmup_start):
+        result = RESULTS[code]
+        history.push(result)
+        analyzer.push(result)
+        if position < first_round:
+            continue
+        analyses = analyzer.analyze_all()
+        suggestion = cache.generate(history, *analyses)
+        rows.append(snapshot_row(position + 1, result, analyses, suggestion))
+        pattern_rows.append({**analyses[2], **analyses[4]['draw_patterns']})
+    return build_batch(rows, pattern_rows)
+
+def iter_snapshot_batches(results, first_round=0, chunk_size=DEFAULT_CHUNK_SIZE, max_history=MAX_HISTORY_TO_STORE,
+                          workers=1):
+    """
+    Gera, em ordem, os blocos das rodadas first_round, first_round + 1, ... de 'results' (do mais
+    antigo para o mais recente; a posição 0 é a rodada 0). Cada bloco recomeça com os
+    max_history - 1 resultados anteriores como aquecimento, como no backtest, e por isso os blocos
+    podem ser calculados em processos separados (workers > 1; None = todos os núcleos).
+    """
+    encoded = encode_results(results)
+    warmup = max_history - 1
+    jobs = []
+    for start in range(first_round, len(encoded), chunk_size):
+        warmup_start = max(0, start - warmup)
+        jobs.append((encoded[warmup_start:start + chunk_size], start, warmup_start, max_history))
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield snapshot_chunk(*job)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(snapshot_chunk, *zip(*jobs))
+
+def is_parquet(path):
+    return str(getattr(path, 'name', path)).endswith(PARQUET_SUFFIXES)
+
+class SnapshotWriter:
+    """
+    Grava blocos em Parquet ou em um arquivo Arrow IPC. 'path' pode ser um caminho ou um arquivo
+    aberto em modo binário; sem 'parquet', o formato vem do sufixo do nome.
+    """
+
+    def __init__(self, path, parquet=None):
+        self.parquet = is_parquet(path) if parquet is None else parquet
+        if self.parquet:
+            self.writer = pq.ParquetWriter(path, SCHEMA)
+        else:
+            self.writer = ipc.new_file(path, SCHEMA)
+
+    def write(self, batch):
+        self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def export_snapshots(results, path, first_round=0, chunk_size=DEFAULT_CHUNK_SIZE, max_history=MAX_HISTORY_TO_STORE,
+                     progress=None, parquet=None, workers=1):
+    """Grava as rodadas de 'results' a partir de 'first_round' e devolve quantas linhas foram escritas."""
+    written = 0
+    with SnapshotWriter(path, parquet) as writer:
+        for batch in iter_snapshot_batches(results, first_round, chunk_size, max_history, workers):
+            writer.write(batch)
+            written += batch.num_rows
+            if progress is not None:
+                progress(written)
+    return written
+
+def read_snapshots(path, columns=None, parquet=None):
+    """
+    Tabela com as linhas gravadas (arquivo Parquet, arquivo Arrow ou diretório com vários deles);
+    como em SnapshotWriter, sem 'parquet' o formato de um arquivo vem do sufixo do nome.
+    """
+    if isinstance(path, (str, os.PathLike)) and os.path.isdir(path):
+        files = sorted(os.listdir(path))
+        file_format = 'parquet' if all(name.endswith(PARQUET_SUFFIXES) for name in files) else 'arrow'
+        return ds.dataset(path, schema=SCHEMA, format=file_format).to_table(columns=columns)
+    if is_parquet(path) if parquet is None else parquet:
+        return pq.read_table(path, columns=columns)
+    table = ipc.open_file(path).read_all()
+    return table.select(columns) if columns is not None else table
+
+def read_codes(path):
+    """
+    Só a coluna de resultados, como bytes de RESULT_CODES (do mais antigo para o mais recente),
+    sem converter linha a linha: pronta para importer.apply_codes.
+    """
+    table = read_snapshots(path, columns=['round', 'result']).sort_by('round')
+    codes = bytearray()
+    for chunk in table.column('result').chunks:
+        # Os índices de cada bloco apontam para o dicionário do próprio bloco
+        mapping = bytes(RESULT_CODES[value] for value in chunk.dictionary.to_pylist())
+        translation = bytes.maketrans(bytes(range(len(mapping))), mapping)
+        indices = chunk.indices.cast(pa.int8())
+        data = indices.buffers()[1]
+        codes += bytes(data)[indices.offset:indices.offset + len(indices)].translate(translation)
+    return bytes(codes)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='football_studio.columnar',
+                                     description='Exportação colunar do histórico e das análises por rodada.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='Grava as rodadas de um histórico em Parquet (.parquet) ou Arrow.')
+    export.add_argument('input', help='Histórico gravado (log .log/.bin, texto ou CSV).')
+    export.add_argument('output')
+    export.add_argument('--first-round', type=int, default=0, help='Primeira rodada exportada (para anexar a uma exportação anterior).')
+    export.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    export.add_argument('--max-history', type=int, default=MAX_HISTORY_TO_STORE)
+    export.add_argument('--workers', type=int, default=None, help='Processos em paralelo (padrão: todos os núcleos).')
+    load = commands.add_parser('import', help='Lê uma exportação de volta.')
+    load.add_argument('input')
+    load.add_argument('--output', help='Grava os resultados em um log binário (.log/.bin) ou texto.')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'export':
+            results = load_results(args.input)
+            written = export_snapshots(results, args.output, args.first_round, args.chunk_size, args.max_history,
+                                       lambda count: print(f"{count} rodadas gravadas", file=sys.stderr),
+                                       workers=args.workers)
+            print(f"{written} rodadas exportadas para {args.output}")
+        else:
+            codes = read_codes(args.input)
+            if args.output and args.output.endswith(('.log', '.bin')):
+                with open(args.output, 'wb') as stream:
+                    stream.write(codes)
+            elif args.output:
+                with open(args.output, 'w', encoding='utf-8') as stream:
+                    stream.writelines(result + '\n' for result in decode_results(codes))
+            print(f"{len(codes)} rodadas lidas de {args.input}")
+    except (OSError, ValueError, pa.ArrowException) as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""Constantes e funções auxiliares compartilhadas pelo motor de análise."""
+
+# --- Constantes e Funções Auxiliares ---
+NUM_RECENT_RESULTS_FOR_ANALYSIS = 27
+MAX_HISTORY_TO_STORE = 1000
+NUM_HISTORY_TO_DISPLAY = 100 # Número de resultados do histórico a serem exibidos
+EMOJIS_PER_ROW = 9 # Quantos emojis por linha no histórico horizontal
+MIN_RESULTS_FOR_SUGGESTION = 9
+TRANSITION_ORDER = 4 # Maior contexto (em resultados) do índice de transições
+MIN_TRANSITION_SAMPLES = 30 # Ocorrências mínimas de um contexto para usar o que veio depois dele
+MAX_MATCH_LENGTH = NUM_RECENT_RESULTS_FOR_ANALYSIS # Maior trecho final procurado no histórico
+STAT_WINDOWS = (9, 27, 54, 100, None) # Janelas comparadas lado a lado (None = todo o histórico)
+CONFIDENCE_BUCKET_SIZE = 10 # Largura (em pontos percentuais) das faixas de confiança do backtest e do ledger
+
+# Codificação compacta dos resultados (um byte por rodada): 0 = Casa, 1 = Visitante, 2 = Empate
+RESULTS = ('home', 'away', 'draw')
+RESULT_CODES = {'home': 0, 'away': 1, 'draw': 2}
+
+def get_color(result):
+    """Retorna a cor associada ao resultado."""
+    if result == 'home':
+        return 'red'
+    elif result == 'away':
+        return 'blue'
+    else: # 'draw'
+        return 'yellow'
+
+def get_color_emoji(color):
+    """Retorna o emoji correspondente à cor."""
+    if color == 'red':
+        return '🔴'
+    elif color == 'blue':
+        return '🔵'
+    elif color == 'yellow':
+        return '🟡'
+    return ''
+
+def get_result_emoji(result_type):
+    """Retorna o emoji correspondente ao tipo de resultado. Agora retorna uma string vazia para remover os ícones."""
+    return ''
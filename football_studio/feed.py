@@ -0,0 +1,300 @@
+"""
+Fontes de resultados ao vivo: acompanhamento de arquivo, socket local e replay determinístico.
+
+Uma fonte é qualquer objeto com read(stop), um gerador de linhas de texto (em qualquer formato de
+parsing.parse_line ou mensagens JSON {"result": ...} do protocolo de service.py) que termina
+quando o threading.Event 'stop' é ligado. LiveFeed lê a fonte em uma thread de fundo e só
+enfileira os resultados; quem consome (a interface, a cada 'cadence' segundos) retira tudo o que
+chegou com drain() e aplica o lote de uma vez com apply_feed_batch(), que ainda assim gera a
+sugestão e verifica a garantia rodada a rodada.
+
+Uso (substituto local de uma fonte ao vivo):
+    python -m football_studio.feed replay --port 8766 --seed 1 --rounds 500 --interval 0.2 --burst 5
+    python -m football_studio.feed replay --to-file resultados.txt --from historico.txt --interval 1
+"""
+
+import argparse
+import json
+import os
+import queue
+import random
+import socket
+import sys
+import threading
+import time
+
+from football_studio.common import MIN_RESULTS_FOR_SUGGESTION, RESULTS
+from football_studio.analysis import check_guarantee_status
+from football_studio.parsing import parse_line, load_results, decode_results, BINARY_SUFFIXES
+
+DEFAULT_FEED_HOST = '127.0.0.1'
+DEFAULT_FEED_PORT = 8766
+DEFAULT_CADENCE = 1.0 # Segundos entre atualizações da interface enquanto a fonte está ligada
+POLL_INTERVAL = 0.2 # Espera máxima das fontes antes de conferir o sinal de parada
+MAX_PENDING_RESULTS = 10_000 # A thread espera quando a fila enche (o consumidor ficou para trás)
+
+def parse_feed_line(line):
+    """Resultados de uma linha recebida: texto de parse_line ou mensagem JSON com 'result'."""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return []
+    if line.startswith('{'):
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"Mensagem JSON inválida: {error}") from None
+        if not isinstance(message, dict) or message.get('result') not in RESULTS:
+            raise ValueError(f"Mensagem sem resultado válido: {line!r}")
+        return [message['result']]
+    return list(parse_line(line))
+
+class FileTailSource:
+    """
+    Acompanha um arquivo que recebe resultados no fim (como 'tail -f'). Texto é lido linha a
+    linha, e uma linha só é usada quando termina em '\\n'; arquivos .bin/.log são lidos como um
+    byte por rodada (o log de mesa de storage.py). Se o arquivo encolher, a leitura recomeça do início.
+    """
+
+    def __init__(self, path, from_start=False, poll_interval=POLL_INTERVAL):
+        self.path = path
+        self.from_start = from_start
+        self.poll_interval = poll_interval
+
+    def read(self, stop):
+        binary = str(self.path).endswith(BINARY_SUFFIXES)
+        with open(self.path, 'rb') as stream:
+            if not self.from_start:
+                stream.seek(0, os.SEEK_END)
+            pending = b''
+            while not stop.is_set():
+                data = stream.read() if binary else stream.readline()
+                if not data:
+                    if os.path.getsize(self.path) < stream.tell():
+                        stream.seek(0)
+                        pending = b''
+                    stop.wait(self.poll_interval)
+                    continue
+                if binary:
+                    yield ' '.join(decode_results(data))
+                    continue
+                pending += data
+                if pending.endswith(b'\n'):
+                    # Bytes inválidos viram '\ufffd' e a linha é rejeitada por parse_feed_line, como em SocketSource
+                    yield pending.decode('utf-8', errors='replace')
+                    pending = b''
+
+class SocketSource:
+    """
+    Servidor TCP local: aceita uma conexão por vez e lê uma mensagem por linha (texto ou JSON,
+    como em parse_feed_line). Um coletor externo conecta e escreve os resultados conforme saem.
+    """
+
+    def __init__(self, host=DEFAULT_FEED_HOST, port=DEFAULT_FEED_PORT, poll_interval=POLL_INTERVAL):
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+
+    def read(self, stop):
+        with socket.create_server((self.host, self.port)) as server:
+            server.settimeout(self.poll_interval)
+            while not stop.is_set():
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    continue
+                with connection:
+                    connection.settimeout(self.poll_interval)
+                    buffer = b''
+                    while not stop.is_set():
+                        try:
+                            data = connection.recv(65536)
+                        except socket.timeout:
+                            continue
+                        if not data:
+                            break
+                        *lines, buffer = (buffer + data).split(b'\n')
+                        for line in lines:
+                            yield line.decode('utf-8', errors='replace')
+
+class ReplaySource:
+    """
+    Reproduz um histórico gravado (do mais antigo para o mais recente) ou, sem ele, 'rounds'
+    resultados sorteados com a semente 'seed': 'burst' resultados a cada 'interval' segundos.
+    A mesma configuração gera sempre a mesma sequência, para testar a interface sem fonte real.
+    """
+
+    def __init__(self, results=None, rounds=1000, seed=1, weights=(45, 45, 10), interval=1.0, burst=1):
+        self.results = results
+        self.rounds = rounds
+        self.seed = seed
+        self.weights = weights
+        self.interval = interval
+        self.burst = max(1, burst)
+
+    def sequence(self):
+        if self.results is not None:
+            return list(self.results)
+        return random.Random(self.seed).choices(RESULTS, self.weights, k=self.rounds)
+
+    def read(self, stop):
+        sequence = self.sequence()
+        for start in range(0, len(sequence), self.burst):
+            if stop.is_set():
+                return
+            yield ' '.join(sequence[start:start + self.burst])
+            if self.interval and stop.wait(self.interval):
+                return
+
+class LiveFeed:
+    """Lê uma fonte em uma thread de fundo e guarda os resultados até o consumidor retirá-los."""
+
+    def __init__(self, source, max_pending=MAX_PENDING_RESULTS):
+        self.source = source
+        self.queue = queue.Queue(max_pending)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.received = 0
+        self.rejected = 0 # Linhas que não puderam ser lidas (a fonte continua)
+        self.error = None # Última mensagem de erro (linha rejeitada ou falha da fonte)
+
+    def start(self):
+        if not self.running:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, name='football-studio-feed', daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=2.0):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def run(self):
+        try:
+            for line in self.source.read(self.stop_event):
+                try:
+                    results = parse_feed_line(line)
+                except ValueError as error:
+                    self.rejected += 1
+                    self.error = str(error)
+                    continue
+                for result in results:
+                    if not self.put(result):
+                        return
+        except (OSError, ValueError) as error:
+            # ValueError: códigos inválidos em um log binário (decode_results)
+            self.error = f"Fonte interrompida: {error}"
+
+    def put(self, result):
+        """Enfileira esperando por espaço; False se a fonte foi parada nesse meio tempo."""
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(result, timeout=POLL_INTERVAL)
+            except queue.Full:
+                continue
+            self.received += 1
+            return True
+        return False
+
+    def drain(self, limit=None):
+        """Retira os resultados pendentes (no máximo 'limit'), do mais antigo para o mais recente."""
+        batch = []
+        while limit is None or len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def status(self):
+        return {
+            'running': self.running,
+            'received': self.received,
+            'pending': self.queue.qsize(),
+            'rejected': self.rejected,
+            'error': self.error,
+        }
+
+def apply_feed_batch(batch, history, analyzer, cache, last_suggestion, ledger=None):
+    """
+    Aplica um lote (do mais antigo para o mais recente) como se cada resultado tivesse sido
+    adicionado pelos botões: confere a garantia da sugestão vigente (e a registra em 'ledger',
+    um ledger.AccuracyLedger) e, com resultados suficientes, gera a sugestão da rodada seguinte.
+    Devolve (última sugestão, status de garantia das rodadas em que havia aposta sugerida).
+    """
+    statuses = []
+    for result in batch:
+        if ledger is not None:
+            ledger.record(last_suggestion, result)
+        if last_suggestion['bet_type'] != 'none':
+            statuses.append(check_guarantee_status(result, last_suggestion['bet_type'], last_suggestion['guarantee_pattern']))
+        history.push(result)
+        analyzer.push(result)
+        if len(history) >= MIN_RESULTS_FOR_SUGGESTION:
+            suggestion = cache.generate(history, *analyzer.analyze_all())
+            last_suggestion = {
+                'suggestion': suggestion['suggestion'],
+                'bet_type': suggestion['bet_type'],
+                'confidence': suggestion['confidence'],
+                'guarantee_pattern': suggestion['guarantee_pattern']
+            }
+    return last_suggestion, statuses
+
+# --- Substituto local de uma fonte ao vivo ---
+
+def replay_to_file(source, path):
+    """Anexa as linhas do replay a um arquivo de texto (para testar FileTailSource)."""
+    with open(path, 'a', encoding='utf-8') as stream:
+        for line in source.read(threading.Event()):
+            stream.write(line + '\n')
+            stream.flush()
+
+def replay_to_socket(source, host, port, retry_seconds=10.0):
+    """Envia as linhas do replay a um SocketSource, esperando até 'retry_seconds' que ele abra a porta."""
+    deadline = time.monotonic() + retry_seconds
+    while True:
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(POLL_INTERVAL)
+    with connection:
+        for line in source.read(threading.Event()):
+            connection.sendall((line + '\n').encode('utf-8'))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='football_studio.feed', description='Fonte de resultados simulada.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    replay = commands.add_parser('replay', help='Reproduz resultados em um arquivo ou no socket local.')
+    replay.add_argument('--from', dest='history', help='Histórico gravado a reproduzir (senão, resultados sorteados).')
+    replay.add_argument('--rounds', type=int, default=1000)
+    replay.add_argument('--seed', type=int, default=1)
+    replay.add_argument('--interval', type=float, default=1.0, help='Segundos entre rajadas.')
+    replay.add_argument('--burst', type=int, default=1, help='Resultados por rajada.')
+    target = replay.add_mutually_exclusive_group(required=True)
+    target.add_argument('--to-file', help='Arquivo de texto que recebe uma linha por rajada.')
+    target.add_argument('--port', type=int, help='Porta de um SocketSource em --host.')
+    replay.add_argument('--host', default=DEFAULT_FEED_HOST)
+    args = parser.parse_args(argv)
+
+    history = load_results(args.history) if args.history else None
+    source = ReplaySource(history, args.rounds, args.seed, interval=args.interval, burst=args.burst)
+    try:
+        if args.to_file:
+            replay_to_file(source, args.to_file)
+        else:
+            replay_to_socket(source, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    except OSError as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Histórico de resultados em buffer circular."""
+
+import itertools
+import operator
+
+from football_studio.common import MAX_HISTORY_TO_STORE
+
+# --- Histórico ---
+
+class ResultHistory:
+    """
+    Histórico de resultados em buffer circular de capacidade fixa, do mais recente para o mais antigo.
+    push() é O(1) e descarta automaticamente o resultado mais antigo ao atingir a capacidade.
+    Indexação e iteração seguem a mesma ordem da antiga lista (results[0] é o mais recente) e
+    fatias como results[:N] devolvem uma HistoryView sem copiar os dados, que as funções de
+    análise consomem no lugar de listas.
+    """
+
+    def __init__(self, capacity=MAX_HISTORY_TO_STORE, results=()):
+        self.capacity = capacity
+        self.buffer = [None] * capacity
+        self.head = 0 # Posição física do resultado mais recente
+        self.size = 0
+        for result in reversed(list(results)[:capacity]):
+            self.push(result)
+
+    def push(self, result):
+        """Adiciona o resultado mais recente, descartando o mais antigo se o buffer estiver cheio."""
+        self.head = (self.head - 1) % self.capacity
+        self.buffer[self.head] = result
+        if self.size < self.capacity:
+            self.size += 1
+
+    def extend(self, results):
+        """
+        Adiciona vários resultados (do mais antigo para o mais recente). Só os últimos 'capacity'
+        permanecem no buffer, então os anteriores nem chegam a ser gravados.
+        """
+        for result in results[max(0, len(results) - self.capacity):]:
+            self.push(result)
+
+    def clear(self):
+        """Remove todos os resultados."""
+        self.buffer = [None] * self.capacity
+        self.head = 0
+        self.size = 0
+
+    def view(self, start=0, stop=None):
+        """Janela [start:stop] sem cópia; válida até o próximo push()."""
+        return HistoryView(self.buffer, self.head, self.size).view(start, stop)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        return HistoryView(self.buffer, self.head, self.size)[index]
+
+    def __iter__(self):
+        return iter(HistoryView(self.buffer, self.head, self.size))
+
+    def __reversed__(self):
+        return reversed(HistoryView(self.buffer, self.head, self.size))
+
+    def count(self, result):
+        return HistoryView(self.buffer, self.head, self.size).count(result)
+
+    def __repr__(self):
+        return f"ResultHistory(capacity={self.capacity}, size={self.size})"
+
+class HistoryView:
+    """Janela contígua de um ResultHistory (do mais recente para o mais antigo), sem cópia dos dados."""
+
+    __slots__ = ('buffer', 'start', 'size')
+
+    def __init__(self, buffer, start, size):
+        self.buffer = buffer
+        self.start = start # Posição física do primeiro elemento da janela
+        self.size = size
+
+    def view(self, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(self.size)
+        return HistoryView(self.buffer, (self.start + start) % len(self.buffer), max(0, stop - start))
+
+    def segments(self):
+        """
+        Intervalos de posições físicas do buffer que compõem a janela (no máximo dois, por causa da
+        volta do buffer), como range: percorrê-los não copia o buffer.
+        """
+        end = self.start + self.size
+        capacity = len(self.buffer)
+        if end <= capacity:
+            return [range(self.start, end)]
+        return [range(self.start, capacity), range(end - capacity)]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                return list(self)[index]
+            return self.view(index.start, index.stop)
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("índice fora do histórico")
+        return self.buffer[(self.start + index) % len(self.buffer)]
+
+    def __iter__(self):
+        return map(self.buffer.__getitem__, itertools.chain.from_iterable(self.segments()))
+
+    def __reversed__(self):
+        return map(self.buffer.__getitem__, itertools.chain.from_iterable(reversed(segment) for segment in reversed(self.segments())))
+
+    def count(self, result):
+        return operator.countOf(self, result)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, HistoryView, ResultHistory)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"HistoryView({list(self)!r})"
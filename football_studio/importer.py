@@ -0,0 +1,77 @@
+"""
+Importação em lote de resultados (arquivo enviado ou texto colado) para o histórico de uma mesa.
+
+O texto é lido linha a linha e só os últimos MAX_HISTORY_TO_STORE resultados ficam na memória,
+um byte por rodada (ver RESULT_CODES): os anteriores são validados e contados, mas descartados,
+pois não caberiam no histórico nem no estado incremental. Assim mesmo importações de milhões de
+rodadas ocupam poucos KB. Só depois que todo o texto foi lido sem erros o lote é gravado no log
+(uma única escrita) e aplicado ao histórico e ao estado incremental: um erro no meio da importação
+não deixa a mesa com metade do lote, e a análise roda uma única vez, no final.
+"""
+
+import collections
+
+from football_studio.common import MAX_HISTORY_TO_STORE, RESULTS, RESULT_CODES
+from football_studio.parsing import parse_line
+
+PROGRESS_EVERY = 10_000 # Resultados lidos entre duas chamadas de progresso
+
+def read_codes(lines, newest_first=False, csv_header=False, progress=None, total_size=None, keep=MAX_HISTORY_TO_STORE):
+    """
+    Lê os resultados de 'lines' e devolve (códigos, total): um bytearray em ordem cronológica com
+    os 'keep' resultados mais recentes e o número de resultados lidos no texto inteiro.
+    'progress(lidos, fração)' é chamado a cada PROGRESS_EVERY resultados; a fração só é
+    conhecida quando 'total_size' (tamanho do texto em bytes UTF-8) é informado. Com 'csv_header',
+    a primeira linha com conteúdo é descartada se não for de resultados. Erros de leitura indicam
+    a linha do texto.
+    """
+    # Em ordem cronológica a deque descarta os mais antigos; com o mais recente primeiro, os
+    # 'keep' primeiros do texto são os que ficam
+    recent = bytearray() if newest_first else collections.deque(maxlen=keep)
+    total = 0
+    consumed = 0
+    next_report = PROGRESS_EVERY
+    header_pending = csv_header
+    for line_number, line in enumerate(lines, 1):
+        consumed += len(line) if line.isascii() else len(line.encode('utf-8'))
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        try:
+            line_codes = [RESULT_CODES[result] for result in parse_line(stripped)]
+        except ValueError as error:
+            if header_pending:
+                header_pending = False
+                continue
+            raise ValueError(f"Linha {line_number}: {error}") from None
+        header_pending = False
+        total += len(line_codes)
+        recent.extend(line_codes[:keep - len(recent)] if newest_first else line_codes)
+        if progress is not None and total >= next_report:
+            progress(total, min(consumed / total_size, 1.0) if total_size else None)
+            next_report = total + PROGRESS_EVERY
+    codes = bytearray(recent)
+    if newest_first:
+        codes.reverse()
+    if progress is not None:
+        progress(total, 1.0)
+    return codes, total
+
+def apply_codes(codes, history, analyzer, log=None):
+    """Grava o lote no log e o aplica ao histórico e ao estado incremental."""
+    if log is not None:
+        log.write_codes(codes)
+    keep = max(history.capacity, analyzer.max_history)
+    tail = [RESULTS[code] for code in codes[max(0, len(codes) - keep):]]
+    history.extend(tail)
+    if len(tail) < len(codes):
+        # O que não cabe no histórico só é contado pelo analisador
+        analyzer.skip(len(codes) - len(tail))
+    analyzer.extend(tail)
+
+def import_results(lines, history, analyzer, log=None, newest_first=False, csv_header=False,
+                   progress=None, total_size=None):
+    """Importa os resultados de 'lines' (ver read_codes) e devolve quantos foram incluídos."""
+    codes, _ = read_codes(lines, newest_first, csv_header, progress, total_size, max(history.capacity, analyzer.max_history))
+    apply_codes(codes, history, analyzer, log)
+    return len(codes)
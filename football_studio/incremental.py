@@ -0,0 +1,253 @@
+"""Estado de análise atualizado incrementalmente, um resultado por vez."""
+
+import collections
+import itertools
+
+from football_studio.common import NUM_RECENT_RESULTS_FOR_ANALYSIS, MAX_HISTORY_TO_STORE, get_color
+from football_studio.analysis import find_block_patterns
+from football_studio.rules import PATTERN_TABLE, WINDOW_SIZE, push_code
+from football_studio.runs import BLOCK_PATTERN_SPAN, RunHistory
+from football_studio.markov import TransitionIndex
+from football_studio.suffix import SuffixIndex
+from football_studio.windows import WindowStats
+
+# --- Análise Incremental ---
+
+class IncrementalAnalyzer:
+    """
+    Mantém o estado das análises atualizado a cada novo resultado, sem reprocessar o histórico.
+    Cada push() custa tempo constante (sequências, máximos históricos, contagens da janela de
+    NUM_RECENT_RESULTS_FOR_ANALYSIS, quebras, intervalos de empate e contadores de padrões) e
+    os métodos analyze_* devolvem exatamente o mesmo que as funções de mesmo nome aplicadas
+    à lista de resultados (mais recente primeiro, limitada a 'max_history').
+    """
+
+    def __init__(self, max_history=MAX_HISTORY_TO_STORE, window=NUM_RECENT_RESULTS_FOR_ANALYSIS):
+        if max_history < window:
+            raise ValueError("max_history deve ser maior ou igual à janela de análise.")
+        self.max_history = max_history
+        self.window = window
+        self.clear()
+
+    @classmethod
+    def from_results(cls, results, max_history=MAX_HISTORY_TO_STORE, window=NUM_RECENT_RESULTS_FOR_ANALYSIS):
+        """Reconstrói o estado a partir de uma lista de resultados (mais recente primeiro)."""
+        analyzer = cls(max_history, window)
+        for result in reversed(results[:max_history]):
+            analyzer.push(result)
+        return analyzer
+
+    def clear(self):
+        """Descarta todo o estado acumulado."""
+        self.total = 0 # Número de resultados já recebidos (o mais recente tem índice total - 1)
+        self.size = 0 # Número de resultados ainda armazenados
+        self.last_draw = -1 # Índice absoluto do último empate
+        # Últimas 'window' + 1 cores (mais recente primeiro): a última é a que sai da janela
+        self.recent_colors = collections.deque(maxlen=self.window + 1)
+        self.window_code = 0 # Código em base 3 das últimas WINDOW_SIZE cores (ver rules.py)
+        self.color_counts = {'red': 0, 'blue': 0, 'yellow': 0}
+        # Sequências (resultado, tamanho) do histórico armazenado, com os máximos históricos
+        self.run_history = RunHistory(self.max_history)
+        # Ocorrências de padrões ainda dentro da janela, por tamanho de janela
+        self.window_entries = {2: collections.deque(), 3: collections.deque(), 4: collections.deque(), 6: collections.deque()}
+        self.breaks = 0
+        self.pattern_positions = {} # chave -> deque de índices absolutos das ocorrências
+        self.draw_pattern_positions = {}
+        self.key_order = {} # chave -> (grupo, ordem da regra)
+        # Empates dentro da janela e intervalos entre eles
+        self.window_draws = collections.deque()
+        self.draw_intervals = 0
+        self.short_draw_intervals = 0
+        # Transições de ordem 1..TRANSITION_ORDER em todo o histórico armazenado
+        self.transitions = TransitionIndex(self.max_history)
+        # Contextos de até MAX_MATCH_LENGTH resultados, para a maior repetição do trecho final
+        self.suffixes = SuffixIndex(self.max_history)
+        # Somas acumuladas por cor e de quebras, para as estatísticas de várias janelas
+        self.window_stats = WindowStats(self.max_history)
+
+    def extend(self, results):
+        """
+        Adiciona vários resultados (do mais antigo para o mais recente). Quando há mais de
+        'max_history', o estado anterior e o início do lote seriam descartados de qualquer forma:
+        eles só são contados em 'total' e apenas os últimos 'max_history' passam por push().
+        """
+        skipped = len(results) - self.max_history
+        if skipped > 0:
+            self.skip(skipped)
+            results = results[skipped:]
+        for result in results:
+            self.push(result)
+
+    def skip(self, count):
+        """
+        Conta 'count' resultados que não passam por push(). Só é válido quando pelo menos
+        'max_history' resultados vêm em seguida, pois o estado atual é descartado.
+        """
+        total = self.total + count
+        self.clear()
+        self.total = total
+
+    def push(self, result):
+        """Adiciona um novo resultado (o mais recente) e atualiza todas as análises."""
+        index = self.total
+        self.total += 1
+        color = get_color(result)
+        self.transitions.push(result)
+        self.suffixes.push(result)
+        self.run_history.push(result)
+        self.window_stats.push(result)
+
+        if result == 'draw':
+            self.last_draw = index
+        self.size = self.run_history.size
+
+        # Contagens da janela
+        self.recent_colors.appendleft(color)
+        self.window_code = push_code(self.window_code, color)
+        self.color_counts[color] += 1
+        if len(self.recent_colors) > self.window:
+            self.color_counts[self.recent_colors[self.window]] -= 1
+        window_size = min(self.size, self.window)
+
+        # Empates recorrentes
+        if color == 'yellow':
+            if self.window_draws:
+                self.add_draw_interval(index - self.window_draws[-1], 1)
+            self.window_draws.append(index)
+        while self.window_draws and index - self.window_draws[0] >= window_size:
+            oldest = self.window_draws.popleft()
+            if self.window_draws:
+                self.add_draw_interval(self.window_draws[0] - oldest, -1)
+
+        # Padrões das janelas que começam no novo resultado
+        keys_by_size = collections.defaultdict(list)
+        for kind, size, group, rank, key in PATTERN_TABLE[min(window_size, WINDOW_SIZE)][self.window_code]:
+            keys_by_size[size].append((kind, key))
+            if kind == 'b':
+                self.breaks += 1
+                continue
+            positions = self.pattern_positions if kind == 'p' else self.draw_pattern_positions
+            if key not in positions:
+                positions[key] = collections.deque()
+                self.key_order[key] = (group, rank)
+            positions[key].append(index)
+
+        for size, entries in self.window_entries.items():
+            if window_size >= size:
+                entries.append((index, keys_by_size.get(size, ())))
+            while entries and index - entries[0][0] > window_size - size:
+                self.remove_window_keys(entries.popleft()[1])
+
+    def add_draw_interval(self, interval, delta):
+        self.draw_intervals += delta
+        if interval <= 5:
+            self.short_draw_intervals += delta
+
+    def remove_window_keys(self, keys):
+        """Remove da contagem as ocorrências de uma janela que saiu da análise."""
+        for kind, key in keys:
+            if kind == 'b':
+                self.breaks -= 1
+                continue
+            positions = self.pattern_positions if kind == 'p' else self.draw_pattern_positions
+            positions[key].popleft()
+            if not positions[key]:
+                del positions[key]
+
+    def ordered_counts(self, positions):
+        """Contagens na mesma ordem de inserção que as funções de varredura produziriam."""
+        newest = self.total - 1
+        keys = sorted(positions, key=lambda key: (self.key_order[key][0], newest - positions[key][-1], self.key_order[key][1]))
+        return {key: len(positions[key]) for key in keys}
+
+    def analyze_surf(self):
+        """Equivalente a analyze_surf(results)."""
+        current = {'home': 0, 'away': 0, 'draw': 0}
+        result, length = self.run_history.current()
+        if length:
+            current[result] = length
+        return {
+            'current_home_sequence': current['home'],
+            'current_away_sequence': current['away'],
+            'current_draw_sequence': current['draw'],
+            'max_home_sequence': self.run_history.max_length('home'),
+            'max_away_sequence': self.run_history.max_length('away'),
+            'max_draw_sequence': self.run_history.max_length('draw')
+        }
+
+    def analyze_colors(self):
+        """Equivalente a analyze_colors(results)."""
+        if not self.size:
+            return {'red': 0, 'blue': 0, 'yellow': 0, 'current_color': '', 'streak': 0, 'color_pattern_27': ''}
+        window_size = min(self.size, self.window)
+        return {
+            'red': self.color_counts['red'],
+            'blue': self.color_counts['blue'],
+            'yellow': self.color_counts['yellow'],
+            'current_color': self.recent_colors[0],
+            'streak': self.run_history.current()[1],
+            'color_pattern_27': ''.join(c[0].upper() for c in itertools.islice(self.recent_colors, window_size))
+        }
+
+    def find_complex_patterns(self):
+        """Equivalente a find_complex_patterns(results)."""
+        patterns = collections.defaultdict(int, self.ordered_counts(self.pattern_positions))
+        span = min(self.size, self.window, BLOCK_PATTERN_SPAN)
+        find_block_patterns(self.run_history.recent(span), span, patterns)
+        return dict(patterns)
+
+    def analyze_break_probability(self):
+        """Equivalente a analyze_break_probability(results)."""
+        window_size = min(self.size, self.window)
+        if window_size < 2:
+            return {'break_chance': 0, 'last_break': ()}
+        break_chance = (self.breaks / (window_size - 1)) * 100
+        last_break = ()
+        if self.recent_colors[0] != self.recent_colors[1]:
+            last_break = (self.recent_colors[1], self.recent_colors[0])
+        return {
+            'break_chance': round(break_chance, 2),
+            'last_break': last_break
+        }
+
+    def analyze_draw_specifics(self):
+        """Equivalente a analyze_draw_specifics(results)."""
+        if not self.size:
+            return {'draw_frequency_27': 0, 'time_since_last_draw': -1, 'draw_patterns': {}, 'recurrent_draw': False}
+        window_size = min(self.size, self.window)
+        draw_frequency_27 = (self.color_counts['yellow'] / window_size) * 100
+        time_since_last_draw = -1
+        if self.last_draw >= self.total - self.size:
+            time_since_last_draw = self.total - 1 - self.last_draw
+        recurrent_draw = self.draw_intervals > 0 and self.short_draw_intervals / self.draw_intervals >= 0.6
+        return {
+            'draw_frequency_27': round(draw_frequency_27, 2),
+            'time_since_last_draw': time_since_last_draw,
+            'draw_patterns': self.ordered_counts(self.draw_pattern_positions),
+            'recurrent_draw': recurrent_draw
+        }
+
+    def analyze_transitions(self):
+        """Equivalente a analyze_transitions(results)."""
+        return self.transitions.analyze()
+
+    def analyze_longest_match(self):
+        """Equivalente a analyze_longest_match(results)."""
+        return self.suffixes.analyze()
+
+    def analyze_windows(self):
+        """Equivalente a analyze_windows(results)."""
+        return self.window_stats.analyze()
+
+    def analyze_all(self):
+        """Equivalente a analyze_all(results): as análises na ordem de generate_advanced_suggestion."""
+        return (
+            self.analyze_surf(),
+            self.analyze_colors(),
+            self.find_complex_patterns(),
+            self.analyze_break_probability(),
+            self.analyze_draw_specifics(),
+            self.analyze_transitions(),
+            self.analyze_longest_match(),
+            self.analyze_windows()
+        )
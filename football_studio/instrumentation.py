@@ -0,0 +1,171 @@
+"""
+Instrumentação leve dos estágios do caminho quente (analisadores, sugestão e renderização).
+
+Com a instrumentação desligada, stage() devolve sempre o mesmo contexto vazio, então o custo é
+uma chamada de função por estágio. Ligada, cada estágio acumula chamadas, tempo total e máximo;
+com tracemalloc ativo, uma a cada 'alloc_sample_every' chamadas também mede o pico de memória
+alocada no estágio. As métricas podem ser exportadas em formato texto do Prometheus, para um
+arquivo ou por um endpoint HTTP local (/metrics).
+
+O pico do tracemalloc é único no processo: só uma amostra de alocação fica em andamento por vez
+(as demais chamadas no mesmo intervalo medem apenas o tempo), mas a amostra ainda inclui o que
+outras threads alocarem enquanto ela dura. Os números de memória só são confiáveis com uma única
+sessão ativa no servidor; os tempos e contagens valem com qualquer número de sessões.
+"""
+
+import contextlib
+import http.server
+import os
+import threading
+import time
+import tracemalloc
+
+NULL_STAGE = contextlib.nullcontext()
+ALLOC_SAMPLE_LOCK = threading.Lock() # tracemalloc.reset_peak() vale para o processo inteiro
+
+class StageStats:
+    __slots__ = ('calls', 'total', 'max', 'alloc_samples', 'alloc_peak_total')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.alloc_samples = 0
+        self.alloc_peak_total = 0
+
+class Instrumentation:
+    """Timers por estágio, contagem de chamadas e amostragem de alocações."""
+
+    def __init__(self, enabled=False, trace_allocations=False, alloc_sample_every=10):
+        self.enabled = enabled
+        self.trace_allocations = False
+        self.started_tracemalloc = False # Só para o tracemalloc se foi este objeto que o iniciou
+        self.alloc_sample_every = alloc_sample_every
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.http_server = None
+        if trace_allocations:
+            self.set_trace_allocations(True)
+
+    def set_trace_allocations(self, enabled):
+        """
+        Liga/desliga a amostragem de alocações. O tracemalloc é iniciado se ainda não estiver ativo
+        e, ao desligar, parado apenas se tiver sido iniciado aqui (e não por outro código do processo).
+        """
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+        elif not enabled and self.started_tracemalloc:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self.started_tracemalloc = False
+        self.trace_allocations = enabled
+
+    def stage(self, name):
+        """Contexto que mede o estágio 'name' (sem custo quando desligado)."""
+        if not self.enabled:
+            return NULL_STAGE
+        return self.measure(name)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        with self.lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = StageStats()
+            sample = self.trace_allocations and stats.calls % self.alloc_sample_every == 0
+        # Estágios aninhados ou de outras sessões não zeram o pico de uma amostra em andamento
+        sample = sample and ALLOC_SAMPLE_LOCK.acquire(blocking=False)
+        if sample:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = 0
+            if sample:
+                peak = tracemalloc.get_traced_memory()[1] - base
+                ALLOC_SAMPLE_LOCK.release()
+            with self.lock:
+                stats.calls += 1
+                stats.total += elapsed
+                stats.max = max(stats.max, elapsed)
+                if sample:
+                    stats.alloc_samples += 1
+                    stats.alloc_peak_total += max(0, peak)
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def snapshot(self):
+        """Lista de dicionários por estágio, do mais caro para o mais barato (tempo total)."""
+        with self.lock:
+            rows = [
+                {
+                    'stage': name,
+                    'calls': stats.calls,
+                    'total_ms': round(stats.total * 1000, 3),
+                    'mean_ms': round(stats.total / stats.calls * 1000, 3) if stats.calls else 0,
+                    'max_ms': round(stats.max * 1000, 3),
+                    'mean_alloc_kb': round(stats.alloc_peak_total / stats.alloc_samples / 1024, 1) if stats.alloc_samples else None,
+                }
+                for name, stats in self.stats.items()
+            ]
+        return sorted(rows, key=lambda row: -row['total_ms'])
+
+    def to_prometheus(self):
+        """Métricas no formato texto do Prometheus."""
+        lines = [
+            "# HELP football_studio_stage_calls_total Chamadas por estágio.",
+            "# TYPE football_studio_stage_calls_total counter",
+            "# HELP football_studio_stage_seconds_total Tempo acumulado por estágio.",
+            "# TYPE football_studio_stage_seconds_total counter",
+            "# HELP football_studio_stage_seconds_max Maior duração observada por estágio.",
+            "# TYPE football_studio_stage_seconds_max gauge",
+            "# HELP football_studio_stage_alloc_peak_bytes Pico médio de memória alocada por estágio (amostrado).",
+            "# TYPE football_studio_stage_alloc_peak_bytes gauge",
+        ]
+        with self.lock:
+            for name, stats in sorted(self.stats.items()):
+                label = '{stage="%s"}' % name.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f"football_studio_stage_calls_total{label} {stats.calls}")
+                lines.append(f"football_studio_stage_seconds_total{label} {stats.total:.6f}")
+                lines.append(f"football_studio_stage_seconds_max{label} {stats.max:.6f}")
+                if stats.alloc_samples:
+                    lines.append(f"football_studio_stage_alloc_peak_bytes{label} {stats.alloc_peak_total / stats.alloc_samples:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Grava as métricas em 'path' de forma atômica (para o textfile collector do node_exporter)."""
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as stream:
+            stream.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+    def serve_http(self, port, host='127.0.0.1'):
+        """Expõe /metrics em uma thread de fundo; chamadas repetidas reutilizam o mesmo servidor."""
+        if self.http_server is not None:
+            return self.http_server
+        instrumentation = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = instrumentation.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.http_server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self.http_server.serve_forever, daemon=True).start()
+        return self.http_server
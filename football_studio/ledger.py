@@ -0,0 +1,153 @@
+"""
+Registro de acerto das sugestões por padrão de garantia e por faixa de confiança.
+
+Cada rodada registrada guarda a sugestão vigente (bet_type, confiança e os componentes de
+guarantee_pattern) e o resultado que veio a seguir. O armazenamento é por colunas: um byte por
+rodada para a aposta, o resultado e a confiança, e os componentes como identificadores de 2 bytes
+em um único array (com o fim de cada rodada em outro), de modo que dezenas de milhares de rodadas
+ocupam poucas centenas de KB. Os textos dos componentes são guardados uma única vez.
+
+Os contadores (apostas, acertos e taxa de acerto nas últimas 'window' apostas) de cada
+componente, de cada faixa de confiança e do total são atualizados em O(1) por rodada: a janela
+móvel é um buffer circular de bytes com a soma corrente.
+"""
+
+import array
+import csv
+
+from football_studio.common import RESULTS, RESULT_CODES, CONFIDENCE_BUCKET_SIZE
+
+ROLLING_WINDOW = 50 # Apostas consideradas na taxa de acerto recente de cada padrão
+NO_BET = len(RESULTS) # Código de bet_type 'none'
+LEDGER_FIELDS = ['round', 'bet_type', 'confidence', 'guarantee_pattern', 'outcome', 'hit']
+
+class Tally:
+    """Apostas e acertos acumulados e nas últimas 'window' apostas."""
+
+    __slots__ = ('bets', 'hits', 'recent', 'position', 'recent_hits')
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.bets = 0
+        self.hits = 0
+        self.recent = bytearray(window) # 1 = acerto, em ordem circular
+        self.position = 0
+        self.recent_hits = 0
+
+    def record(self, hit):
+        if self.bets >= len(self.recent):
+            self.recent_hits -= self.recent[self.position]
+        self.recent[self.position] = hit
+        self.recent_hits += hit
+        self.position = (self.position + 1) % len(self.recent)
+        self.bets += 1
+        self.hits += hit
+
+    def row(self):
+        recent_bets = min(self.bets, len(self.recent))
+        return {
+            'bets': self.bets,
+            'hits': self.hits,
+            'misses': self.bets - self.hits,
+            'hit_rate': round(self.hits / self.bets * 100, 1) if self.bets else 0,
+            'recent_bets': recent_bets,
+            'recent_hit_rate': round(self.recent_hits / recent_bets * 100, 1) if recent_bets else 0,
+        }
+
+def guarantee_components(guarantee_pattern):
+    """Componentes de guarantee_pattern (ver generate_advanced_suggestion); [] para 'N/A'."""
+    if not guarantee_pattern or guarantee_pattern == 'N/A':
+        return []
+    return guarantee_pattern.split(', ')
+
+class AccuracyLedger:
+    """Sugestão e resultado de cada rodada, com contadores de acerto por padrão e por faixa de confiança."""
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.window = window
+        self.clear()
+
+    def clear(self):
+        self.bet_codes = bytearray()
+        self.outcome_codes = bytearray()
+        self.confidences = bytearray()
+        self.pattern_ids = array.array('H') # Componentes de todas as rodadas, em sequência
+        self.pattern_ends = array.array('I') # Fim dos componentes de cada rodada em pattern_ids
+        self.pattern_names = [] # id -> texto do componente
+        self.pattern_index = {} # texto do componente -> id
+        self.pattern_tallies = [] # id -> Tally
+        self.bucket_tallies = {} # faixa de confiança -> Tally
+        self.total = Tally(self.window)
+
+    def __len__(self):
+        return len(self.bet_codes)
+
+    def pattern_id(self, name):
+        if name not in self.pattern_index:
+            self.pattern_index[name] = len(self.pattern_names)
+            self.pattern_names.append(name)
+            self.pattern_tallies.append(Tally(self.window))
+        return self.pattern_index[name]
+
+    def record(self, suggestion, outcome):
+        """Registra a sugestão vigente antes de 'outcome' (dicionário com bet_type, confidence e guarantee_pattern)."""
+        bet_type = suggestion['bet_type']
+        bet = bet_type != 'none'
+        confidence = suggestion.get('confidence', 0) if bet else 0
+        ids = [self.pattern_id(name) for name in guarantee_components(suggestion['guarantee_pattern'])] if bet else []
+
+        self.bet_codes.append(RESULT_CODES[bet_type] if bet else NO_BET)
+        self.outcome_codes.append(RESULT_CODES[outcome])
+        self.confidences.append(confidence)
+        self.pattern_ids.extend(ids)
+        self.pattern_ends.append(len(self.pattern_ids))
+        if not bet:
+            return
+
+        hit = int(bet_type == outcome)
+        self.total.record(hit)
+        bucket = confidence // CONFIDENCE_BUCKET_SIZE * CONFIDENCE_BUCKET_SIZE
+        if bucket not in self.bucket_tallies:
+            self.bucket_tallies[bucket] = Tally(self.window)
+        self.bucket_tallies[bucket].record(hit)
+        for pattern_id in ids:
+            self.pattern_tallies[pattern_id].record(hit)
+
+    def pattern_summary(self):
+        """Uma linha por componente de garantia, dos mais usados para os menos usados."""
+        rows = [dict(pattern=name, **tally.row()) for name, tally in zip(self.pattern_names, self.pattern_tallies)]
+        return sorted(rows, key=lambda row: -row['bets'])
+
+    def bucket_summary(self):
+        """Uma linha por faixa de confiança (em ordem crescente)."""
+        return [
+            dict(confidence=f"{bucket}-{bucket + CONFIDENCE_BUCKET_SIZE - 1}%", **self.bucket_tallies[bucket].row())
+            for bucket in sorted(self.bucket_tallies)
+        ]
+
+    def rounds(self):
+        """Gera as rodadas registradas (dicionários com LEDGER_FIELDS), da mais antiga para a mais recente."""
+        start = 0
+        for index, end in enumerate(self.pattern_ends):
+            bet = self.bet_codes[index]
+            outcome = RESULTS[self.outcome_codes[index]]
+            names = [self.pattern_names[pattern_id] for pattern_id in self.pattern_ids[start:end]]
+            start = end
+            yield {
+                'round': index + 1,
+                'bet_type': RESULTS[bet] if bet != NO_BET else 'none',
+                'confidence': self.confidences[index],
+                'guarantee_pattern': ', '.join(names) if names else 'N/A',
+                'outcome': outcome,
+                'hit': '' if bet == NO_BET else int(RESULTS[bet] == outcome),
+            }
+
+    def write_csv(self, stream):
+        """Exporta as rodadas em CSV (uma linha por rodada, cabeçalho LEDGER_FIELDS)."""
+        writer = csv.DictWriter(stream, LEDGER_FIELDS)
+        writer.writeheader()
+        writer.writerows(self.rounds())
+
+    def nbytes(self):
+        """Memória aproximada das colunas por rodada (sem os textos e os contadores)."""
+        return (len(self.bet_codes) + len(self.outcome_codes) + len(self.confidences) +
+                self.pattern_ids.itemsize * len(self.pattern_ids) + self.pattern_ends.itemsize * len(self.pattern_ends))
@@ -0,0 +1,87 @@
+"""
+Índice de transições de ordem 1..k sobre todo o histórico armazenado: para cada contexto (os
+últimos j resultados), quantas vezes veio Casa, Visitante ou Empate em seguida.
+
+As contagens de cada ordem ficam em uma lista plana indexada por contexto * 3 + resultado, com o
+contexto em base 3 (RESULT_CODES, o resultado mais recente no dígito menos significativo). Incluir
+um resultado soma uma transição por ordem e descartar o mais antigo subtrai as transições que
+começavam nele, então push() custa O(k) e consultar um contexto é uma fatia de três posições.
+"""
+
+import collections
+
+from football_studio.common import (
+    MAX_HISTORY_TO_STORE,
+    TRANSITION_ORDER,
+    MIN_TRANSITION_SAMPLES,
+    RESULTS,
+    RESULT_CODES,
+    get_color,
+)
+
+class TransitionIndex:
+    """Contagens de transições de ordem 1..'order' sobre os últimos 'max_history' resultados."""
+
+    def __init__(self, max_history=MAX_HISTORY_TO_STORE, order=TRANSITION_ORDER):
+        self.max_history = max_history
+        self.order = order
+        self.powers = [3 ** j for j in range(order + 1)]
+        self.clear()
+
+    def clear(self):
+        self.codes = collections.deque() # Resultados armazenados, do mais antigo para o mais recente
+        self.context_code = 0 # Últimos 'order' resultados em base 3
+        self.counts = [None] + [[0] * (3 * self.powers[j]) for j in range(1, self.order + 1)]
+        self.result_counts = [0, 0, 0]
+
+    def push(self, result):
+        """Inclui o resultado mais recente, descartando o mais antigo se o histórico estiver cheio."""
+        code = RESULT_CODES[result]
+        if len(self.codes) == self.max_history:
+            self.evict_oldest()
+        context = self.context_code
+        for j in range(1, min(len(self.codes), self.order) + 1):
+            self.counts[j][context % self.powers[j] * 3 + code] += 1
+        self.codes.append(code)
+        self.result_counts[code] += 1
+        self.context_code = (context * 3 + code) % self.powers[self.order]
+
+    def evict_oldest(self):
+        """Remove as transições cujo contexto começa no resultado mais antigo."""
+        codes = self.codes
+        context = 0
+        for j in range(1, min(self.order, len(codes) - 1) + 1):
+            context = context * 3 + codes[j - 1]
+            self.counts[j][context * 3 + codes[j]] -= 1
+        self.result_counts[codes.popleft()] -= 1
+
+    def next_counts(self, order):
+        """[Casa, Visitante, Empate] que seguiram os últimos 'order' resultados."""
+        start = self.context_code % self.powers[order] * 3
+        return self.counts[order][start:start + 3]
+
+    def lookup(self, context):
+        """[Casa, Visitante, Empate] que seguiram 'context' (resultados do mais recente para o mais antigo)."""
+        code = 0
+        for result in reversed(context):
+            code = code * 3 + RESULT_CODES[result]
+        start = code * 3
+        return self.counts[len(context)][start:start + 3]
+
+    def analyze(self, min_samples=MIN_TRANSITION_SAMPLES):
+        """Equivalente a analyze_transitions(results)."""
+        base_counts = dict(zip(RESULTS, self.result_counts))
+        size = len(self.codes)
+        for order in range(min(self.order, size - 1), 0, -1):
+            counts = self.next_counts(order)
+            samples = sum(counts)
+            if samples >= min_samples:
+                context = ''.join(get_color(RESULTS[self.codes[size - 1 - i]])[0].upper() for i in range(order))
+                return {
+                    'order': order,
+                    'context': context,
+                    'next_counts': dict(zip(RESULTS, counts)),
+                    'samples': samples,
+                    'base_counts': base_counts,
+                }
+        return {'order': 0, 'context': '', 'next_counts': dict(base_counts), 'samples': size, 'base_counts': base_counts}
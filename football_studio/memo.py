@@ -0,0 +1,88 @@
+"""
+Cache LRU de sugestões, compartilhável entre sessões.
+
+generate_advanced_suggestion só depende dos últimos NUM_RECENT_RESULTS_FOR_ANALYSIS resultados
+e de alguns valores resumidos do histórico completo: a sequência atual, os máximos históricos de
+cada resultado, o tempo desde o último empate e os sinais de transição, de repetição e de várias janelas
+(se houver). Todo o resto
+(padrões, quebras, empates recorrentes, contagens) é função da própria janela, então esses valores
+formam uma impressão digital compacta que identifica a sugestão.
+"""
+
+import collections
+import threading
+
+from football_studio.analysis import generate_advanced_suggestion, transition_signal, match_signal, window_signal
+
+SUGGESTION_CACHE_SIZE = 4096
+
+def suggestion_fingerprint(surf_analysis, color_analysis, draw_specifics, transition_analysis=None, match_analysis=None,
+                           window_stats=None):
+    """Chave do cache: janela de cores + resumo do histórico completo."""
+    signal = transition_signal(transition_analysis)
+    repetition = match_signal(match_analysis)
+    return (
+        color_analysis['color_pattern_27'],
+        color_analysis['streak'],
+        surf_analysis['max_home_sequence'],
+        surf_analysis['max_away_sequence'],
+        surf_analysis['max_draw_sequence'],
+        draw_specifics['time_since_last_draw'],
+        # Só o sinal entra na chave (e a ordem, que aparece no padrão de garantia), não as contagens
+        signal and (signal, transition_analysis['order']),
+        repetition and (repetition, match_analysis['length']),
+        window_signal(window_stats),
+    )
+
+class SuggestionCache:
+    """
+    Memoiza generate_advanced_suggestion com despejo LRU e contadores de acertos/falhas.
+    Seguro para uso concorrente (uma instância pode atender todas as sessões do servidor).
+    """
+
+    def __init__(self, maxsize=SUGGESTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def generate(self, results, surf_analysis, color_analysis, complex_patterns, break_probability, draw_specifics,
+                 transition_analysis=None, match_analysis=None, window_stats=None):
+        """Mesma assinatura e resultado de generate_advanced_suggestion (com os parâmetros padrão)."""
+        key = suggestion_fingerprint(surf_analysis, color_analysis, draw_specifics, transition_analysis, match_analysis,
+                                     window_stats)
+        with self.lock:
+            suggestion = self.entries.get(key)
+            if suggestion is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return dict(suggestion)
+            self.misses += 1
+
+        suggestion = generate_advanced_suggestion(results, surf_analysis, color_analysis, complex_patterns, break_probability, draw_specifics,
+                                                  transition_analysis, match_analysis, window_stats)
+        with self.lock:
+            self.entries[key] = suggestion
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return dict(suggestion)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Contadores do cache: acertos, falhas, taxa de acerto (%) e tamanho atual."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0,
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+            }
@@ -0,0 +1,500 @@
+"""
+Simulação de Monte Carlo: com que frequência cada regra de generate_advanced_suggestion dispara
+em sequências puramente aleatórias e quanto a sua aposta acerta, para calibrar a confiança.
+
+Cada lote gera sessões independentes (do histórico vazio até 'session_length' rodadas) com as
+probabilidades de Casa, Visitante e Empate informadas. As regras são avaliadas para todas as
+rodadas do lote de uma vez, como operações NumPy sobre matrizes (sessões x rodadas): sequência
+atual, máximos históricos, contagens da janela e das janelas de STAT_WINDOWS, tempo desde o último
+empate, as contagens de padrões de batch.window_pattern_counts, o contexto de transições e a maior
+repetição do trecho final, cobrindo todos os sinais que a sugestão pontua. Uma amostra das sessões
+também passa pelo pipeline completo (IncrementalAnalyzer + generate_advanced_suggestion, como no
+backtest), o que dá a calibração da confiança da sugestão final. Os lotes são distribuídos entre processos e cada um
+usa a sua própria semente derivada de --seed, então o resultado não depende de --workers.
+
+Este módulo depende de NumPy e não é importado por football_studio/__init__.py.
+
+Uso: python -m football_studio.montecarlo [--rounds 1000000] [--probabilities 0.45,0.45,0.10] [--workers N] [--json]
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+
+import numpy as np
+
+from football_studio.common import (
+    MAX_HISTORY_TO_STORE, MIN_RESULTS_FOR_SUGGESTION, NUM_RECENT_RESULTS_FOR_ANALYSIS, RESULTS,
+    TRANSITION_ORDER, MIN_TRANSITION_SAMPLES, MAX_MATCH_LENGTH, STAT_WINDOWS,
+)
+from football_studio.params import DEFAULT_PARAMS
+from football_studio.patterns import Pattern
+from football_studio.rules import COLORS
+from football_studio.batch import KEYS, RED, BLUE, YELLOW, window_pattern_counts
+from football_studio.backtest import empty_stats, merge_stats, backtest_chunk, build_report, format_report, percentage
+
+DEFAULT_PROBABILITIES = (0.45, 0.45, 0.10) # Casa, Visitante, Empate (as mesmas do benchmark)
+BATCH_SESSIONS = 200 # Sessões por lote (um lote por tarefa)
+PIPELINE_SESSIONS = 5 # Sessões de cada lote que também passam pelo pipeline completo
+KEY_COLUMNS = {key: column for column, key in enumerate(KEYS)}
+
+def simulate_codes(rng, sessions, session_length, probabilities=DEFAULT_PROBABILITIES):
+    """Matriz int8 (sessões x rodadas) de códigos de resultado, do mais antigo para o mais recente."""
+    return rng.choice(3, size=(sessions, session_length), p=probabilities).astype(np.int8)
+
+def round_features(codes):
+    """
+    Estado das análises após cada rodada t de cada sessão, como matrizes do mesmo formato de
+    'codes'. As sessões não passam de MAX_HISTORY_TO_STORE rodadas, então o histórico armazenado
+    é a sessão inteira até t.
+    """
+    sessions, rounds = codes.shape
+    index = np.broadcast_to(np.arange(rounds), codes.shape)
+    window = NUM_RECENT_RESULTS_FOR_ANALYSIS
+
+    # Sequência atual: distância até o início da sequência mais recente
+    run_start = np.ones(codes.shape, dtype=bool)
+    run_start[:, 1:] = codes[:, 1:] != codes[:, :-1]
+    streak = index - np.maximum.accumulate(np.where(run_start, index, 0), axis=1) + 1
+    max_runs = [np.maximum.accumulate(np.where(codes == color, streak, 0), axis=1) for color in range(3)]
+
+    # Contagens de cada cor nos últimos min(t + 1, 27) resultados
+    window_size = np.minimum(index + 1, window)
+    color_sums = []
+    window_counts = []
+    for color in range(3):
+        cumulative = np.zeros((sessions, rounds + 1), dtype=np.int32)
+        np.cumsum(codes == color, axis=1, out=cumulative[:, 1:])
+        color_sums.append(cumulative)
+        window_counts.append(cumulative[:, 1:] - np.take_along_axis(cumulative, index + 1 - window_size, axis=1))
+
+    last_draw = np.maximum.accumulate(np.where(codes == YELLOW, index, -1), axis=1)
+    time_since_last_draw = np.where(last_draw >= 0, index - last_draw, -1)
+
+    transition_order, transition_counts = transitions(codes, index)
+    match_length, match_counts = longest_matches(codes, index)
+    return {
+        'codes': codes,
+        'index': index,
+        'streak': streak,
+        'max_runs': max_runs,
+        'run_start': run_start,
+        'window_size': window_size,
+        'window_counts': window_counts,
+        'color_sums': color_sums, # color_sums[c][:, n]: resultados da cor c entre os n primeiros
+        'time_since_last_draw': time_since_last_draw,
+        'recurrent_draw': recurrent_draws(codes, index, window_size),
+        'pattern_counts': np.stack([window_pattern_counts(row) for row in codes]), # sessões x rodadas x KEYS
+        'transition_order': transition_order,
+        'transition_counts': transition_counts, # 3 x sessões x rodadas
+        'match_length': match_length,
+        'match_counts': match_counts, # 3 x sessões x rodadas
+    }
+
+def following_codes(codes):
+    """codes[:, t + 1] na posição t; -1 na última rodada."""
+    following = np.full(codes.shape, -1, dtype=np.int8)
+    following[:, :-1] = codes[:, 1:]
+    return following
+
+def previous_occurrences(context, valid, following):
+    """
+    Para cada posição t com 'valid', quantas posições anteriores da mesma sessão têm o mesmo
+    'context' e foram seguidas de cada resultado (3 x sessões x rodadas). As posições são
+    ordenadas por (sessão, contexto) e as contagens saem de somas acumuladas dentro de cada grupo.
+    """
+    sessions, rounds = context.shape
+    index = np.arange(rounds)
+    # Cada sessão ocupa uma faixa própria de chaves; posições sem contexto completo ficam sozinhas
+    keys = np.where(valid, context.astype(np.int64) + rounds, index)
+    keys = (keys + (np.arange(sessions, dtype=np.int64) * (int(keys.max()) + 1))[:, None]).ravel()
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    group_start = np.ones(len(keys), dtype=bool)
+    group_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    group = np.cumsum(group_start) - 1
+    starts = np.flatnonzero(group_start)
+    sorted_following = following.ravel()[order]
+    counts = np.zeros((3, len(keys)), dtype=np.int32)
+    for result in range(3):
+        events = (sorted_following == result).astype(np.int32)
+        previous = np.cumsum(events) - events
+        counts[result, order] = previous - previous[starts][group]
+    return counts.reshape((3,) + context.shape)
+
+def transitions(codes, index):
+    """
+    analyze_transitions após cada rodada: a ordem do contexto usado (0 quando nenhum contexto de
+    1 a TRANSITION_ORDER resultados tem MIN_TRANSITION_SAMPLES ocorrências anteriores) e as
+    contagens do que veio depois dele, uma matriz por resultado.
+    """
+    following = following_codes(codes)
+    order = np.zeros(codes.shape, dtype=np.int8)
+    counts = np.zeros((3,) + codes.shape, dtype=np.int32)
+    context = np.zeros(codes.shape, dtype=np.int64)
+    by_order = []
+    for k in range(1, TRANSITION_ORDER + 1):
+        # Código em base 3 dos k resultados que terminam em cada posição (válido a partir de k - 1)
+        context = context * 3 + lagged_codes(codes, k - 1)
+        by_order.append(previous_occurrences(context, index >= k - 1, following))
+    # O maior contexto com amostras suficientes; o contexto não pode ocupar o histórico inteiro
+    for k in range(TRANSITION_ORDER, 0, -1):
+        next_counts = by_order[k - 1]
+        chosen = (order == 0) & (index >= k) & (next_counts.sum(axis=0) >= MIN_TRANSITION_SAMPLES)
+        order[chosen] = k
+        counts[:, chosen] = next_counts[:, chosen]
+    return order, counts
+
+def longest_matches(codes, index):
+    """
+    analyze_longest_match após cada rodada: o tamanho do maior trecho final (até MAX_MATCH_LENGTH)
+    que já terminou em uma posição anterior e as contagens do que veio depois dessas ocorrências,
+    uma matriz por resultado.
+    """
+    following = following_codes(codes)
+    length = np.zeros(codes.shape, dtype=np.int16)
+    counts = np.zeros((3,) + codes.shape, dtype=np.int32)
+    context = np.zeros(codes.shape, dtype=np.int64)
+    for size in range(1, MAX_MATCH_LENGTH + 1):
+        context = context * 3 + lagged_codes(codes, size - 1)
+        valid = index >= size - 1
+        size_counts = previous_occurrences(context, valid, following)
+        # O trecho final só conta se já ocorreu antes (e então os tamanhos menores também ocorreram)
+        found = valid & (size_counts.sum(axis=0) > 0)
+        if not found.any():
+            break
+        length[found] = size
+        counts[:, found] = size_counts[:, found]
+    return length, counts
+
+def recurrent_draws(codes, index, window_size):
+    """
+    analyze_draw_specifics(...)['recurrent_draw'] após cada rodada: entre empates consecutivos da
+    janela, pelo menos 60% dos intervalos são de até 5 rodadas.
+    """
+    draws = codes == YELLOW
+    previous_draw = np.maximum.accumulate(np.where(draws, index, -1), axis=1)
+    previous_draw[:, 1:] = previous_draw[:, :-1].copy()
+    previous_draw[:, 0] = -1
+    # Empates cujo intervalo até o empate anterior é curto (o anterior pode estar fora da janela)
+    short = draws & (previous_draw >= 0) & (index - previous_draw <= 5)
+
+    sessions, rounds = codes.shape
+    draw_sums = np.zeros((sessions, rounds + 1), dtype=np.int32)
+    np.cumsum(draws, axis=1, out=draw_sums[:, 1:])
+    short_sums = np.zeros((sessions, rounds + 1), dtype=np.int32)
+    np.cumsum(short, axis=1, out=short_sums[:, 1:])
+    window_start = index + 1 - window_size
+    draws_in_window = draw_sums[:, 1:] - np.take_along_axis(draw_sums, window_start, axis=1)
+    short_in_window = short_sums[:, 1:] - np.take_along_axis(short_sums, window_start, axis=1)
+
+    # O primeiro empate da janela não tem par dentro dela: desconta o seu intervalo se for curto
+    next_draw = np.where(draws, index, rounds)
+    next_draw = np.minimum.accumulate(next_draw[:, ::-1], axis=1)[:, ::-1]
+    first_draw = np.take_along_axis(next_draw, window_start, axis=1)
+    first_is_short = (first_draw <= index) & np.take_along_axis(short, np.minimum(first_draw, rounds - 1), axis=1)
+    short_in_window = short_in_window - first_is_short
+
+    intervals = draws_in_window - 1
+    return (intervals > 0) & (short_in_window >= 0.6 * intervals)
+
+def other_color(codes):
+    """Vermelho <-> Azul (o resultado de uma quebra de sequência)."""
+    return np.where(codes == RED, BLUE, RED)
+
+def lagged_codes(codes, lag):
+    """codes[:, t - lag] na posição t; -1 antes do início da sessão."""
+    shifted = np.full(codes.shape, -1, dtype=np.int8)
+    shifted[:, lag:] = codes[:, :codes.shape[1] - lag]
+    return shifted
+
+def pattern_count(features, kind, first, second, size):
+    return features['pattern_counts'][:, :, KEY_COLUMNS[Pattern(kind, (COLORS[first], COLORS[second]), size)]]
+
+def surf_continuation_rule(f, params):
+    codes, streak = f['codes'], f['streak']
+    fired = (codes != YELLOW) & (streak >= params.continuation_min_streak) & (streak < params.critical_surf_threshold)
+    return fired, codes
+
+def long_surf_break_rule(f, params):
+    codes = f['codes']
+    return (codes != YELLOW) & (f['streak'] >= params.critical_surf_threshold), other_color(codes)
+
+def record_surf_break_rule(f, params):
+    codes, streak = f['codes'], f['streak']
+    current_max = np.where(codes == RED, f['max_runs'][RED], f['max_runs'][BLUE])
+    fired = (codes != YELLOW) & (streak >= current_max) & (streak >= params.record_break_min_streak)
+    return fired, other_color(codes)
+
+def draw_record_break_rule(f, params):
+    # A regra soma os mesmos pontos em Casa e Visitante; sozinha, o desempate da sugestão fica com Casa
+    streak = f['streak']
+    fired = (f['codes'] == YELLOW) & (streak >= f['max_runs'][YELLOW]) & (streak >= params.draw_record_break_min_streak)
+    return fired, np.full(streak.shape, RED, dtype=np.int8)
+
+def break_reaction_rule(f, params):
+    codes = f['codes']
+    return f['run_start'] & (f['index'] >= 1) & (codes != YELLOW), codes
+
+def block_break_rule(size):
+    """2x1 / 3x1 recorrente: a cor atual completou o bloco e costuma quebrar para a outra."""
+    def rule(f, params):
+        codes = f['codes']
+        fired = np.zeros(codes.shape, dtype=bool)
+        bet = np.zeros(codes.shape, dtype=np.int8)
+        for first, second in ((RED, BLUE), (BLUE, RED)):
+            matched = (pattern_count(f, 'n_para_1', first, second, size) >= params.pattern_min_count) & \
+                (codes == first) & (f['streak'] == size)
+            fired |= matched
+            bet[matched] = second
+        return fired, bet
+    return rule
+
+def block_repeat_rule(size):
+    """2x2 / 3x3 recorrente: os últimos resultados reproduzem o padrão."""
+    def rule(f, params):
+        codes = f['codes']
+        lags = [lagged_codes(codes, lag) for lag in range(5)]
+        fired = np.zeros(codes.shape, dtype=bool)
+        bet = np.zeros(codes.shape, dtype=np.int8)
+        for first, second in ((RED, BLUE), (BLUE, RED)):
+            matched = pattern_count(f, 'n_para_n', first, second, size) >= params.pattern_min_count
+            if size == 2:
+                matched &= (f['index'] >= 3) & (lags[0] == first) & (lags[1] == first) & (lags[2] == second) & (lags[3] == second)
+            else:
+                matched &= (f['index'] >= 5) & (lags[0] == first) & (lags[1] == first) & (lags[2] == first) & \
+                    (lags[3] == second) & (lags[4] == second)
+            fired |= matched
+            bet[matched] = first if size == 2 else second
+        return fired, bet
+    return rule
+
+def imbalance_rule(f, params):
+    red_pct = f['window_counts'][RED] / f['window_size'] * 100
+    blue_pct = f['window_counts'][BLUE] / f['window_size'] * 100
+    low_red = (red_pct < params.imbalance_low_pct) & (blue_pct > params.imbalance_high_pct)
+    low_blue = ~low_red & (blue_pct < params.imbalance_low_pct) & (red_pct > params.imbalance_high_pct)
+    return low_red | low_blue, np.where(low_red, RED, BLUE).astype(np.int8)
+
+def recurrent_draw_rule(f, params):
+    return f['recurrent_draw'], np.full(f['codes'].shape, YELLOW, dtype=np.int8)
+
+def overdue_draw_rule(f, params):
+    since = f['time_since_last_draw']
+    return (since != -1) & (since >= params.overdue_draw_rounds), np.full(since.shape, YELLOW, dtype=np.int8)
+
+def most_frequent(counts):
+    """Resultado mais frequente em 'counts' (3 x ...) e a sua contagem; empates ficam com o primeiro de RESULTS."""
+    bet = np.argmax(counts, axis=0).astype(np.int8)
+    return bet, np.take_along_axis(counts, bet[None].astype(np.intp), axis=0)[0]
+
+def transition_rule(f, params):
+    """transition_signal: o resultado mais frequente após o contexto supera a frequência geral."""
+    counts = f['transition_counts']
+    bet, best = most_frequent(counts)
+    samples = counts.sum(axis=0)
+    base = np.take_along_axis(np.stack([sums[:, 1:] for sums in f['color_sums']]), bet[None].astype(np.intp), axis=0)[0]
+    probability = np.divide(best, samples, out=np.zeros(samples.shape), where=samples > 0)
+    base_probability = base / (f['index'] + 1)
+    fired = (f['transition_order'] > 0) & (base_probability != 0) & \
+        (probability >= base_probability * params.transition_min_lift)
+    return fired, bet
+
+def match_rule(f, params):
+    """match_signal: o trecho final já ocorreu e quase sempre foi seguido do mesmo resultado."""
+    counts = f['match_counts']
+    bet, best = most_frequent(counts)
+    occurrences = counts.sum(axis=0)
+    share = np.divide(best, occurrences, out=np.zeros(occurrences.shape), where=occurrences > 0)
+    fired = (f['match_length'] >= params.match_min_length) & (occurrences >= params.match_min_occurrences) & \
+        (share >= params.match_min_share)
+    return fired, bet
+
+def window_rule(f, params):
+    """window_signal: a mesma cor abaixo de 'imbalance_low_pct' em todas as janelas completas."""
+    index = f['index']
+    count = index + 1
+    rows = np.zeros(index.shape, dtype=np.int8)
+    low = {RED: np.ones(index.shape, dtype=bool), BLUE: np.ones(index.shape, dtype=bool)}
+    for window in STAT_WINDOWS:
+        size = count if window is None else np.minimum(window, count)
+        included = size >= params.multi_window_min_size
+        if window is not None:
+            included &= count >= window
+        rows += included
+        for color in low:
+            sums = f['color_sums'][color]
+            in_window = sums[:, 1:] - np.take_along_axis(sums, count - size, axis=1)
+            low[color] &= ~included | (in_window / size * 100 < params.imbalance_low_pct)
+    low_red = (rows >= 2) & low[RED]
+    low_blue = (rows >= 2) & ~low_red & low[BLUE]
+    return low_red | low_blue, np.where(low_red, RED, BLUE).astype(np.int8)
+
+# Nome exibido -> regra (features, params) -> (disparou, aposta), na ordem da pontuação
+RULES = {
+    'Continuação de Surf': surf_continuation_rule,
+    'Quebra de Surf Longo': long_surf_break_rule,
+    'ALERTA MÁXIMO DE QUEBRA (Recorde)': record_surf_break_rule,
+    'Quebra de Surf Max (Empate)': draw_record_break_rule,
+    'Reação a Quebra Recente': break_reaction_rule,
+    '2x1 recorrente': block_break_rule(2),
+    '3x1 recorrente': block_break_rule(3),
+    '2x2 recorrente': block_repeat_rule(2),
+    '3x3 recorrente': block_repeat_rule(3),
+    'Desequilíbrio Recente': imbalance_rule,
+    'Empate Recorrente': recurrent_draw_rule,
+    'Empate Atrasado': overdue_draw_rule,
+    'Transição': transition_rule,
+    'Repetição do Trecho Final': match_rule,
+    'Desequilíbrio em Várias Janelas': window_rule,
+}
+
+def rule_stats(codes, probabilities=DEFAULT_PROBABILITIES, params=DEFAULT_PARAMS):
+    """
+    Por regra: [disparos, acertos, acertos esperados ao acaso] nas rodadas em que o app daria uma
+    sugestão (a partir de MIN_RESULTS_FOR_SUGGESTION resultados) e existe um resultado seguinte.
+    """
+    features = round_features(codes)
+    evaluated = slice(MIN_RESULTS_FOR_SUGGESTION - 1, codes.shape[1] - 1)
+    outcome = codes[:, 1:][:, evaluated.start:]
+    chance = np.array(probabilities)
+    stats = {}
+    for name, rule in RULES.items():
+        fired, bet = rule(features, params)
+        fired, bet = fired[:, evaluated], bet[:, evaluated]
+        # Mesmo critério de check_guarantee_status: acerto só quando o resultado é a aposta
+        hits = outcome == bet
+        stats[name] = [int(fired.sum()), int((fired & hits).sum()), float(chance[bet[fired]].sum())]
+    return stats
+
+def simulate_batch(seed, sessions, session_length, probabilities, pipeline_sessions, max_history=MAX_HISTORY_TO_STORE):
+    """Um lote: contadores das regras vetorizadas e do pipeline completo (amostra)."""
+    rng = np.random.default_rng(seed)
+    codes = simulate_codes(rng, sessions, session_length, probabilities)
+    pipeline = empty_stats()
+    for row in codes[:pipeline_sessions]:
+        merge_stats(pipeline, backtest_chunk(row.astype(np.uint8).tobytes(), 0, 0, max_history))
+    return {
+        'rounds': sessions * session_length,
+        'evaluated': sessions * max(session_length - MIN_RESULTS_FOR_SUGGESTION, 0),
+        'rules': rule_stats(codes, probabilities),
+        'pipeline': pipeline,
+    }
+
+def merge_batch(total, partial):
+    for key in ('rounds', 'evaluated'):
+        total[key] += partial[key]
+    for name, counters in partial['rules'].items():
+        merged = total['rules'].setdefault(name, [0, 0, 0.0])
+        for i, value in enumerate(counters):
+            merged[i] += value
+    merge_stats(total['pipeline'], partial['pipeline'])
+    return total
+
+def run_simulation(rounds, probabilities=DEFAULT_PROBABILITIES, session_length=MAX_HISTORY_TO_STORE, seed=0,
+                   workers=None, batch_sessions=BATCH_SESSIONS, pipeline_sessions=PIPELINE_SESSIONS):
+    """
+    Simula pelo menos 'rounds' rodadas em sessões de 'session_length' e devolve os contadores
+    agregados. Com workers=1 roda no processo atual.
+    """
+    if not 0 < session_length <= MAX_HISTORY_TO_STORE:
+        raise ValueError(f"session_length deve estar entre 1 e {MAX_HISTORY_TO_STORE}.")
+    probabilities = np.asarray(probabilities, dtype=float)
+    if len(probabilities) != 3 or probabilities.min() < 0 or not np.isclose(probabilities.sum(), 1):
+        raise ValueError("As probabilidades de Casa, Visitante e Empate devem ser não negativas e somar 1.")
+    probabilities = tuple(probabilities)
+
+    sessions = -(-rounds // session_length)
+    sizes = [min(batch_sessions, sessions - start) for start in range(0, sessions, batch_sessions)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(batch_seed, size, session_length, probabilities, min(pipeline_sessions, size)) for batch_seed, size in zip(seeds, sizes)]
+
+    total = {'rounds': 0, 'evaluated': 0, 'rules': {}, 'pipeline': empty_stats()}
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            merge_batch(total, simulate_batch(*job))
+        return total
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(simulate_batch, *zip(*jobs)):
+            merge_batch(total, partial)
+    return total
+
+def build_simulation_report(stats, probabilities, params=DEFAULT_PARAMS):
+    """
+    Taxa de disparo e de acerto de cada regra (com o acerto esperado ao acaso) e o relatório do
+    pipeline completo, com um confidence_factor que faria a confiança média igual ao acerto médio.
+    """
+    rules = {}
+    for name in RULES:
+        fired, hits, expected = stats['rules'].get(name, (0, 0, 0.0))
+        rules[name] = {
+            'fired': fired,
+            'firing_rate': percentage(fired, stats['evaluated']),
+            'hit_rate': percentage(hits, fired),
+            'chance_hit_rate': percentage(expected, fired),
+        }
+    pipeline = build_report(stats['pipeline'])
+    confidence_sum = sum(confidence for _, _, confidence in stats['pipeline']['calibration'].values())
+    suggested_factor = None
+    if confidence_sum:
+        mean_confidence = confidence_sum / stats['pipeline']['bets']
+        suggested_factor = round(params.confidence_factor * pipeline['hit_rate'] / mean_confidence, 3)
+    return {
+        'rounds': stats['rounds'],
+        'evaluated': stats['evaluated'],
+        'probabilities': dict(zip(RESULTS, probabilities)),
+        'rules': rules,
+        'pipeline': pipeline,
+        'suggested_confidence_factor': suggested_factor,
+    }
+
+def format_simulation_report(report):
+    probabilities = ", ".join(f"{result} {probability:.3f}" for result, probability in report['probabilities'].items())
+    lines = [
+        f"Rodadas simuladas: {report['rounds']} ({probabilities})",
+        "",
+        f"Regras ({report['evaluated']} rodadas com sugestão):",
+        f"  {'regra':<36} {'disparos':>10} {'taxa':>8} {'acerto':>8} {'ao acaso':>9}",
+    ]
+    for name, row in report['rules'].items():
+        lines.append(f"  {name:<36} {row['fired']:>10} {row['firing_rate']:>7}% {row['hit_rate']:>7}% {row['chance_hit_rate']:>8}%")
+    lines += ["", "Pipeline completo (amostra):", format_report(report['pipeline'])]
+    if report['suggested_confidence_factor'] is not None:
+        lines += ["", f"confidence_factor que iguala confiança média e acerto: {report['suggested_confidence_factor']}"]
+    return "\n".join(lines)
+
+def parse_probabilities(text):
+    values = tuple(float(value) for value in text.split(','))
+    if len(values) != 3:
+        raise argparse.ArgumentTypeError("Informe três probabilidades: Casa,Visitante,Empate.")
+    return values
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='football_studio.montecarlo', description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('--rounds', type=int, default=1_000_000, help='Rodadas simuladas (padrão: 1000000).')
+    parser.add_argument('--probabilities', type=parse_probabilities, default=DEFAULT_PROBABILITIES, metavar='CASA,VISITANTE,EMPATE',
+                        help='Probabilidade de cada resultado (padrão: 0.45,0.45,0.10).')
+    parser.add_argument('--session-length', type=int, default=MAX_HISTORY_TO_STORE,
+                        help=f'Rodadas por sessão simulada, a partir do histórico vazio (padrão: {MAX_HISTORY_TO_STORE}).')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Processos paralelos (padrão: número de CPUs).')
+    parser.add_argument('--batch-sessions', type=int, default=BATCH_SESSIONS, help=f'Sessões por lote (padrão: {BATCH_SESSIONS}).')
+    parser.add_argument('--pipeline-sessions', type=int, default=PIPELINE_SESSIONS,
+                        help=f'Sessões de cada lote avaliadas também pelo pipeline completo (padrão: {PIPELINE_SESSIONS}).')
+    parser.add_argument('--json', action='store_true', help='Imprime o relatório em JSON.')
+    args = parser.parse_args(argv)
+
+    try:
+        stats = run_simulation(args.rounds, args.probabilities, args.session_length, args.seed, args.workers,
+                               args.batch_sessions, args.pipeline_sessions)
+    except ValueError as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 2
+    report = build_simulation_report(stats, args.probabilities)
+    print(json.dumps(report, ensure_ascii=False, indent=2) if args.json else format_simulation_report(report))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
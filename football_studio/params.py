@@ -0,0 +1,63 @@
+"""Pesos e limiares usados por generate_advanced_suggestion."""
+
+import collections
+
+from football_studio.common import NUM_RECENT_RESULTS_FOR_ANALYSIS
+
+# Campo -> valor padrão (os valores que a sugestão sempre usou)
+PARAM_DEFAULTS = {
+    'window': NUM_RECENT_RESULTS_FOR_ANALYSIS, # Janela das análises de curto prazo
+    # Surf: continuação a partir de 'continuation_min_streak' e quebra a partir do limiar crítico
+    'continuation_min_streak': 4,
+    'continuation_base_score': 60,
+    'continuation_step_score': 10, # Pontos a mais por resultado além do mínimo (4x=60, 5x=70, 6x=80)
+    'critical_surf_threshold': 7,
+    'long_break_score': 130,
+    'record_break_min_streak': 4,
+    'record_break_score': 150,
+    'draw_record_break_min_streak': 2,
+    'draw_record_break_score': 80,
+    'break_reaction_score': 50,
+    # Padrões complexos recorrentes
+    'pattern_min_count': 3,
+    'pattern_2x1_score': 100,
+    'pattern_3x1_score': 120,
+    'pattern_2x2_score': 90,
+    'pattern_3x3_score': 110,
+    'alternating_block_score': 100,
+    # Desequilíbrio de cores na janela (percentuais)
+    'imbalance_low_pct': 40,
+    'imbalance_high_pct': 55,
+    'imbalance_score': 40,
+    # Empates
+    'recurrent_draw_score': 60,
+    'overdue_draw_rounds': 15,
+    'overdue_draw_score': 50,
+    # Transições: o resultado mais provável após o contexto atual, se bem acima da frequência geral
+    'transition_min_lift': 1.3,
+    'transition_score': 50,
+    # Repetição do trecho final: longo, já visto algumas vezes e quase sempre seguido do mesmo resultado
+    'match_min_length': 6,
+    'match_min_occurrences': 3,
+    'match_min_share': 0.7,
+    'match_score': 40,
+    # Desequilíbrio em várias janelas: a mesma cor abaixo de 'imbalance_low_pct' em todas as janelas completas
+    'multi_window_min_size': 27,
+    'multi_window_score': 30,
+    # Decisão final
+    'min_suggestion_score': 30,
+    'confidence_factor': 0.6,
+    'max_confidence': 95,
+}
+
+SuggestionParams = collections.namedtuple('SuggestionParams', PARAM_DEFAULTS, defaults=PARAM_DEFAULTS.values())
+SuggestionParams.__doc__ = "Pesos e limiares da pontuação de generate_advanced_suggestion (imutável, comparável e serializável)."
+
+DEFAULT_PARAMS = SuggestionParams()
+
+def params_from_dict(values):
+    """SuggestionParams a partir de um dicionário parcial; lança ValueError para campos desconhecidos."""
+    unknown = set(values) - set(PARAM_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Parâmetros desconhecidos: {', '.join(sorted(unknown))}")
+    return DEFAULT_PARAMS._replace(**values)
@@ -0,0 +1,89 @@
+"""Leitura de resultados em texto (H/A/D, nomes, cores ou emojis) e em binário."""
+
+from football_studio.common import RESULTS, RESULT_CODES
+
+# Aceita o nome do resultado, a inicial em inglês ou português, a cor ou o emoji
+RESULT_ALIASES = {
+    'home': 'home', 'h': 'home', 'casa': 'home', 'c': 'home', 'red': 'home', 'r': 'home', '🔴': 'home',
+    'away': 'away', 'a': 'away', 'visitante': 'away', 'v': 'away', 'blue': 'away', 'b': 'away', '🔵': 'away',
+    'draw': 'draw', 'd': 'draw', 'empate': 'draw', 'e': 'draw', 'yellow': 'draw', 'y': 'draw', '🟡': 'draw',
+}
+EMOJI_RESULTS = {'🔴': 'home', '🔵': 'away', '🟡': 'draw'}
+SEPARATORS = ',;|\t'
+
+def parse_token(token):
+    """Converte um token em 'home', 'away' ou 'draw'; lança ValueError se não for reconhecido."""
+    result = RESULT_ALIASES.get(token.strip().lower())
+    if result is None:
+        raise ValueError(f"Resultado não reconhecido: {token!r}")
+    return result
+
+def parse_line(line):
+    """Resultados de uma linha, na ordem em que aparecem."""
+    for separator in SEPARATORS:
+        line = line.replace(separator, ' ')
+    for token in line.split():
+        if token[0] in EMOJI_RESULTS:
+            # Emojis podem vir colados uns aos outros ("🔴🔵🟡")
+            for char in token:
+                if char in EMOJI_RESULTS:
+                    yield EMOJI_RESULTS[char]
+                elif not char.isspace() and char != '\ufe0f': # seletor de variação do emoji
+                    raise ValueError(f"Resultado não reconhecido: {char!r}")
+        else:
+            yield parse_token(token)
+
+def parse_results(lines):
+    """
+    Lê resultados de um iterável de linhas (arquivo, stdin ou texto colado) sem carregar tudo
+    na memória. Os resultados são devolvidos na ordem do texto; linhas vazias e comentários
+    iniciados por '#' são ignorados.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        yield from parse_line(line)
+
+def skip_header(lines):
+    """Repassa as linhas, descartando a primeira linha com conteúdo se ela não for de resultados (cabeçalho de CSV)."""
+    lines = iter(lines)
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        try:
+            list(parse_line(stripped))
+        except ValueError:
+            pass
+        else:
+            yield line
+        break
+    yield from lines
+
+BINARY_SUFFIXES = ('.bin', '.log')
+
+def encode_results(results):
+    """Codifica resultados em bytes, um byte por rodada (ver RESULT_CODES)."""
+    return bytes(RESULT_CODES[result] for result in results)
+
+def decode_results(data):
+    """Inverso de encode_results; lança ValueError para bytes desconhecidos."""
+    try:
+        return [RESULTS[code] for code in data]
+    except IndexError:
+        raise ValueError("Arquivo binário contém códigos de resultado inválidos.") from None
+
+def load_results(path):
+    """
+    Carrega um histórico gravado (do mais antigo para o mais recente). Arquivos .bin/.log são
+    lidos como um byte por rodada; os demais como texto/CSV em qualquer formato de parse_results
+    (a primeira linha de um .csv é ignorada se for um cabeçalho).
+    """
+    if str(path).endswith(BINARY_SUFFIXES):
+        with open(path, 'rb') as stream:
+            return decode_results(stream.read())
+    with open(path, encoding='utf-8') as stream:
+        if str(path).endswith('.csv'):
+            return list(parse_results(skip_header(stream)))
+        return list(parse_results(stream))
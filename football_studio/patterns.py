@@ -0,0 +1,41 @@
+"""
+Identificadores estruturados dos padrões detectados.
+
+Cada padrão é um Pattern(kind, colors, size): o tipo, as cores que aparecem no nome (na ordem
+do nome, a mais recente primeiro) e o tamanho do bloco de mesma cor que o caracteriza (1 quando
+não há blocos). Os registros são comparáveis e servem de chave nos dicionários de contagem de
+find_complex_patterns e analyze_draw_specifics; o texto exibido só é montado por pattern_label().
+"""
+
+import collections
+import functools
+
+Pattern = collections.namedtuple('Pattern', ['kind', 'colors', 'size'])
+
+# kind -> nome exibido; {0}, {1}, ... são as cores (capitalizadas) e {size} o tamanho do bloco
+PATTERN_LABELS = {
+    'quebra_simples': "Quebra Simples ({0} para {1})",
+    'n_para_1': "{size}x1 ({0} para {1})",
+    'zig_zag': "Zig-Zag / Alternado ({0}-{1}-{2})",
+    'alternancia_empate': "Alternância c/ Empate no Meio ({0}-Empate-{1})",
+    'n_para_n': "{size}x{size} ({0} para {1})",
+    'espelho': "Padrão Espelho ({0}-{1}-{2}-{3})",
+    'onda': "Padrão Onda 1-2-1 ({0}-{1}-{2}-{3})",
+    'dupla': "Dupla Repetida ({0})",
+    'bloco': "Padrão Bloco {size}x{size} ({0}-{1})",
+    'bloco_alternado': "Padrão Bloco Alternado {size}x{size} ({0}-{1})",
+    'escada_decrescente': "Padrão Escada Decrescente 3-2-1 ({0}-{1}-{2})",
+    'quebra_empate': "Quebra para Empate ({0} para Empate)",
+    'sequencia_empate': "{0}-{1}-Draw",
+}
+
+@functools.lru_cache(maxsize=None)
+def pattern_label(pattern):
+    """Nome do padrão como exibido ao usuário, por exemplo '2x1 (Red para Blue)'."""
+    return PATTERN_LABELS[pattern.kind].format(*(color.capitalize() for color in pattern.colors), size=pattern.size)
+
+def break_label(last_break):
+    """Texto da última quebra de analyze_break_probability: (cor anterior, cor atual) ou ()."""
+    if not last_break:
+        return ""
+    return f"Quebrou de {last_break[0].capitalize()} para {last_break[1].capitalize()}"
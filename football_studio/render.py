@@ -0,0 +1,142 @@
+"""
+Texto em markdown exibido pela interface (histórico e detalhes da análise).
+
+Cada bloco de detalhes é gerado uma única vez para cada combinação de valores e reaproveitado
+(lru_cache) enquanto a análise correspondente não muda, então uma nova rodada só refaz os
+blocos que de fato mudaram. Cada bloco é um único markdown em vez de uma chamada por linha.
+"""
+
+import functools
+
+from football_studio.common import (
+    NUM_RECENT_RESULTS_FOR_ANALYSIS,
+    NUM_HISTORY_TO_DISPLAY,
+    EMOJIS_PER_ROW,
+    get_color,
+    get_color_emoji,
+)
+from football_studio.patterns import pattern_label, break_label
+
+RENDER_CACHE_SIZE = 256
+
+def history_markdown(results, limit=NUM_HISTORY_TO_DISPLAY, per_row=EMOJIS_PER_ROW):
+    """Últimos 'limit' resultados como linhas de emojis ('per_row' por linha), em um único markdown."""
+    emojis = [get_color_emoji(get_color(result)) for result in results[:limit]]
+    lines = ("".join(emojis[i:i + per_row]) for i in range(0, len(emojis), per_row))
+    return "\n".join(f"#### {line}" for line in lines)
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def surf_markdown(current_home, max_home, current_away, max_away, current_draw, max_draw):
+    return "\n".join([
+        "##### Análise de Surf (Sequências):",
+        f"- Sequência Atual Home: {current_home} (Max: {max_home})",
+        f"- Sequência Atual Away: {current_away} (Max: {max_away})",
+        f"- Sequência Atual Draw: {current_draw} (Max: {max_draw})",
+    ])
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def colors_markdown(red, blue, yellow, color_pattern):
+    return "\n".join([
+        "##### Contagem de Cores (Últimos 27):",
+        f"- Vermelho (Casa): {red} ({red/NUM_RECENT_RESULTS_FOR_ANALYSIS*100:.1f}%)",
+        f"- Azul (Visitante): {blue} ({blue/NUM_RECENT_RESULTS_FOR_ANALYSIS*100:.1f}%)",
+        f"- Amarelo (Empate): {yellow} ({yellow/NUM_RECENT_RESULTS_FOR_ANALYSIS*100:.1f}%)",
+        f"- Padrão de Cores Recentes: {color_pattern}",
+    ])
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def complex_patterns_markdown(pattern_counts):
+    lines = ["##### Padrões Complexos Detectados:"]
+    if pattern_counts:
+        lines.extend(f"- {pattern_label(pattern)}: {count} ocorrências" for pattern, count in pattern_counts)
+    else:
+        lines.append("Nenhum padrão complexo detectado recentemente.")
+    return "\n".join(lines)
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def break_markdown(break_chance, last_break):
+    return "\n".join([
+        "##### Probabilidade de Quebra:",
+        f"- Chance de Quebra (últimos {NUM_RECENT_RESULTS_FOR_ANALYSIS} resultados): {break_chance}%",
+        f"- Último Tipo de Quebra: {break_label(last_break)}",
+    ])
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def draw_markdown(draw_frequency, time_since_last_draw, recurrent_draw, draw_pattern_counts):
+    lines = [
+        "##### Análise de Empates:",
+        f"- Frequência de Empates (últimos {NUM_RECENT_RESULTS_FOR_ANALYSIS} resultados): {draw_frequency}%",
+        f"- Tempo desde o Último Empate: {time_since_last_draw} rodadas",
+        f"- Empate Recorrente Detectado: {'Sim' if recurrent_draw else 'Não'}",
+    ]
+    if draw_pattern_counts:
+        lines.append("- Padrões de Empate Específicos:")
+        lines.extend(f"  - {pattern_label(pattern)}: {count} ocorrências" for pattern, count in draw_pattern_counts)
+    return "\n".join(lines)
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def transitions_markdown(order, context, next_counts, samples):
+    lines = ["##### Transições (Todo o Histórico):"]
+    if order:
+        lines.append(f"- Contexto Atual: {context} (últimos {order} resultados, {samples} ocorrências anteriores)")
+        lines.extend(f"- Depois veio {label}: {count} ({count / samples * 100:.1f}%)"
+                     for label, count in zip(("Casa", "Visitante", "Empate"), next_counts))
+    else:
+        lines.append("Histórico insuficiente para estimar transições.")
+    return "\n".join(lines)
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def longest_match_markdown(length, context, occurrences, next_counts):
+    lines = ["##### Repetição do Trecho Final:"]
+    if length:
+        lines.append(f"- Maior Trecho Repetido: {context} (últimos {length} resultados, {occurrences} ocorrências anteriores)")
+        lines.extend(f"- Depois veio {label}: {count} ({count / occurrences * 100:.1f}%)"
+                     for label, count in zip(("Casa", "Visitante", "Empate"), next_counts))
+    else:
+        lines.append("O último resultado ainda não tinha ocorrido no histórico.")
+    return "\n".join(lines)
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def windows_markdown(rows):
+    """Tabela das estatísticas por janela; 'rows' são tuplas (janela, tamanho, vermelho, azul, empate, quebras)."""
+    lines = [
+        "##### Estatísticas por Janela:",
+        "| Janela | Resultados | Vermelho | Azul | Empate | Quebras |",
+        "|---|---|---|---|---|---|",
+    ]
+    for window, size, red, blue, yellow, breaks in rows:
+        if not size or (window is not None and size < window):
+            continue # Janela ainda incompleta: repetiria a linha de todo o histórico
+        label = "Todo o histórico" if window is None else f"Últimos {window}"
+        cells = [f"{count} ({count / size * 100:.1f}%)" for count in (red, blue, yellow)]
+        break_chance = f"{breaks / (size - 1) * 100:.1f}%" if size >= 2 else "-"
+        lines.append(f"| {label} | {size} | {' | '.join(cells)} | {break_chance} |")
+    return "\n".join(lines)
+
+def details_markdown(surf_analysis, color_analysis, complex_patterns, break_probability, draw_specifics,
+                     transition_analysis=None, match_analysis=None, window_stats=None):
+    """Os blocos de 'Detalhes da Análise', na ordem de exibição."""
+    blocks = [
+        surf_markdown(
+            surf_analysis['current_home_sequence'], surf_analysis['max_home_sequence'],
+            surf_analysis['current_away_sequence'], surf_analysis['max_away_sequence'],
+            surf_analysis['current_draw_sequence'], surf_analysis['max_draw_sequence'],
+        ),
+        colors_markdown(color_analysis['red'], color_analysis['blue'], color_analysis['yellow'],
+                        color_analysis['color_pattern_27']),
+        complex_patterns_markdown(tuple(complex_patterns.items())),
+        break_markdown(break_probability['break_chance'], break_probability['last_break']),
+        draw_markdown(draw_specifics['draw_frequency_27'], draw_specifics['time_since_last_draw'],
+                      draw_specifics['recurrent_draw'], tuple(draw_specifics['draw_patterns'].items())),
+    ]
+    if transition_analysis is not None:
+        blocks.append(transitions_markdown(transition_analysis['order'], transition_analysis['context'],
+                                           tuple(transition_analysis['next_counts'].values()), transition_analysis['samples']))
+    if match_analysis is not None:
+        blocks.append(longest_match_markdown(match_analysis['length'], match_analysis['context'],
+                                             match_analysis['occurrences'], tuple(match_analysis['next_counts'].values())))
+    if window_stats is not None:
+        blocks.append(windows_markdown(tuple(
+            (row['window'], row['size'], row['red'], row['blue'], row['yellow'], row['breaks']) for row in window_stats
+        )))
+    return blocks
@@ -0,0 +1,101 @@
+"""
+Regras de padrão sobre janelas de até 6 cores, compiladas em uma tabela de consulta.
+
+Todas as regras de find_complex_patterns e analyze_draw_specifics olham apenas para as cores que
+começam em uma posição i (colors[i], colors[i+1], ...), no máximo 6. Com 3 cores há só 3^6 = 729
+janelas possíveis, então cada regra é avaliada uma única vez por janela na importação do módulo e
+a detecção passa a ser uma atualização de código em base 3 e uma consulta à tabela por posição.
+
+Para criar uma regra nova basta acrescentar um WindowRule em WINDOW_RULES (e, se for um tipo
+novo de padrão, o seu nome em patterns.PATTERN_LABELS).
+"""
+
+import collections
+
+from football_studio.patterns import Pattern
+
+WINDOW_SIZE = 6
+NUM_WINDOW_CODES = 3 ** WINDOW_SIZE
+COLORS = ('red', 'blue', 'yellow') # Mesma ordem de RESULT_CODES
+COLOR_CODES = {color: code for code, color in enumerate(COLORS)}
+HIGH_DIGIT = 3 ** (WINDOW_SIZE - 1)
+
+# kind: 'p' (find_complex_patterns), 'd' (padrões de empate) ou 'b' (quebra de cor, sem chave).
+# group: find_complex_patterns insere as chaves do grupo 0 posição a posição e só depois as do
+# grupo 1 (Dupla Repetida); a ordem das regras na lista é a ordem de avaliação em cada posição.
+# condition e key recebem a tupla de cores que começa na posição (c[0] é a mais recente);
+# key devolve o Pattern usado como chave das contagens (ver patterns.py).
+WindowRule = collections.namedtuple('WindowRule', ['kind', 'size', 'group', 'condition', 'key'])
+
+WINDOW_RULES = [
+    WindowRule('b', 2, 0, lambda c: c[0] != c[1], lambda c: None),
+    WindowRule('p', 2, 0, lambda c: c[0] != c[1],
+               lambda c: Pattern('quebra_simples', (c[0], c[1]), 1)),
+    WindowRule('p', 3, 0, lambda c: c[0] == c[1] and c[0] != c[2],
+               lambda c: Pattern('n_para_1', (c[0], c[2]), 2)),
+    WindowRule('p', 3, 0, lambda c: c[0] != c[1] and c[1] != c[2] and c[0] == c[2],
+               lambda c: Pattern('zig_zag', (c[0], c[1], c[2]), 1)),
+    WindowRule('p', 3, 0, lambda c: c[1] == 'yellow' and c[0] != 'yellow' and c[2] != 'yellow' and c[0] != c[2],
+               lambda c: Pattern('alternancia_empate', (c[0], c[2]), 1)),
+    WindowRule('p', 4, 0, lambda c: c[0] == c[1] and c[1] == c[2] and c[0] != c[3],
+               lambda c: Pattern('n_para_1', (c[0], c[3]), 3)),
+    WindowRule('p', 4, 0, lambda c: c[0] == c[1] and c[2] == c[3] and c[0] != c[2],
+               lambda c: Pattern('n_para_n', (c[0], c[2]), 2)),
+    WindowRule('p', 4, 0, lambda c: c[0] != c[1] and c[1] == c[2] and c[0] == c[3],
+               lambda c: Pattern('espelho', (c[0], c[1], c[2], c[3]), 1)),
+    WindowRule('p', 4, 0, lambda c: c[0] != c[1] and c[1] == c[2] and c[2] != c[3] and c[0] == c[3],
+               lambda c: Pattern('onda', (c[0], c[1], c[2], c[3]), 1)),
+    WindowRule('p', 6, 0, lambda c: c[0] == c[1] and c[1] == c[2] and c[3] == c[4] and c[4] == c[5] and c[0] != c[3],
+               lambda c: Pattern('n_para_n', (c[0], c[3]), 3)),
+    WindowRule('p', 2, 1, lambda c: c[0] == c[1],
+               lambda c: Pattern('dupla', (c[0],), 2)),
+    WindowRule('d', 2, 0, lambda c: c[1] == 'yellow' and c[0] != 'yellow',
+               lambda c: Pattern('quebra_empate', (c[0],), 1)),
+    WindowRule('d', 3, 0, lambda c: c[2] == 'yellow' and c[0] == 'red' and c[1] == 'blue',
+               lambda c: Pattern('sequencia_empate', ('red', 'blue'), 1)),
+    WindowRule('d', 3, 0, lambda c: c[2] == 'yellow' and c[0] == 'blue' and c[1] == 'red',
+               lambda c: Pattern('sequencia_empate', ('blue', 'red'), 1)),
+]
+
+def decode_window(code):
+    """Cores da janela codificada (dígito mais significativo = cor mais recente)."""
+    colors = []
+    for _ in range(WINDOW_SIZE):
+        code, digit = divmod(code, 3)
+        colors.append(COLORS[digit])
+    return tuple(reversed(colors))
+
+def compile_rules(rules):
+    """
+    Monta a tabela table[n][code] -> tupla de (kind, size, group, rank, key) com as regras que
+    casam na janela 'code' quando há n cores disponíveis a partir da posição (n de 0 a 6).
+    'rank' é a posição da regra na lista e define a ordem de avaliação.
+    """
+    table = [[()] * NUM_WINDOW_CODES for _ in range(WINDOW_SIZE + 1)]
+    for code in range(NUM_WINDOW_CODES):
+        colors = decode_window(code)
+        matches = [
+            (rule.kind, rule.size, rule.group, rank, rule.key(colors))
+            for rank, rule in enumerate(rules) if rule.condition(colors)
+        ]
+        for available in range(WINDOW_SIZE + 1):
+            table[available][code] = tuple(match for match in matches if match[1] <= available)
+    return table
+
+PATTERN_TABLE = compile_rules(WINDOW_RULES)
+
+def push_code(code, color):
+    """Atualiza o código em base 3 com uma nova cor mais recente (a mais antiga sai da janela)."""
+    return COLOR_CODES[color] * HIGH_DIGIT + code // 3
+
+def window_matches(colors):
+    """
+    Para cada posição i de 'colors' (mais recente primeiro), as regras que casam na janela que
+    começa em i, na ordem de avaliação. Uma atualização de código e uma consulta por posição.
+    """
+    matches = [()] * len(colors)
+    code = 0
+    for i in range(len(colors) - 1, -1, -1):
+        code = COLOR_CODES[colors[i]] * HIGH_DIGIT + code // 3
+        matches[i] = PATTERN_TABLE[min(len(colors) - i, WINDOW_SIZE)][code]
+    return matches
@@ -0,0 +1,99 @@
+"""
+Histórico em sequências (resultado, tamanho) em vez de rodada a rodada.
+
+Uma rodada nova só estende a última sequência ou abre outra, e descartar a rodada mais antiga só
+encurta a primeira, então as duas operações são O(1). A sequência atual, o máximo histórico de
+cada resultado e os padrões de bloco ancorados no resultado mais recente saem das sequências,
+com custo proporcional ao número de sequências consultadas e não ao de rodadas.
+"""
+
+import collections
+import itertools
+
+from football_studio.common import MAX_HISTORY_TO_STORE, RESULTS
+
+BLOCK_PATTERN_SPAN = 12 # Cores mais recentes consideradas pelos padrões de bloco e escada
+BLOCK_PATTERN_RUNS = 4 # Sequências mais recentes consultadas por esses padrões
+
+def run_lengths(results, limit=None):
+    """Sequências (resultado, tamanho) de 'results' (mais recente primeiro), só nas 'limit' primeiras rodadas."""
+    if limit is not None:
+        results = itertools.islice(results, limit)
+    return [(result, len(list(group))) for result, group in itertools.groupby(results)]
+
+def current_run_length(results):
+    """Tamanho da sequência atual (resultados iguais ao mais recente)."""
+    for _, group in itertools.groupby(results):
+        return len(list(group))
+    return 0
+
+class RunHistory:
+    """
+    Sequências dos últimos 'max_history' resultados. Para cada resultado, 'max_runs' guarda as
+    sequências candidatas ao máximo histórico em tamanhos decrescentes (da mais antiga para a
+    mais recente), o que mantém o máximo correto quando a sequência mais antiga é encurtada.
+    """
+
+    def __init__(self, max_history=MAX_HISTORY_TO_STORE):
+        self.max_history = max_history
+        self.clear()
+
+    def clear(self):
+        self.size = 0 # Número de resultados armazenados
+        self.runs = collections.deque() # [resultado, tamanho], da mais antiga para a mais recente
+        self.max_runs = {result: collections.deque() for result in RESULTS}
+
+    def push(self, result):
+        """Inclui o resultado mais recente, descartando o mais antigo se o histórico estiver cheio."""
+        if self.runs and self.runs[-1][0] == result:
+            run = self.runs[-1]
+            run[1] += 1
+        else:
+            run = [result, 1]
+            self.runs.append(run)
+        candidates = self.max_runs[result]
+        if candidates and candidates[-1] is run:
+            candidates.pop()
+        while candidates and candidates[-1][1] <= run[1]:
+            candidates.pop()
+        candidates.append(run)
+
+        self.size += 1
+        if self.size > self.max_history:
+            self.size -= 1
+            self.evict_oldest()
+
+    def evict_oldest(self):
+        """Encurta a sequência mais antiga em um resultado."""
+        oldest = self.runs[0]
+        oldest[1] -= 1
+        candidates = self.max_runs[oldest[0]]
+        if candidates[0] is oldest and (oldest[1] == 0 or (len(candidates) > 1 and candidates[1][1] >= oldest[1])):
+            candidates.popleft()
+        if oldest[1] == 0:
+            self.runs.popleft()
+
+    def current(self):
+        """(resultado, tamanho) da sequência atual; (None, 0) sem resultados."""
+        if not self.runs:
+            return None, 0
+        result, length = self.runs[-1]
+        return result, length
+
+    def max_length(self, result):
+        """Maior sequência de 'result' no histórico armazenado."""
+        candidates = self.max_runs[result]
+        return candidates[0][1] if candidates else 0
+
+    def recent(self, limit, count=BLOCK_PATTERN_RUNS):
+        """
+        Até 'count' sequências mais recentes (mais recente primeiro) dentro das últimas 'limit'
+        rodadas, com a última cortada no limite; igual a run_lengths(results, limit)[:count].
+        """
+        recent = []
+        for result, length in reversed(self.runs):
+            if limit <= 0 or len(recent) == count:
+                break
+            recent.append((result, min(length, limit)))
+            limit -= length
+        return recent
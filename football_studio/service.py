@@ -0,0 +1,392 @@
+"""
+Serviço asyncio que mantém o histórico de várias mesas, recebe resultados por um socket TCP local
+e envia as sugestões a quem estiver inscrito.
+
+Protocolo: uma mensagem JSON por linha.
+    {"type": "result", "table": "mesa-1", "result": "home"}      -> registra um resultado
+    {"type": "clear", "table": "mesa-1"}                         -> apaga o histórico da mesa
+    {"type": "subscribe", "table": "mesa-1"}                     -> recebe as sugestões da mesa ('*' = todas)
+    {"type": "history", "table": "mesa-1"}                       -> pede o histórico da mesa
+O serviço envia {"type": "suggestion", "table": ..., "round": ..., "last_result": ..., "suggestion": {...}}
+após processar cada lote de resultados de uma mesa; 'round' é o número de resultados da mesa desde a
+última limpeza. Um pedido de histórico é respondido na mesma conexão, depois de aplicados os
+resultados enviados antes dele, com {"type": "history", "table": ..., "round": ..., "results": [...]}
+(os últimos resultados, do mais antigo para o mais recente). Uma linha inválida recebe
+{"type": "error", "message": ...} na mesma conexão, e um lote que falha ao ser aplicado é informado aos
+inscritos da mesa como {"type": "error", "table": ..., "message": ...}.
+
+Cada mesa tem uma fila limitada (o leitor da conexão espera quando ela enche, o que segura o
+cliente via TCP) e uma tarefa própria que junta todos os resultados pendentes em um único lote:
+rajadas de eventos geram uma única análise. A análise roda em threads do executor, fora do loop
+de eventos, e as filas dos inscritos descartam a sugestão mais antiga quando o inscrito não acompanha.
+
+Uso:
+    python -m football_studio.service serve [--port 8765] [--log-dir historico_mesas]
+    python -m football_studio.service simulate [--tables 4] [--rounds 1000] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import sys
+import threading
+
+from football_studio.common import MAX_HISTORY_TO_STORE, RESULTS
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.memo import SuggestionCache
+from football_studio.storage import LogStore, TABLE_ID_PATTERN
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+TABLE_QUEUE_SIZE = 1000
+SUBSCRIBER_QUEUE_SIZE = 100
+ALL_TABLES = '*'
+CLEAR_TABLE = 'clear' # Marcador na fila da mesa: apaga o histórico na ordem em que chegou
+
+class TableState:
+    """Histórico, estado incremental e log persistente de uma mesa."""
+
+    def __init__(self, table_id, log=None, max_history=MAX_HISTORY_TO_STORE, cache=None):
+        self.table_id = table_id
+        self.log = log
+        self.max_history = max_history
+        self.cache = cache or SuggestionCache()
+        self.history = ResultHistory(max_history)
+        self.analyzer = IncrementalAnalyzer(max_history)
+        self.round = 0 # Resultados da mesa desde a última limpeza (com log, o tamanho do log)
+        self.queue = asyncio.Queue(TABLE_QUEUE_SIZE)
+        self.latest = None
+
+    def load(self):
+        """Recarrega o histórico do log da mesa, se houver (roda fora do loop, como apply)."""
+        if self.log is not None:
+            self.history, self.analyzer = self.log.load(self.max_history)
+            self.round = len(self.log)
+
+    def commit(self, results):
+        """Grava os resultados no log e só depois os aplica em memória: uma falha na gravação não adianta a memória."""
+        if self.log is not None:
+            self.log.extend(results)
+        for result in results:
+            self.history.push(result)
+            self.analyzer.push(result)
+        self.round += len(results)
+
+    def snapshot(self):
+        """Mensagem com a rodada e o histórico em memória (do mais antigo para o mais recente)."""
+        return {'type': 'history', 'table': self.table_id, 'round': self.round, 'results': list(self.history)[::-1]}
+
+    def apply(self, batch):
+        """Aplica um lote de resultados e devolve a mensagem de sugestão (roda fora do loop)."""
+        pending = []
+        for result in batch:
+            if result == CLEAR_TABLE:
+                # O que veio antes da limpeza é gravado antes de o log ser apagado
+                self.commit(pending)
+                pending = []
+                if self.log is not None:
+                    self.log.truncate()
+                self.history.clear()
+                self.analyzer.clear()
+                self.round = 0
+                continue
+            pending.append(result)
+        self.commit(pending)
+        suggestion = self.cache.generate(self.history, *self.analyzer.analyze_all())
+        return {
+            'type': 'suggestion',
+            'table': self.table_id,
+            'round': self.round,
+            'batch_size': len(batch),
+            'last_result': pending[-1] if pending else None,
+            'suggestion': suggestion,
+        }
+
+class Subscriber:
+    """Fila de mensagens de um inscrito; quando cheia, a mensagem mais antiga é descartada."""
+
+    def __init__(self, table_id):
+        self.table_id = table_id
+        self.queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def offer(self, message):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(message)
+
+class SuggestionService:
+    """Dono das mesas: ingestão de resultados, análise por mesa e distribuição das sugestões."""
+
+    def __init__(self, store=None, max_history=MAX_HISTORY_TO_STORE):
+        self.store = store
+        self.max_history = max_history
+        self.cache = SuggestionCache() # Compartilhado entre as mesas
+        self.tables = {}
+        self.workers = {}
+        self.subscribers = set()
+
+    def table(self, table_id):
+        if table_id not in self.tables:
+            if not TABLE_ID_PATTERN.match(table_id):
+                raise ValueError(f"Identificador de mesa inválido: {table_id!r}")
+            log = self.store.log(table_id) if self.store is not None else None
+            state = TableState(table_id, log, self.max_history, self.cache)
+            self.tables[table_id] = state
+            self.workers[table_id] = asyncio.get_running_loop().create_task(self.table_worker(state))
+        return self.tables[table_id]
+
+    async def submit(self, table_id, result):
+        """Enfileira um resultado; espera se a fila da mesa estiver cheia."""
+        if result not in RESULTS:
+            raise ValueError(f"Resultado não reconhecido: {result!r}")
+        await self.table(table_id).queue.put(result)
+
+    async def clear(self, table_id):
+        """Enfileira a limpeza do histórico da mesa (aplicada depois dos resultados já na fila)."""
+        await self.table(table_id).queue.put(CLEAR_TABLE)
+
+    async def history(self, table_id):
+        """Histórico e rodada da mesa depois de aplicados os resultados que já estavam na fila."""
+        request = asyncio.get_running_loop().create_future()
+        await self.table(table_id).queue.put(request)
+        return await request
+
+    async def table_worker(self, state):
+        loop = asyncio.get_running_loop()
+        # O log é lido no executor; os resultados que chegarem enquanto isso esperam na fila da mesa
+        try:
+            await loop.run_in_executor(None, state.load)
+        except Exception as error:
+            self.publish(error_message(f"Falha ao carregar o histórico: {error}", state.table_id))
+        while True:
+            batch = [await state.queue.get()]
+            while not state.queue.empty():
+                batch.append(state.queue.get_nowait())
+            # Pedidos de histórico são respondidos na ordem da fila, depois dos resultados anteriores a eles
+            segment = []
+            for item in batch:
+                if isinstance(item, asyncio.Future):
+                    if segment:
+                        await self.apply_batch(state, segment)
+                        segment = []
+                    if not item.done():
+                        item.set_result(state.snapshot())
+                else:
+                    segment.append(item)
+            if segment:
+                await self.apply_batch(state, segment)
+
+    async def apply_batch(self, state, batch):
+        # Um lote com falha é informado aos inscritos e descartado; a mesa continua recebendo resultados
+        try:
+            message = await asyncio.get_running_loop().run_in_executor(None, state.apply, batch)
+        except Exception as error:
+            self.publish(error_message(f"Falha ao aplicar o lote: {error}", state.table_id))
+            return
+        state.latest = message
+        self.publish(message)
+
+    def publish(self, message):
+        for subscriber in self.subscribers:
+            if subscriber.table_id in (ALL_TABLES, message['table']):
+                subscriber.offer(message)
+
+    def subscribe(self, table_id):
+        subscriber = Subscriber(table_id)
+        self.subscribers.add(subscriber)
+        # O novo inscrito recebe de imediato a última sugestão conhecida
+        for state in self.tables.values():
+            if state.latest is not None and table_id in (ALL_TABLES, state.table_id):
+                subscriber.offer(state.latest)
+        return subscriber
+
+    async def handle_connection(self, reader, writer):
+        sender = None
+        subscriber = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError(f"A mensagem deve ser um objeto JSON: {message!r}")
+                    if message.get('type') == 'result':
+                        await self.submit(message['table'], message['result'])
+                    elif message.get('type') == 'clear':
+                        await self.clear(message['table'])
+                    elif message.get('type') == 'history':
+                        writer.write(encode_message(await self.history(message['table'])))
+                    elif message.get('type') == 'subscribe' and subscriber is None:
+                        subscriber = self.subscribe(message.get('table', ALL_TABLES))
+                        sender = asyncio.get_running_loop().create_task(self.send_messages(subscriber, writer))
+                    else:
+                        raise ValueError(f"Mensagem não reconhecida: {message!r}")
+                except (ValueError, KeyError, TypeError) as error:
+                    writer.write(encode_message(error_message(str(error))))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if subscriber is not None:
+                self.subscribers.discard(subscriber)
+            if sender is not None:
+                sender.cancel()
+            writer.close()
+
+    async def send_messages(self, subscriber, writer):
+        while True:
+            writer.write(encode_message(await subscriber.queue.get()))
+            await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+def encode_message(message):
+    return (json.dumps(message, ensure_ascii=False) + '\n').encode('utf-8')
+
+def error_message(text, table_id=None):
+    message = {'type': 'error', 'message': text}
+    if table_id is not None:
+        message['table'] = table_id
+    return message
+
+# --- Simulador local ---
+
+async def simulate_feed(host=DEFAULT_HOST, port=DEFAULT_PORT, tables=4, rounds=1000, interval=0.0,
+                        seed=1, weights=(45, 45, 10), burst=1):
+    """
+    Envia resultados aleatórios (reprodutíveis pela semente) para 'tables' mesas: substitui a
+    fonte ao vivo em testes offline. 'burst' resultados por mesa são enviados de uma vez a cada
+    'interval' segundos.
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    table_ids = [f"sim-{n + 1}" for n in range(tables)]
+    sent = 0
+    while sent < rounds:
+        for table_id in table_ids:
+            for _ in range(min(burst, rounds - sent)):
+                result = rng.choices(RESULTS, weights)[0]
+                writer.write(encode_message({'type': 'result', 'table': table_id, 'result': result}))
+            await writer.drain()
+        sent += burst
+        if interval:
+            await asyncio.sleep(interval)
+    writer.close()
+    await writer.wait_closed()
+
+# --- Cliente síncrono (usado pela interface Streamlit) ---
+
+class ServiceClient:
+    """
+    Cliente bloqueante para o serviço: envia resultados e mantém, em uma thread de fundo, a última
+    sugestão recebida de cada mesa.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0):
+        self.address = (host, port)
+        self.timeout = timeout
+        self.latest = {}
+        self.condition = threading.Condition()
+        self.send_lock = threading.Lock()
+        self.sender = socket.create_connection(self.address, timeout)
+        self.replies = self.sender.makefile('r', encoding='utf-8') # Respostas aos pedidos de histórico
+        self.listener = socket.create_connection(self.address, timeout)
+        self.listener.sendall(encode_message({'type': 'subscribe', 'table': ALL_TABLES}))
+        self.listener.settimeout(None)
+        threading.Thread(target=self.listen, args=(self.listener,), daemon=True).start()
+
+    def listen(self, connection):
+        with connection, connection.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                message = json.loads(line)
+                if message.get('type') == 'suggestion':
+                    with self.condition:
+                        self.latest[message['table']] = message
+                        self.condition.notify_all()
+
+    def close(self):
+        self.replies.close()
+        self.sender.close()
+        self.listener.shutdown(socket.SHUT_RDWR)
+
+    def send_result(self, table_id, result):
+        with self.send_lock:
+            self.sender.sendall(encode_message({'type': 'result', 'table': table_id, 'result': result}))
+
+    def send_results(self, table_id, results):
+        """Envia vários resultados (do mais antigo para o mais recente) de uma só vez; o serviço os junta em poucos lotes."""
+        data = b''.join(encode_message({'type': 'result', 'table': table_id, 'result': result}) for result in results)
+        with self.send_lock:
+            self.sender.sendall(data)
+
+    def clear_table(self, table_id):
+        with self.send_lock:
+            self.sender.sendall(encode_message({'type': 'clear', 'table': table_id}))
+
+    def load_history(self, table_id):
+        """
+        (rodada, resultados do mais antigo para o mais recente) da mesa no serviço, já com os
+        resultados enviados antes por este cliente. Lança ValueError se o serviço recusar o pedido
+        e OSError se a resposta não chegar em 'timeout' segundos.
+        """
+        with self.send_lock:
+            self.sender.sendall(encode_message({'type': 'history', 'table': table_id}))
+            line = self.replies.readline()
+        if not line:
+            raise ConnectionError("O serviço encerrou a conexão")
+        message = json.loads(line)
+        if message.get('type') != 'history' or message.get('table') != table_id:
+            raise ValueError(message.get('message') or f"Resposta inesperada do serviço: {message!r}")
+        return message['round'], message['results']
+
+    def wait_for(self, table_id, round_number, timeout=1.0):
+        """Sugestão da mesa correspondente a exatamente 'round_number' resultados; None após o timeout."""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.latest.get(table_id, {}).get('round') == round_number, timeout)
+            message = self.latest.get(table_id)
+            if message is not None and message['round'] == round_number:
+                return message
+            return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='football_studio.service', description='Serviço de sugestões multi-mesa.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='Inicia o serviço.')
+    serve.add_argument('--host', default=DEFAULT_HOST)
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--log-dir', help='Diretório dos logs das mesas (sem ele o histórico fica só em memória).')
+    serve.add_argument('--max-history', type=int, default=MAX_HISTORY_TO_STORE)
+    simulate = commands.add_parser('simulate', help='Envia resultados simulados para o serviço.')
+    simulate.add_argument('--host', default=DEFAULT_HOST)
+    simulate.add_argument('--port', type=int, default=DEFAULT_PORT)
+    simulate.add_argument('--tables', type=int, default=4)
+    simulate.add_argument('--rounds', type=int, default=1000, help='Rodadas por mesa.')
+    simulate.add_argument('--interval', type=float, default=0.0, help='Segundos entre rajadas.')
+    simulate.add_argument('--burst', type=int, default=1, help='Resultados por mesa em cada rajada.')
+    simulate.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'serve':
+            store = LogStore(args.log_dir) if args.log_dir else None
+            asyncio.run(SuggestionService(store, args.max_history).serve(args.host, args.port))
+        else:
+            asyncio.run(simulate_feed(args.host, args.port, args.tables, args.rounds, args.interval,
+                                      args.seed, burst=args.burst))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
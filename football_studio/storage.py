@@ -0,0 +1,199 @@
+"""
+Armazenamento persistente do histórico: um log somente de anexação por mesa, com um byte por
+rodada (ver RESULT_CODES), lido via mmap.
+
+Cada append() é um único os.write de 1 byte em um arquivo aberto com O_APPEND, então uma queda
+no meio da gravação não deixa registros parciais; com sync=True o byte também passa por fsync.
+A leitura mapeia o arquivo em memória e devolve uma LogView (mais recente primeiro) sobre os
+bytes, sem cópia, que pode ser passada diretamente às funções de análise.
+
+O arquivo nunca encolhe no lugar: compact() e truncate() gravam o novo conteúdo em outro arquivo e
+o trocam com os.replace. Views ainda abertas continuam lendo o arquivo antigo (com o conteúdo de
+quando foram criadas) em vez de receber SIGBUS ao ler além do fim de um arquivo truncado.
+"""
+
+import mmap
+import os
+import re
+
+from football_studio.common import MAX_HISTORY_TO_STORE, RESULTS, RESULT_CODES
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+
+LOG_SUFFIX = '.log'
+TABLE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+class LogView:
+    """
+    Janela de um log de resultados (do mais recente para o mais antigo) sobre um memoryview dos
+    bytes gravados, sem cópia. Oferece a mesma interface de leitura de HistoryView.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data # memoryview em ordem cronológica
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        size = len(self.data)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(size)
+            if step != 1:
+                return list(self)[index]
+            # Posições newest-first [start, stop) são os bytes [size - stop, size - start)
+            return LogView(self.data[size - max(stop, start):size - start])
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("índice fora do histórico")
+        return RESULTS[self.data[size - 1 - index]]
+
+    def __iter__(self):
+        for code in reversed(self.data):
+            yield RESULTS[code]
+
+    def __reversed__(self):
+        for code in self.data:
+            yield RESULTS[code]
+
+    def count(self, result):
+        return self.data.tobytes().count(RESULT_CODES[result])
+
+    def __eq__(self, other):
+        try:
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"LogView({len(self)} resultados)"
+
+def sync_directory(directory):
+    """fsync do diretório: torna duráveis as entradas criadas ou renomeadas nele."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class ResultLog:
+    """Log de resultados de uma mesa (arquivo somente de anexação, um byte por rodada)."""
+
+    def __init__(self, path, sync=True):
+        self.path = str(path)
+        self.sync = sync
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.map = None
+        self.mapped_size = 0
+
+    def append(self, result):
+        """Grava um resultado (o mais recente) no final do log."""
+        os.write(self.fd, bytes((RESULT_CODES[result],)))
+        if self.sync:
+            os.fsync(self.fd)
+
+    def extend(self, results):
+        """Grava vários resultados (do mais antigo para o mais recente) em uma única escrita."""
+        self.write_codes(bytes(RESULT_CODES[result] for result in results))
+
+    def write_codes(self, data):
+        """Grava resultados já codificados (um byte por rodada, ver RESULT_CODES) em uma única escrita."""
+        if data:
+            # os.write pode gravar só parte dos bytes; repete até gravar tudo
+            remaining = memoryview(data)
+            while remaining:
+                remaining = remaining[os.write(self.fd, remaining):]
+            if self.sync:
+                os.fsync(self.fd)
+
+    def __len__(self):
+        return os.fstat(self.fd).st_size
+
+    def view(self, last=None):
+        """
+        LogView dos últimos 'last' resultados (ou de todos), mapeando o arquivo em memória.
+        O mapeamento é refeito apenas quando o arquivo cresceu desde a última leitura.
+        """
+        size = len(self)
+        if size == 0:
+            return LogView(memoryview(b''))
+        if self.map is None or self.mapped_size != size:
+            with open(self.path, 'rb') as stream:
+                # O mapeamento anterior é liberado quando não houver mais views apontando para ele
+                self.map = mmap.mmap(stream.fileno(), size, access=mmap.ACCESS_READ)
+            self.mapped_size = size
+        data = memoryview(self.map)
+        if last is not None:
+            data = data[max(0, size - last):]
+        return LogView(data)
+
+    def load(self, max_history=MAX_HISTORY_TO_STORE):
+        """Reconstrói o histórico e o estado incremental a partir da cauda do log."""
+        tail = self.view(max_history)
+        history = ResultHistory(max_history)
+        analyzer = IncrementalAnalyzer(max_history)
+        for result in reversed(tail):
+            history.push(result)
+            analyzer.push(result)
+        return history, analyzer
+
+    def compact(self, keep=MAX_HISTORY_TO_STORE):
+        """
+        Descarta tudo menos os últimos 'keep' resultados. O novo conteúdo é gravado em um arquivo
+        temporário e substitui o log com os.replace, então uma queda no meio mantém o log antigo;
+        o diretório passa por fsync depois da troca para que a renomeação também sobreviva a uma queda.
+        """
+        self.replace_contents(self.view(keep).data.tobytes())
+
+    def truncate(self):
+        """Apaga todo o histórico da mesa (trocando o arquivo, como compact)."""
+        self.replace_contents(b'')
+
+    def replace_contents(self, data):
+        temporary = self.path + '.compact'
+        with open(temporary, 'wb') as stream:
+            stream.write(data)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(temporary, self.path)
+        sync_directory(os.path.dirname(os.path.abspath(self.path)))
+        self.reopen()
+
+    def reopen(self):
+        os.close(self.fd)
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.map = None
+        self.mapped_size = 0
+
+    def close(self):
+        os.close(self.fd)
+        self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class LogStore:
+    """Diretório com um log por mesa (<mesa>.log)."""
+
+    def __init__(self, directory, sync=True):
+        self.directory = str(directory)
+        self.sync = sync
+        self.logs = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def log(self, table_id):
+        """ResultLog da mesa, aberto uma única vez por LogStore."""
+        if not TABLE_ID_PATTERN.match(table_id):
+            raise ValueError(f"Identificador de mesa inválido: {table_id!r}")
+        if table_id not in self.logs:
+            self.logs[table_id] = ResultLog(os.path.join(self.directory, table_id + LOG_SUFFIX), self.sync)
+        return self.logs[table_id]
+
+    def tables(self):
+        return sorted(name[:-len(LOG_SUFFIX)] for name in os.listdir(self.directory) if name.endswith(LOG_SUFFIX))
@@ -0,0 +1,93 @@
+"""
+Índice de sufixos do histórico armazenado, limitado a MAX_MATCH_LENGTH resultados: responde se a
+sequência atual já aconteceu antes, qual o maior trecho final que se repetiu e o que veio depois
+de cada ocorrência.
+
+Cada contexto (j resultados consecutivos) é um nó identificado por um inteiro: 3^j mais o código
+em base 3 dos resultados, o mais recente no dígito menos significativo. O nó guarda quantas vezes
+Casa, Visitante e Empate vieram logo depois do contexto. Um novo resultado soma uma ocorrência
+nos contextos de tamanho 1..MAX_MATCH_LENGTH que terminam no resultado anterior, e descartar o
+mais antigo subtrai as que começavam nele; as duas operações e as consultas custam tempo
+proporcional ao tamanho do contexto. Diferente de um autômato de sufixos, o índice admite a
+remoção do resultado mais antigo, o que mantém as contagens restritas ao histórico armazenado.
+"""
+
+import collections
+
+from football_studio.common import MAX_HISTORY_TO_STORE, MAX_MATCH_LENGTH, RESULTS, RESULT_CODES, get_color
+
+class SuffixIndex:
+    """Contagens de 'o que veio depois' para todos os contextos de até 'max_length' resultados."""
+
+    def __init__(self, max_history=MAX_HISTORY_TO_STORE, max_length=MAX_MATCH_LENGTH):
+        self.max_history = max_history
+        self.max_length = max_length
+        self.powers = [3 ** j for j in range(max_length + 1)]
+        self.clear()
+
+    def clear(self):
+        self.codes = collections.deque() # Resultados armazenados, do mais antigo para o mais recente
+        self.nodes = {} # chave do contexto -> [Casa, Visitante, Empate] que vieram depois
+
+    def push(self, result):
+        """Inclui o resultado mais recente, descartando o mais antigo se o histórico estiver cheio."""
+        if len(self.codes) == self.max_history:
+            self.evict_oldest()
+        code = RESULT_CODES[result]
+        codes = self.codes
+        nodes = self.nodes
+        value = 0
+        for j in range(1, min(len(codes), self.max_length) + 1):
+            value += codes[-j] * self.powers[j - 1]
+            key = self.powers[j] + value
+            node = nodes.get(key)
+            if node is None:
+                node = nodes[key] = [0, 0, 0]
+            node[code] += 1
+        codes.append(code)
+
+    def evict_oldest(self):
+        """Remove as ocorrências de contextos que começam no resultado mais antigo."""
+        codes = self.codes
+        nodes = self.nodes
+        value = 0
+        for j in range(1, min(self.max_length, len(codes) - 1) + 1):
+            value = value * 3 + codes[j - 1]
+            key = self.powers[j] + value
+            node = nodes[key]
+            node[codes[j]] -= 1
+            if not any(node):
+                del nodes[key]
+        codes.popleft()
+
+    def lookup(self, context):
+        """[Casa, Visitante, Empate] que vieram depois de 'context' (do mais recente para o mais antigo)."""
+        value = 0
+        for j, result in enumerate(context):
+            value += RESULT_CODES[result] * self.powers[j]
+        return list(self.nodes.get(self.powers[len(context)] + value, (0, 0, 0)))
+
+    def longest_match(self):
+        """(tamanho, contagens) do maior trecho final do histórico que já tinha ocorrido antes."""
+        codes = self.codes
+        value = 0
+        length = 0
+        counts = [0, 0, 0]
+        for j in range(1, min(len(codes), self.max_length) + 1):
+            value += codes[-j] * self.powers[j - 1]
+            node = self.nodes.get(self.powers[j] + value)
+            if node is None:
+                break
+            length = j
+            counts = node
+        return length, counts
+
+    def analyze(self):
+        """Equivalente a analyze_longest_match(results)."""
+        length, counts = self.longest_match()
+        return {
+            'length': length,
+            'context': ''.join(get_color(RESULTS[self.codes[-1 - i]])[0].upper() for i in range(length)),
+            'occurrences': sum(counts),
+            'next_counts': dict(zip(RESULTS, counts)),
+        }
@@ -0,0 +1,243 @@
+"""
+Busca de pesos e limiares para generate_advanced_suggestion: avalia todas as combinações de uma
+grade de SuggestionParams sobre históricos gravados e as ordena pela taxa de acerto.
+
+Os históricos são codificados (um byte por rodada) em um único bloco de memória compartilhada
+que os workers apenas mapeiam, sem receber cópias. Cada tarefa recebe algumas combinações com a
+mesma janela e reproduz os históricos uma única vez: as análises de cada rodada são calculadas
+uma vez e pontuadas por todas as combinações da tarefa. Cada tarefa concluída é gravada como
+uma linha JSON no arquivo de saída, então uma execução interrompida continua de onde parou
+(combinações já avaliadas para os mesmos históricos são puladas).
+
+Uso:
+    python -m football_studio.sweep historico.csv [outro.log ...] --grid grade.json --out busca.jsonl
+    python -m football_studio.sweep historico.csv --set critical_surf_threshold=6,7,8 --set pattern_min_count=2,3
+grade.json: {"critical_surf_threshold": [6, 7, 8], "confidence_factor": [0.5, 0.6]}
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import itertools
+import json
+import os
+import sys
+from multiprocessing import shared_memory
+
+from football_studio.common import MAX_HISTORY_TO_STORE, MIN_RESULTS_FOR_SUGGESTION, RESULTS
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.analysis import generate_advanced_suggestion
+from football_studio.params import PARAM_DEFAULTS, params_from_dict
+from football_studio.parsing import load_results, encode_results
+from football_studio.backtest import percentage
+
+TASK_SIZE = 16 # Combinações avaliadas por tarefa (por passada nos históricos)
+MIN_BETS = 30 # Combinações com menos apostas ficam fora do ranking
+
+def parse_grid_option(text):
+    """'campo=v1,v2,...' -> (campo, [valores]) com o tipo do valor padrão do campo."""
+    field, _, values = text.partition('=')
+    field = field.strip()
+    if field not in PARAM_DEFAULTS or not values:
+        raise ValueError(f"Opção de grade inválida: {text!r}")
+    kind = type(PARAM_DEFAULTS[field])
+    return field, [kind(value) for value in values.split(',')]
+
+def expand_grid(grid):
+    """Todas as combinações de uma grade {campo: [valores]} como SuggestionParams."""
+    fields = list(grid)
+    return [params_from_dict(dict(zip(fields, values))) for values in itertools.product(*grid.values())]
+
+def params_key(params):
+    return json.dumps(params._asdict(), sort_keys=True)
+
+def dataset_id(encoded_histories, max_history):
+    """Identifica os históricos e o tamanho do histórico usados (para retomar só resultados compatíveis)."""
+    digest = hashlib.sha1(str(max_history).encode())
+    for encoded in encoded_histories:
+        digest.update(len(encoded).to_bytes(8, 'little'))
+        digest.update(encoded)
+    return digest.hexdigest()[:16]
+
+# --- Memória compartilhada ---
+
+def share_histories(encoded_histories):
+    """Copia os históricos para um bloco compartilhado; devolve o bloco e os (início, tamanho) de cada um."""
+    block = shared_memory.SharedMemory(create=True, size=max(1, sum(map(len, encoded_histories))))
+    offsets = []
+    position = 0
+    for encoded in encoded_histories:
+        block.buf[position:position + len(encoded)] = encoded
+        offsets.append((position, len(encoded)))
+        position += len(encoded)
+    return block, offsets
+
+worker_block = None
+worker_histories = None
+
+def attach_histories(name, offsets):
+    """Inicializador dos workers: mapeia o bloco compartilhado, sem copiar."""
+    global worker_block, worker_histories
+    # O bloco pertence ao processo principal, que o remove no final (os workers usam o mesmo resource_tracker)
+    worker_block = shared_memory.SharedMemory(name=name)
+    worker_histories = [worker_block.buf[start:start + size] for start, size in offsets]
+
+# --- Avaliação ---
+
+def evaluate_task(param_list, max_history=MAX_HISTORY_TO_STORE, histories=None):
+    """
+    Reproduz cada histórico uma vez e pontua todas as combinações de 'param_list' (mesma janela)
+    em cada rodada. Devolve [(params, contadores)], na ordem de 'param_list'.
+    """
+    if histories is None:
+        histories = worker_histories
+    window = param_list[0].window
+    counters = [{'rounds': 0, 'bets': 0, 'hits': 0} for _ in param_list]
+    for encoded in histories:
+        history = ResultHistory(max_history)
+        analyzer = IncrementalAnalyzer(max_history, window)
+        for position in range(len(encoded) - 1):
+            result = RESULTS[encoded[position]]
+            history.push(result)
+            analyzer.push(result)
+            if len(history) < MIN_RESULTS_FOR_SUGGESTION:
+                continue
+            analyses = analyzer.analyze_all()
+            outcome = RESULTS[encoded[position + 1]]
+            for params, stats in zip(param_list, counters):
+                bet_type = generate_advanced_suggestion(history, *analyses, params=params)['bet_type']
+                stats['rounds'] += 1
+                if bet_type != 'none':
+                    stats['bets'] += 1
+                    stats['hits'] += bet_type == outcome
+    return list(zip(param_list, counters))
+
+def make_tasks(param_list, task_size=TASK_SIZE):
+    """Divide as combinações em tarefas de até 'task_size', cada uma com uma única janela."""
+    by_window = {}
+    for params in param_list:
+        by_window.setdefault(params.window, []).append(params)
+    return [group[i:i + task_size] for group in by_window.values() for i in range(0, len(group), task_size)]
+
+def load_done(path, dataset):
+    """Linhas já gravadas em 'path' para o mesmo conjunto de históricos."""
+    if not path or not os.path.exists(path):
+        return []
+    rows = []
+    with open(path, encoding='utf-8') as stream:
+        for line in stream:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue # Linha cortada por uma interrupção no meio da gravação
+            if row.get('dataset') == dataset:
+                rows.append(row)
+    return rows
+
+def run_sweep(encoded_histories, param_list, out_path=None, workers=None, max_history=MAX_HISTORY_TO_STORE,
+              task_size=TASK_SIZE, progress=None):
+    """
+    Avalia as combinações ainda não gravadas em 'out_path' e devolve todas as linhas (antigas e
+    novas) deste conjunto de históricos. 'progress(concluídas, total)' é chamado a cada tarefa.
+    """
+    dataset = dataset_id(encoded_histories, max_history)
+    rows = load_done(out_path, dataset)
+    done = {params_key(params_from_dict(row['params'])) for row in rows}
+    pending = [params for params in dict.fromkeys(param_list) if params_key(params) not in done]
+    tasks = make_tasks(pending, task_size)
+
+    out = open(out_path, 'a', encoding='utf-8') if out_path else None
+    def store(results):
+        for params, stats in results:
+            row = dict(stats, dataset=dataset, hit_rate=percentage(stats['hits'], stats['bets']), params=params._asdict())
+            rows.append(row)
+            if out is not None:
+                out.write(json.dumps(row, ensure_ascii=False) + '\n')
+        if out is not None:
+            out.flush()
+
+    try:
+        if workers == 1 or len(tasks) <= 1:
+            histories = [memoryview(encoded) for encoded in encoded_histories]
+            for completed, task in enumerate(tasks, 1):
+                store(evaluate_task(task, max_history, histories))
+                if progress is not None:
+                    progress(completed, len(tasks))
+            return rows
+
+        block, offsets = share_histories(encoded_histories)
+        try:
+            with concurrent.futures.ProcessPoolExecutor(workers, initializer=attach_histories,
+                                                        initargs=(block.name, offsets)) as executor:
+                futures = [executor.submit(evaluate_task, task, max_history) for task in tasks]
+                try:
+                    for completed, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                        store(future.result())
+                        if progress is not None:
+                            progress(completed, len(tasks))
+                except KeyboardInterrupt:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            block.close()
+            block.unlink()
+        return rows
+    finally:
+        if out is not None:
+            out.close()
+
+def rank(rows, min_bets=MIN_BETS):
+    """Linhas com pelo menos 'min_bets' apostas, da maior para a menor taxa de acerto."""
+    return sorted((row for row in rows if row['bets'] >= min_bets), key=lambda row: (-row['hit_rate'], -row['bets'], json.dumps(row['params'], sort_keys=True)))
+
+def format_ranking(ranking, swept_fields, top):
+    lines = [f"{'#':>3} {'acerto':>7} {'apostas':>8} {'rodadas':>8}  parâmetros"]
+    for position, row in enumerate(ranking[:top], 1):
+        changed = ", ".join(f"{field}={row['params'][field]}" for field in swept_fields)
+        lines.append(f"{position:>3} {row['hit_rate']:>6}% {row['bets']:>8} {row['rounds']:>8}  {changed}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='football_studio.sweep', description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('histories', nargs='+', help='Históricos gravados (.csv/.txt em texto ou .bin/.log com um byte por rodada).')
+    parser.add_argument('--grid', help='Arquivo JSON {campo: [valores]} com a grade de busca.')
+    parser.add_argument('--set', action='append', default=[], metavar='CAMPO=V1,V2',
+                        help='Valores de um campo (pode ser repetido; soma-se à grade do --grid).')
+    parser.add_argument('--out', help='Arquivo JSON lines com os resultados (permite retomar a busca).')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Processos paralelos (padrão: número de CPUs).')
+    parser.add_argument('--task-size', type=int, default=TASK_SIZE, help=f'Combinações por tarefa (padrão: {TASK_SIZE}).')
+    parser.add_argument('--max-history', type=int, default=MAX_HISTORY_TO_STORE)
+    parser.add_argument('--min-bets', type=int, default=MIN_BETS, help=f'Mínimo de apostas para entrar no ranking (padrão: {MIN_BETS}).')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    try:
+        grid = {}
+        if args.grid:
+            with open(args.grid, encoding='utf-8') as stream:
+                grid.update(json.load(stream))
+        grid.update(parse_grid_option(option) for option in args.set)
+        param_list = expand_grid(grid)
+        encoded_histories = [encode_results(load_results(path)) for path in args.histories]
+    except (OSError, ValueError) as error:
+        print(f"Erro: {error}", file=sys.stderr)
+        return 2
+
+    def report(completed, total):
+        print(f"\r{completed}/{total} tarefas", end='', file=sys.stderr, flush=True)
+    try:
+        rows = run_sweep(encoded_histories, param_list, args.out, args.workers, args.max_history, args.task_size, report)
+    except KeyboardInterrupt:
+        print("\nInterrompido; execute de novo com o mesmo --out para continuar.", file=sys.stderr)
+        return 130
+    print(file=sys.stderr)
+
+    # O ranking considera apenas as combinações da grade atual
+    wanted = {params_key(params) for params in param_list}
+    rows = [row for row in rows if params_key(params_from_dict(row['params'])) in wanted]
+    print(format_ranking(rank(rows, args.min_bets), list(grid), args.top))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
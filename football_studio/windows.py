@@ -0,0 +1,68 @@
+"""
+Estatísticas de várias janelas (últimos 9, 27, 54, 100 resultados e todo o histórico) por somas
+acumuladas.
+
+Para cada k, sums guarda quantos Vermelhos, Azuis e Amarelos (empates) havia entre os k primeiros
+resultados recebidos e quantas quebras de cor entre eles. As contagens de qualquer janela são a
+diferença entre duas posições, em tempo constante, e push() grava uma posição nova. Só as últimas
+'max_history' + 1 posições são necessárias, então elas ficam em listas circulares.
+"""
+
+from football_studio.common import MAX_HISTORY_TO_STORE, STAT_WINDOWS, RESULT_CODES
+
+def window_row(window, size, counts, breaks):
+    """Linha de uma janela: contagens, frequência de empates e chance de quebra como em analyze_*."""
+    red, blue, yellow = counts
+    return {
+        'window': window,
+        'size': size,
+        'red': red,
+        'blue': blue,
+        'yellow': yellow,
+        'breaks': breaks,
+        'draw_frequency': round(yellow / size * 100, 2) if size else 0,
+        'break_chance': round(breaks / (size - 1) * 100, 2) if size >= 2 else 0,
+    }
+
+class WindowStats:
+    """Somas acumuladas por cor e de quebras dos últimos 'max_history' resultados."""
+
+    def __init__(self, max_history=MAX_HISTORY_TO_STORE, windows=STAT_WINDOWS):
+        self.max_history = max_history
+        self.windows = windows
+        self.capacity = max_history + 1
+        self.clear()
+
+    def clear(self):
+        self.total = 0 # Resultados recebidos (posição da soma mais recente)
+        self.size = 0 # Resultados ainda armazenados
+        self.last_code = None
+        # color_sums[c][k % capacity] e break_sums[k % capacity]: contagens nos k primeiros resultados
+        self.color_sums = [[0] * self.capacity for _ in range(3)]
+        self.break_sums = [0] * self.capacity
+
+    def push(self, result):
+        """Inclui o resultado mais recente; a posição mais antiga é sobrescrita quando cheio."""
+        code = RESULT_CODES[result]
+        previous = self.total % self.capacity
+        current = (self.total + 1) % self.capacity
+        for color, sums in enumerate(self.color_sums):
+            sums[current] = sums[previous] + (color == code)
+        self.break_sums[current] = self.break_sums[previous] + (self.size > 0 and code != self.last_code)
+        self.last_code = code
+        self.total += 1
+        self.size = min(self.size + 1, self.max_history)
+
+    def window(self, window=None):
+        """Linha dos últimos 'window' resultados (None = todo o histórico armazenado)."""
+        size = self.size if window is None else min(window, self.size)
+        end = self.total % self.capacity
+        start = (self.total - size) % self.capacity
+        counts = [sums[end] - sums[start] for sums in self.color_sums]
+        # Quebras entre pares da janela: a do primeiro resultado da janela olha para fora dela
+        breaks = self.break_sums[end] - self.break_sums[(self.total - size + 1) % self.capacity] if size else 0
+        return window_row(window, size, counts, breaks)
+
+    def analyze(self):
+        """Equivalente a analyze_windows(results)."""
+        return [self.window(window) for window in self.windows]
@@ -0,0 +1,64 @@
+"""Testes das regras de sugestão por tipo de padrão (analysis.PATTERN_RULES)."""
+
+import pytest
+
+from football_studio.analysis import PATTERN_RULES, analyze_all, generate_advanced_suggestion
+from football_studio.params import DEFAULT_PARAMS
+from football_studio.patterns import Pattern
+
+LETTERS = {'H': 'home', 'A': 'away', 'D': 'draw'}
+LETTER_COLORS = {'H': 'red', 'A': 'blue', 'D': 'yellow'}
+
+def history(text):
+    """Resultados de um texto H/A/D escrito do mais recente para o mais antigo."""
+    return [LETTERS[letter] for letter in text]
+
+def suggest(text, params=DEFAULT_PARAMS):
+    results = history(text)
+    analyses = analyze_all(results)
+    return analyses, generate_advanced_suggestion(results, *analyses, params=params)
+
+# (histórico do mais recente para o mais antigo, padrão que dispara a regra, aposta esperada)
+RULE_CASES = [
+    ('AAHAAAAAHAAHHAAAA', Pattern('n_para_1', ('blue', 'red'), 2), 'home'),
+    ('HHHAHHHAHHHAHDHAA', Pattern('n_para_1', ('red', 'blue'), 3), 'away'),
+    ('AAHHHDHAAHHHAHAAHH', Pattern('n_para_n', ('blue', 'red'), 2), 'away'),
+    ('HHHAAHHHAAAHHHAAAHHHAAA', Pattern('n_para_n', ('red', 'blue'), 3), 'away'),
+    ('AAHHAAHHHHAH', Pattern('bloco_alternado', ('blue', 'red'), 2), 'home'),
+    ('AAAHHHAAAHHHAAAHD', Pattern('bloco_alternado', ('blue', 'red'), 3), 'home'),
+]
+
+def test_every_rule_kind_has_a_firing_case():
+    assert {pattern.kind for _, pattern, _ in RULE_CASES} == set(PATTERN_RULES)
+
+@pytest.mark.parametrize('text, pattern, bet_type', RULE_CASES)
+def test_rule_fires_and_backs_the_suggestion(text, pattern, bet_type):
+    # O Bloco Alternado ocorre no máximo uma vez por janela: só pontua com 'pattern_min_count' = 1
+    params = DEFAULT_PARAMS._replace(pattern_min_count=1) if pattern.kind == 'bloco_alternado' else DEFAULT_PARAMS
+    (_, color_analysis, complex_patterns, *_), suggestion = suggest(text, params)
+    rule = PATTERN_RULES[pattern.kind]
+    recent_colors = [LETTER_COLORS[letter] for letter in text[:6]]
+    signal = rule(pattern, complex_patterns[pattern], recent_colors, color_analysis['streak'], params)
+    assert signal is not None and signal[0] == bet_type
+    assert suggestion['bet_type'] == bet_type
+    assert signal[2] in suggestion['reason']
+
+def test_alternating_block_stays_inert_with_default_params():
+    (_, _, complex_patterns, *_), suggestion = suggest('AAHHAAHHHHAH')
+    pattern = Pattern('bloco_alternado', ('blue', 'red'), 2)
+    # O padrão é ancorado no resultado mais recente: nunca passa de uma ocorrência por janela, então
+    # não alcança 'pattern_min_count' (como no app original)
+    assert complex_patterns[pattern] == 1
+    assert 'Bloco Alternado' not in suggestion['guarantee_pattern']
+
+    _, suggestion = suggest('AAHHAAHHHHAH', DEFAULT_PARAMS._replace(pattern_min_count=1))
+    assert 'Bloco Alternado 2x2' in suggestion['guarantee_pattern']
+
+def test_rules_ignore_a_scenario_that_does_not_match():
+    # 2x1 Azul para Vermelho só vale com exatamente dois azuis no fim
+    pattern = Pattern('n_para_1', ('blue', 'red'), 2)
+    assert PATTERN_RULES['n_para_1'](pattern, 5, ['blue', 'blue', 'blue', 'red'], 3, DEFAULT_PARAMS) is None
+    assert PATTERN_RULES['n_para_1'](pattern, 5, ['red', 'blue', 'blue', 'red'], 1, DEFAULT_PARAMS) is None
+    # Bloco alternado com empate na outra ponta não vira aposta
+    pattern = Pattern('bloco_alternado', ('blue', 'yellow'), 2)
+    assert PATTERN_RULES['bloco_alternado'](pattern, 1, ['blue', 'blue', 'yellow', 'yellow'], 2, DEFAULT_PARAMS) is None
@@ -0,0 +1,18 @@
+"""Testes da linha de comando."""
+
+from football_studio.cli import main
+
+def test_prints_the_final_suggestion(tmp_path, capsys):
+    path = tmp_path / 'resultados.txt'
+    path.write_text('H A H A H A H A D H\n', encoding='utf-8')
+    assert main([str(path), '--json']) == 0
+    assert '"round": 10' in capsys.readouterr().out
+
+def test_unreadable_input_is_reported_with_status_2(tmp_path, capsys):
+    assert main([str(tmp_path / 'inexistente.txt')]) == 2
+    assert capsys.readouterr().err.startswith('Erro: ')
+
+    path = tmp_path / 'resultados.txt'
+    path.write_bytes(b'H A \xff\n')
+    assert main([str(path)]) == 2
+    assert capsys.readouterr().err.startswith('Erro: ')
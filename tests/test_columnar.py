@@ -0,0 +1,110 @@
+"""Testes da exportação colunar: ida e volta em Parquet e Arrow, anexos e colunas de padrões."""
+
+import io
+import random
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from football_studio import columnar
+from football_studio.common import RESULTS
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.memo import SuggestionCache
+from football_studio.parsing import encode_results
+
+MAX_HISTORY = 30
+
+def random_results(count, seed=7):
+    rng = random.Random(seed)
+    return [rng.choice(RESULTS) for _ in range(count)]
+
+@pytest.mark.parametrize('name', ['analises.parquet', 'analises.arrow'])
+def test_export_round_trip_keeps_every_round(tmp_path, name):
+    results = random_results(200)
+    path = tmp_path / name
+    written = columnar.export_snapshots(results, str(path), chunk_size=64, max_history=MAX_HISTORY)
+    assert written == 200
+    table = columnar.read_snapshots(str(path))
+    assert table.schema.equals(columnar.SCHEMA)
+    assert table.column('round').to_pylist() == list(range(1, 201))
+    assert table.column('result').to_pylist() == results
+    assert columnar.read_codes(str(path)) == bytes(encode_results(results))
+
+def test_rows_match_the_analyzers_round_by_round(tmp_path):
+    results = random_results(120, seed=3)
+    path = tmp_path / 'analises.parquet'
+    columnar.export_snapshots(results, str(path), chunk_size=25, max_history=MAX_HISTORY)
+    rows = columnar.read_snapshots(str(path)).to_pylist()
+    history = ResultHistory(MAX_HISTORY)
+    analyzer = IncrementalAnalyzer(MAX_HISTORY)
+    cache = SuggestionCache()
+    for round_number, (result, row) in enumerate(zip(results, rows), 1):
+        history.push(result)
+        analyzer.push(result)
+        analyses = analyzer.analyze_all()
+        suggestion = cache.generate(history, *analyses)
+        surf, colors, complex_patterns, break_probability, draw_specifics = analyses[:5]
+        assert row['round'] == round_number
+        assert row['current_home_sequence'] == surf['current_home_sequence']
+        assert row['max_draw_sequence'] == surf['max_draw_sequence']
+        assert row['current_color'] == colors['current_color']
+        assert row['streak'] == colors['streak']
+        assert row['break_chance'] == break_probability['break_chance']
+        assert row['time_since_last_draw'] == draw_specifics['time_since_last_draw']
+        assert row['bet_type'] == suggestion['bet_type']
+        assert row['confidence'] == suggestion['confidence']
+        assert row['guarantee_pattern'] == suggestion['guarantee_pattern']
+        counts = {**complex_patterns, **draw_specifics['draw_patterns']}
+        for pattern in columnar.PATTERN_KEYS:
+            assert row[columnar.pattern_column(pattern)] == counts.get(pattern, 0)
+
+def test_pattern_columns_are_unique_and_invertible():
+    names = [columnar.pattern_column(pattern) for pattern in columnar.PATTERN_KEYS]
+    assert len(set(names)) == len(names)
+    assert [columnar.column_pattern(name) for name in names] == columnar.PATTERN_KEYS
+
+def test_parallel_chunks_match_a_single_pass(tmp_path):
+    results = random_results(150, seed=11)
+    single = tmp_path / 'single.arrow'
+    parallel = tmp_path / 'parallel.arrow'
+    columnar.export_snapshots(results, str(single), chunk_size=150, max_history=MAX_HISTORY)
+    columnar.export_snapshots(results, str(parallel), chunk_size=40, max_history=MAX_HISTORY, workers=2)
+    assert columnar.read_snapshots(str(parallel)).equals(columnar.read_snapshots(str(single)))
+
+@pytest.mark.parametrize('suffix', ['.parquet', '.arrow'])
+def test_appending_to_a_directory_reads_as_one_table(tmp_path, suffix):
+    results = random_results(180, seed=5)
+    full = tmp_path / f'full{suffix}'
+    columnar.export_snapshots(results, str(full), chunk_size=64, max_history=MAX_HISTORY)
+    directory = tmp_path / 'dataset'
+    directory.mkdir()
+    columnar.export_snapshots(results[:100], str(directory / f'part-0{suffix}'), max_history=MAX_HISTORY)
+    # O anexo grava só as rodadas novas; as anteriores servem de aquecimento
+    columnar.export_snapshots(results, str(directory / f'part-1{suffix}'), first_round=100, max_history=MAX_HISTORY)
+    table = columnar.read_snapshots(str(directory)).sort_by('round')
+    assert table.num_rows == 180
+    assert table.to_pylist() == columnar.read_snapshots(str(full)).to_pylist()
+    assert columnar.read_codes(str(directory)) == bytes(encode_results(results))
+
+@pytest.mark.parametrize('parquet', [True, False])
+def test_export_to_an_open_binary_file(parquet):
+    results = random_results(60, seed=2)
+    buffer = io.BytesIO()
+    columnar.export_snapshots(results, buffer, max_history=MAX_HISTORY, parquet=parquet)
+    buffer.seek(0)
+    table = columnar.read_snapshots(buffer, parquet=parquet)
+    assert table.column('result').to_pylist() == results
+
+def test_cli_export_and_import(tmp_path, capsys):
+    results = random_results(80, seed=9)
+    source = tmp_path / 'historico.txt'
+    source.write_text('\n'.join(results) + '\n', encoding='utf-8')
+    exported = tmp_path / 'analises.parquet'
+    output = tmp_path / 'historico.log'
+    assert columnar.main(['export', str(source), str(exported), '--max-history', str(MAX_HISTORY), '--workers', '1']) == 0
+    assert columnar.main(['import', str(exported), '--output', str(output)]) == 0
+    assert output.read_bytes() == bytes(encode_results(results))
+    assert columnar.main(['import', str(tmp_path / 'inexistente.parquet')]) == 1
+    assert 'Erro' in capsys.readouterr().err
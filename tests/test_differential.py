@@ -0,0 +1,23 @@
+"""Teste diferencial com volumes mínimos: nenhum motor pode divergir do oráculo congelado."""
+
+from benchmarks import differential
+
+TINY = {'random_cases': 20, 'max_random_length': 30, 'max_length': 3, 'long_histories': 1, 'long_rounds': 60}
+
+def test_every_engine_matches_the_oracle_on_tiny_settings():
+    reports = differential.run(list(differential.ENGINES), differential.MODES, TINY)
+
+    assert set(reports) == {'guarantee', *differential.MODES}
+    for mode, report in reports.items():
+        for name, entry in report.items():
+            assert entry['divergence'] is None, (mode, name, entry['divergence'])
+            assert entry['cases'] > 0
+    assert reports['exhaustive']['scan']['cases'] == sum(3 ** length for length in range(TINY['max_length'] + 1))
+    assert reports['long']['memo']['cases'] == TINY['long_rounds']
+    assert reports['guarantee']['pacote']['intended'] == {'user-022': 3}
+
+def test_new_analyses_are_timed_apart_from_the_oracle_equivalent_work():
+    report = differential.run(['scan'], ['random'], TINY)['random']['scan']
+    assert report['extra_seconds'] > 0
+    assert report['engine_seconds'] > 0
+    assert 'novas' in differential.format_reports({'random': {'scan': report}})
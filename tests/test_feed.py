@@ -0,0 +1,137 @@
+"""Testes da fonte ao vivo: leitura das linhas, fontes e aplicação do lote."""
+
+import threading
+import time
+
+import pytest
+
+from football_studio.feed import FileTailSource, LiveFeed, ReplaySource, apply_feed_batch, parse_feed_line
+from football_studio.analysis import check_guarantee_status
+from football_studio.history import ResultHistory
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.ledger import AccuracyLedger
+from football_studio.memo import SuggestionCache
+
+NO_SUGGESTION = {'suggestion': 'N/A', 'bet_type': 'none', 'guarantee_pattern': 'N/A'}
+
+@pytest.mark.parametrize('line, results', [
+    ('H A D\n', ['home', 'away', 'draw']),
+    ('🔴🔵🟡', ['home', 'away', 'draw']),
+    ('casa;visitante', ['home', 'away']),
+    ('{"result": "draw"}', ['draw']),
+    ('  {"type": "result", "table": "mesa-1", "result": "home"}\n', ['home']),
+    ('', []),
+    ('   \n', []),
+    ('# comentário', []),
+])
+def test_parse_feed_line_accepts_text_and_json(line, results):
+    assert parse_feed_line(line) == results
+
+@pytest.mark.parametrize('line', [
+    'X',
+    'H ? A',
+    '{"result": "red"}',
+    '{"result": 1}',
+    '{"type": "result"}',
+    '["home"]',
+    '{"result": "home"',
+])
+def test_parse_feed_line_rejects_invalid_lines(line):
+    with pytest.raises(ValueError):
+        parse_feed_line(line)
+
+def test_replay_is_deterministic_and_respects_bursts():
+    source = ReplaySource(rounds=10, seed=4, interval=0, burst=3)
+    lines = list(source.read(threading.Event()))
+    assert len(lines) == 4
+    assert [len(line.split()) for line in lines] == [3, 3, 3, 1]
+    assert lines == list(ReplaySource(rounds=10, seed=4, interval=0, burst=3).read(threading.Event()))
+    assert list(ReplaySource(['home', 'draw'], interval=0).read(threading.Event())) == ['home', 'draw']
+
+def test_live_feed_counts_rejected_lines_and_keeps_reading():
+    feed = LiveFeed(ReplaySource(['home', 'away'], interval=0))
+    feed.source.sequence = lambda: ['home', 'bogus', 'away']
+    feed.start()
+    feed.thread.join(5)
+    assert feed.drain() == ['home', 'away']
+    status = feed.status()
+    assert (status['received'], status['rejected'], status['running']) == (2, 1, False)
+    assert 'bogus' in status['error']
+
+def test_file_tail_reads_only_complete_new_lines(tmp_path):
+    path = tmp_path / 'resultados.txt'
+    path.write_text('H\n', encoding='utf-8')
+    stop = threading.Event()
+    lines = FileTailSource(path, from_start=True, poll_interval=0.01).read(stop)
+    assert next(lines) == 'H\n'
+    with open(path, 'a', encoding='utf-8') as stream:
+        stream.write('A D\n')
+    assert next(lines) == 'A D\n'
+    with open(path, 'a', encoding='utf-8') as stream:
+        stream.write('D')
+    with open(path, 'a', encoding='utf-8') as stream:
+        stream.write(' H\n')
+    assert next(lines) == 'D H\n'
+    stop.set()
+    assert list(lines) == []
+
+def test_file_tail_reads_binary_logs(tmp_path):
+    path = tmp_path / 'mesa.log'
+    path.write_bytes(b'\x00')
+    stop = threading.Event()
+    lines = FileTailSource(path, from_start=True, poll_interval=0.01).read(stop)
+    assert next(lines) == 'home'
+    with open(path, 'ab') as stream:
+        stream.write(b'\x01\x02')
+    assert next(lines) == 'away draw'
+    stop.set()
+
+def test_invalid_utf8_lines_are_rejected_without_stopping_the_feed(tmp_path):
+    path = tmp_path / 'resultados.txt'
+    path.write_bytes(b'H\n\xff\xfe\nA\n')
+    feed = LiveFeed(FileTailSource(path, from_start=True, poll_interval=0.01))
+    feed.start()
+    try:
+        received = []
+        for _ in range(500):
+            received += feed.drain()
+            if len(received) == 2:
+                break
+            time.sleep(0.01)
+        assert received == ['home', 'away']
+        status = feed.status()
+        assert (status['rejected'], status['running']) == (1, True)
+    finally:
+        feed.stop()
+
+def test_invalid_codes_in_a_binary_log_stop_the_feed_with_an_error(tmp_path):
+    path = tmp_path / 'mesa.log'
+    path.write_bytes(b'\x00\x07')
+    feed = LiveFeed(FileTailSource(path, from_start=True, poll_interval=0.01))
+    feed.start()
+    feed.thread.join(5)
+    status = feed.status()
+    assert not status['running']
+    assert 'inválidos' in status['error']
+
+def test_apply_feed_batch_matches_adding_results_one_by_one():
+    batch = ['home', 'away', 'draw', 'home', 'home', 'away', 'away', 'home', 'draw', 'home', 'away', 'away', 'home']
+    history, analyzer, ledger = ResultHistory(), IncrementalAnalyzer(), AccuracyLedger()
+    last, statuses = apply_feed_batch(batch, history, analyzer, SuggestionCache(), dict(NO_SUGGESTION), ledger)
+
+    expected_history, expected_analyzer, cache = ResultHistory(), IncrementalAnalyzer(), SuggestionCache()
+    expected_last = dict(NO_SUGGESTION)
+    expected_statuses = []
+    for result in batch:
+        if expected_last['bet_type'] != 'none':
+            expected_statuses.append(check_guarantee_status(result, expected_last['bet_type'], expected_last['guarantee_pattern']))
+        expected_history.push(result)
+        expected_analyzer.push(result)
+        if len(expected_history) >= 9:
+            suggestion = cache.generate(expected_history, *expected_analyzer.analyze_all())
+            expected_last = {key: suggestion[key] for key in ('suggestion', 'bet_type', 'confidence', 'guarantee_pattern')}
+
+    assert list(history) == list(expected_history)
+    assert last == expected_last
+    assert statuses == expected_statuses
+    assert len(ledger) == len(batch)
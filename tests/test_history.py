@@ -0,0 +1,20 @@
+"""Testes do histórico em buffer circular e das janelas sem cópia."""
+
+from football_studio.history import ResultHistory
+
+SEQUENCE = ['home', 'away', 'draw', 'home', 'home', 'away', 'draw', 'draw', 'away', 'home']
+
+def test_views_over_a_wrapped_buffer_iterate_count_and_reverse_like_lists():
+    history = ResultHistory(7)
+    for result in SEQUENCE:
+        history.push(result)
+    newest_first = list(reversed(SEQUENCE))[:7]
+    assert history.head + len(history) > history.capacity # A janela dá a volta no buffer
+
+    for start, stop in ((0, None), (0, 4), (2, 6), (5, 7), (3, 3)):
+        view = history[start:stop]
+        expected = newest_first[start:stop]
+        assert list(view) == expected
+        assert list(reversed(view)) == expected[::-1]
+        assert [view.count(result) for result in ('home', 'away', 'draw')] == [expected.count(result) for result in ('home', 'away', 'draw')]
+        assert view == expected
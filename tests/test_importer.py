@@ -0,0 +1,77 @@
+"""Testes da importação em lote: leitura em fluxo, limite de memória e aplicação única."""
+
+import pytest
+
+from football_studio.common import RESULT_CODES
+from football_studio.history import ResultHistory
+from football_studio.importer import import_results, read_codes
+from football_studio.incremental import IncrementalAnalyzer
+
+def codes_of(*results):
+    return bytearray(RESULT_CODES[result] for result in results)
+
+def test_reads_every_supported_format_in_text_order():
+    lines = ['H A D\n', '\n', '# comentário\n', 'casa,visitante;empate\n', '🔴🔵🟡\n', 'red|blue\tyellow\n']
+    codes, total = read_codes(lines)
+    assert codes == codes_of('home', 'away', 'draw') * 4
+    assert total == 12
+
+def test_newest_first_is_reversed_to_chronological_order():
+    codes, total = read_codes(['H A\n', 'D\n'], newest_first=True)
+    assert codes == codes_of('draw', 'away', 'home')
+    assert total == 3
+
+def test_memory_keeps_only_the_most_recent_results():
+    lines = ['H\n'] * 5 + ['A\n', 'D\n']
+    codes, total = read_codes(lines, keep=3)
+    assert codes == codes_of('home', 'away', 'draw')
+    assert total == 7
+    # Mais recente primeiro: os primeiros do texto são os que ficam
+    codes, total = read_codes(['D A\n'] + ['H\n'] * 5, newest_first=True, keep=3)
+    assert codes == codes_of('home', 'away', 'draw')
+    assert total == 7
+
+def test_csv_header_is_skipped_only_when_it_is_not_a_result_row():
+    codes, _ = read_codes(['\n', 'resultado\n', 'H\n', 'A\n'], csv_header=True)
+    assert codes == codes_of('home', 'away')
+    codes, _ = read_codes(['H\n', 'A\n'], csv_header=True)
+    assert codes == codes_of('home', 'away')
+
+def test_errors_report_the_line_of_the_text():
+    with pytest.raises(ValueError, match='Linha 4'):
+        read_codes(['resultado\n', 'H\n', '\n', 'X\n'], csv_header=True)
+    # Sem cabeçalho, a primeira linha inválida é um erro
+    with pytest.raises(ValueError, match='Linha 1'):
+        read_codes(['resultado\n', 'H\n'])
+
+def test_progress_fraction_counts_utf8_bytes():
+    lines = ['🔴\n'] * 25_000
+    total_size = sum(len(line.encode('utf-8')) for line in lines)
+    reports = []
+    codes, total = read_codes(lines, progress=lambda count, fraction: reports.append((count, fraction)), total_size=total_size)
+    assert total == 25_000
+    assert [count for count, _ in reports] == [10_000, 20_000, 25_000]
+    assert reports[0][1] == pytest.approx(0.4)
+    assert reports[1][1] == pytest.approx(0.8)
+    assert reports[-1][1] == 1.0
+
+def test_import_applies_the_batch_once_and_matches_pushing_one_by_one():
+    results = ['home', 'away', 'draw', 'home', 'home', 'away'] * 10
+    history = ResultHistory(30)
+    analyzer = IncrementalAnalyzer(30)
+    imported = import_results([result[0].upper() + '\n' for result in results], history, analyzer)
+
+    expected = IncrementalAnalyzer(30)
+    for result in results:
+        expected.push(result)
+    assert imported == 30
+    assert list(history) == list(reversed(results))[:30]
+    assert analyzer.analyze_all() == expected.analyze_all()
+
+def test_a_bad_line_leaves_the_history_untouched():
+    history = ResultHistory(30)
+    analyzer = IncrementalAnalyzer(30)
+    with pytest.raises(ValueError):
+        import_results(['H\n', 'A\n', '?\n'], history, analyzer)
+    assert len(history) == 0
+    assert analyzer.total == 0
@@ -0,0 +1,48 @@
+"""Testes da instrumentação dos estágios."""
+
+import tracemalloc
+
+from football_studio.instrumentation import Instrumentation
+
+def test_disabled_instrumentation_records_nothing():
+    instrumentation = Instrumentation()
+    with instrumentation.stage('analyze_surf'):
+        pass
+    assert instrumentation.snapshot() == []
+
+def test_stages_count_calls_and_time():
+    instrumentation = Instrumentation(enabled=True)
+    for _ in range(3):
+        with instrumentation.stage('analyze_surf'):
+            pass
+    [row] = instrumentation.snapshot()
+    assert row['stage'] == 'analyze_surf'
+    assert row['calls'] == 3
+    assert row['mean_alloc_kb'] is None
+    assert 'football_studio_stage_calls_total{stage="analyze_surf"} 3' in instrumentation.to_prometheus()
+
+def test_nested_stage_does_not_reset_the_outer_allocation_sample():
+    instrumentation = Instrumentation(enabled=True, trace_allocations=True, alloc_sample_every=1)
+    try:
+        with instrumentation.stage('outer'):
+            block = bytearray(1 << 20)
+            with instrumentation.stage('inner'):
+                pass
+            del block
+    finally:
+        instrumentation.set_trace_allocations(False)
+    rows = {row['stage']: row for row in instrumentation.snapshot()}
+    assert rows['outer']['mean_alloc_kb'] >= 1024
+    # A amostra interna foi pulada porque a externa estava em andamento
+    assert rows['inner']['calls'] == 1
+    assert rows['inner']['mean_alloc_kb'] is None
+    assert not tracemalloc.is_tracing()
+
+def test_disabling_allocation_sampling_keeps_a_tracemalloc_started_elsewhere():
+    tracemalloc.start()
+    try:
+        instrumentation = Instrumentation(enabled=True, trace_allocations=True)
+        instrumentation.set_trace_allocations(False)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
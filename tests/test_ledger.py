@@ -0,0 +1,54 @@
+"""Testes do registro de acerto por padrão de garantia e por faixa de confiança."""
+
+import io
+import os
+import subprocess
+import sys
+
+from football_studio.ledger import AccuracyLedger, Tally
+
+def suggestion(bet_type, confidence=0, guarantee_pattern='N/A'):
+    return {'bet_type': bet_type, 'confidence': confidence, 'guarantee_pattern': guarantee_pattern}
+
+def test_ledger_does_not_pull_in_the_backtest_module():
+    script = "import sys, football_studio.ledger; print('football_studio.backtest' in sys.modules)"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True, cwd=root)
+    assert output.stdout.strip() == 'False'
+
+def test_tally_keeps_a_rolling_window():
+    tally = Tally(window=3)
+    for hit in [1, 1, 0, 0, 0]:
+        tally.record(hit)
+    row = tally.row()
+    assert (row['bets'], row['hits'], row['misses'], row['hit_rate']) == (5, 2, 3, 40.0)
+    assert (row['recent_bets'], row['recent_hit_rate']) == (3, 0.0)
+
+def test_components_and_buckets_are_tallied_per_bet():
+    ledger = AccuracyLedger()
+    ledger.record(suggestion('home', 57, '2x1 (Blue para Red), Empate Atrasado'), 'home')
+    ledger.record(suggestion('none'), 'away')
+    ledger.record(suggestion('away', 51, '2x1 (Blue para Red)'), 'draw')
+    assert len(ledger) == 3
+
+    patterns = {row['pattern']: row for row in ledger.pattern_summary()}
+    assert (patterns['2x1 (Blue para Red)']['bets'], patterns['2x1 (Blue para Red)']['hits']) == (2, 1)
+    assert (patterns['Empate Atrasado']['bets'], patterns['Empate Atrasado']['hits']) == (1, 1)
+    assert [(row['confidence'], row['bets'], row['hits']) for row in ledger.bucket_summary()] == [('50-59%', 2, 1)]
+    assert (ledger.total.bets, ledger.total.hits) == (2, 1)
+
+def test_rounds_round_trip_through_csv():
+    ledger = AccuracyLedger()
+    ledger.record(suggestion('draw', 36, 'Empate Recorrente'), 'draw')
+    ledger.record(suggestion('none'), 'home')
+    assert list(ledger.rounds()) == [
+        {'round': 1, 'bet_type': 'draw', 'confidence': 36, 'guarantee_pattern': 'Empate Recorrente', 'outcome': 'draw', 'hit': 1},
+        {'round': 2, 'bet_type': 'none', 'confidence': 0, 'guarantee_pattern': 'N/A', 'outcome': 'home', 'hit': ''},
+    ]
+    stream = io.StringIO()
+    ledger.write_csv(stream)
+    assert stream.getvalue().splitlines() == [
+        'round,bet_type,confidence,guarantee_pattern,outcome,hit',
+        '1,draw,36,Empate Recorrente,draw,1',
+        '2,none,0,N/A,home,',
+    ]
@@ -0,0 +1,88 @@
+"""Testes das regras vetorizadas da simulação de Monte Carlo contra o pipeline escalar."""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from football_studio import montecarlo
+from football_studio.analysis import (
+    analyze_all, check_guarantee_status, generate_advanced_suggestion,
+    match_signal, transition_signal, window_signal,
+)
+from football_studio.common import MIN_RESULTS_FOR_SUGGESTION, RESULTS, RESULT_CODES
+from football_studio.params import DEFAULT_PARAMS
+
+# Nome da regra em montecarlo.RULES -> sinal escalar equivalente (aposta, pontos, motivo) ou None
+SCALAR_SIGNALS = {
+    'Transição': lambda results, analyses, params: transition_signal(analyses[5], params),
+    'Repetição do Trecho Final': lambda results, analyses, params: match_signal(analyses[6], params),
+    'Desequilíbrio em Várias Janelas': lambda results, analyses, params: window_signal(analyses[7], params),
+}
+
+@pytest.fixture(scope='module')
+def simulated():
+    rng = np.random.default_rng(7)
+    # Duas sessões com muitos empates e duas quase sem cores alternadas, para exercitar todas as regras
+    codes = np.concatenate([
+        montecarlo.simulate_codes(rng, 2, 160, (0.4, 0.4, 0.2)),
+        montecarlo.simulate_codes(rng, 2, 160, (0.7, 0.25, 0.05)),
+    ])
+    return codes, montecarlo.round_features(codes)
+
+def scalar_rounds(codes):
+    for session, row in enumerate(codes):
+        for t in range(MIN_RESULTS_FOR_SUGGESTION - 1, len(row)):
+            results = [RESULTS[code] for code in row[t::-1]]
+            yield session, t, results, analyze_all(results)
+
+@pytest.mark.parametrize('name', sorted(SCALAR_SIGNALS))
+def test_vectorized_rule_matches_the_scalar_signal(simulated, name):
+    codes, features = simulated
+    fired, bet = montecarlo.RULES[name](features, DEFAULT_PARAMS)
+    firings = 0
+    for session, t, results, analyses in scalar_rounds(codes):
+        signal = SCALAR_SIGNALS[name](results, analyses, DEFAULT_PARAMS)
+        assert bool(fired[session, t]) == (signal is not None), (name, session, t)
+        if signal is not None:
+            assert RESULTS[bet[session, t]] == signal[0]
+            firings += 1
+    assert firings > 0
+
+def test_transition_and_match_features_match_the_analyzers(simulated):
+    codes, features = simulated
+    for session, t, results, analyses in scalar_rounds(codes):
+        transitions, match = analyses[5], analyses[6]
+        assert features['transition_order'][session, t] == transitions['order']
+        if transitions['order']:
+            assert [features['transition_counts'][r, session, t] for r in range(3)] == \
+                [transitions['next_counts'][result] for result in RESULTS]
+        assert features['match_length'][session, t] == match['length']
+        assert [features['match_counts'][r, session, t] for r in range(3)] == \
+            [match['next_counts'][result] for result in RESULTS]
+
+def test_draw_record_break_bets_home_like_the_live_scorer():
+    # Dois empates seguidos igualam o recorde: Casa e Visitante recebem os mesmos pontos e o desempate fica com Casa
+    results = ['draw', 'draw', 'home', 'away', 'home', 'away', 'away', 'home', 'away', 'home']
+    suggestion = generate_advanced_suggestion(results, *analyze_all(results))
+    assert 'Quebra de Surf Max (Empate)' in suggestion['guarantee_pattern']
+    assert suggestion['bet_type'] == 'home'
+
+    codes = np.array([[RESULT_CODES[result] for result in reversed(results)]], dtype=np.int8)
+    fired, bet = montecarlo.draw_record_break_rule(montecarlo.round_features(codes), DEFAULT_PARAMS)
+    assert fired[0, -1] and RESULTS[bet[0, -1]] == 'home'
+    # Um Visitante a seguir é falha, como em check_guarantee_status
+    assert check_guarantee_status('away', 'home', suggestion['guarantee_pattern'])['status'] == 'FALHA'
+
+def test_rule_stats_counts_hits_only_on_the_exact_bet():
+    codes = np.array([[2, 2, 0, 1, 0, 1, 1, 0, 2, 2, 1]], dtype=np.int8)
+    stats = montecarlo.rule_stats(codes)
+    fired, bet = montecarlo.draw_record_break_rule(montecarlo.round_features(codes), DEFAULT_PARAMS)
+    assert fired[0, 9] and bet[0, 9] == RESULT_CODES['home']
+    # A rodada seguinte é Visitante: a quebra de empate disparou e errou
+    assert stats['Quebra de Surf Max (Empate)'][:2] == [1, 0]
+
+def test_simulation_is_reproducible_across_worker_counts():
+    single = montecarlo.run_simulation(6000, session_length=300, seed=3, workers=1, batch_sessions=5, pipeline_sessions=1)
+    parallel = montecarlo.run_simulation(6000, session_length=300, seed=3, workers=2, batch_sessions=5, pipeline_sessions=1)
+    assert single['rules'] == parallel['rules']
+    assert set(single['rules']) == set(montecarlo.RULES)
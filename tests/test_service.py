@@ -0,0 +1,217 @@
+"""Testes do protocolo do serviço multi-mesa (uma mensagem JSON por linha sobre TCP)."""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from football_studio import service
+from football_studio.service import SuggestionService, encode_message
+from football_studio.storage import LogStore
+
+async def start(service_instance):
+    server = await asyncio.start_server(service_instance.handle_connection, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    return server, reader, writer
+
+async def receive(reader):
+    return json.loads(await asyncio.wait_for(reader.readline(), 5))
+
+async def close(server, writer):
+    writer.close()
+    server.close()
+    await server.wait_closed()
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+def test_results_are_analyzed_and_sent_to_subscribers():
+    async def scenario():
+        server, reader, writer = await start(SuggestionService())
+        writer.write(encode_message({'type': 'subscribe', 'table': 'mesa-1'}))
+        for result in ['home', 'away', 'draw']:
+            writer.write(encode_message({'type': 'result', 'table': 'mesa-1', 'result': result}))
+        writer.write(encode_message({'type': 'result', 'table': 'mesa-2', 'result': 'home'}))
+        await writer.drain()
+        messages = [await receive(reader)]
+        while messages[-1]['round'] < 3:
+            messages.append(await receive(reader))
+        await close(server, writer)
+        return messages
+
+    messages = run(scenario())
+    assert all(message['type'] == 'suggestion' and message['table'] == 'mesa-1' for message in messages)
+    assert sum(message['batch_size'] for message in messages) == 3
+    assert messages[-1]['last_result'] == 'draw'
+    assert 'bet_type' in messages[-1]['suggestion']
+
+def test_invalid_messages_get_an_error_reply_and_keep_the_connection():
+    invalid = [
+        b'{nao e json\n',
+        b'[1]\n',
+        b'"x"\n',
+        b'3\n',
+        b'null\n',
+        encode_message({'type': 'desconhecido'}),
+        encode_message({'type': 'result', 'table': 'mesa-1'}),
+        encode_message({'type': 'result', 'table': 'mesa-1', 'result': 'red'}),
+        encode_message({'type': 'result', 'table': '../fora', 'result': 'home'}),
+        encode_message({'type': 'result', 'table': 3, 'result': 'home'}),
+    ]
+
+    async def scenario():
+        server, reader, writer = await start(SuggestionService())
+        replies = []
+        for line in invalid:
+            writer.write(line)
+            await writer.drain()
+            replies.append(await receive(reader))
+        # A conexão continua válida depois dos erros
+        writer.write(encode_message({'type': 'subscribe', 'table': '*'}))
+        writer.write(encode_message({'type': 'result', 'table': 'mesa-1', 'result': 'home'}))
+        await writer.drain()
+        replies.append(await receive(reader))
+        await close(server, writer)
+        return replies
+
+    replies = run(scenario())
+    assert [reply['type'] for reply in replies[:-1]] == ['error'] * len(invalid)
+    assert all(reply['message'] for reply in replies[:-1])
+    assert replies[-1]['type'] == 'suggestion'
+
+def test_a_failing_batch_is_reported_and_the_table_keeps_working(monkeypatch):
+    original_apply = service.TableState.apply
+    failures = []
+
+    def apply(state, batch):
+        if not failures:
+            failures.append(batch)
+            raise RuntimeError('falha simulada')
+        return original_apply(state, batch)
+    monkeypatch.setattr(service.TableState, 'apply', apply)
+
+    async def scenario():
+        server, reader, writer = await start(SuggestionService())
+        writer.write(encode_message({'type': 'subscribe', 'table': 'mesa-1'}))
+        writer.write(encode_message({'type': 'result', 'table': 'mesa-1', 'result': 'home'}))
+        await writer.drain()
+        error = await receive(reader)
+        writer.write(encode_message({'type': 'result', 'table': 'mesa-1', 'result': 'away'}))
+        await writer.drain()
+        suggestion = await receive(reader)
+        await close(server, writer)
+        return error, suggestion
+
+    error, suggestion = run(scenario())
+    assert error == {'type': 'error', 'table': 'mesa-1', 'message': 'Falha ao aplicar o lote: falha simulada'}
+    assert suggestion['type'] == 'suggestion'
+    assert suggestion['last_result'] == 'away'
+
+def test_table_history_is_loaded_from_the_log_outside_the_event_loop(tmp_path, monkeypatch):
+    store = LogStore(tmp_path)
+    store.log('mesa-1').extend(['home', 'away', 'draw', 'home'])
+    threads = []
+    original_load = service.TableState.load
+
+    def load(state):
+        threads.append(threading.current_thread())
+        original_load(state)
+    monkeypatch.setattr(service.TableState, 'load', load)
+
+    async def scenario():
+        server, reader, writer = await start(SuggestionService(store))
+        writer.write(encode_message({'type': 'subscribe', 'table': 'mesa-1'}))
+        writer.write(encode_message({'type': 'result', 'table': 'mesa-1', 'result': 'draw'}))
+        writer.write(encode_message({'type': 'clear', 'table': 'mesa-2'}))
+        await writer.drain()
+        message = await receive(reader)
+        await close(server, writer)
+        return message
+
+    message = run(scenario())
+    assert message['round'] == 5
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+    assert list(reversed(store.log('mesa-1').view())) == ['home', 'away', 'draw', 'home', 'draw']
+
+def test_a_failed_log_write_leaves_memory_in_step_with_the_log(tmp_path, monkeypatch):
+    store = LogStore(tmp_path)
+    log = store.log('mesa-1')
+    original_extend = log.extend
+    failures = []
+
+    def extend(results):
+        if not failures:
+            failures.append(list(results))
+            raise OSError('disco cheio')
+        original_extend(results)
+    monkeypatch.setattr(log, 'extend', extend)
+
+    state = service.TableState('mesa-1', log)
+    try:
+        state.apply(['home', 'away'])
+    except OSError:
+        pass
+    assert failures == [['home', 'away']]
+    assert len(state.history) == 0 and state.round == 0 and len(log) == 0
+
+    message = state.apply(['draw', service.CLEAR_TABLE, 'home', 'home'])
+    assert message['round'] == 2 == len(log)
+    assert list(state.history) == ['home', 'home']
+    assert list(reversed(log.view())) == ['home', 'home']
+
+def test_history_request_is_answered_after_the_results_sent_before_it(tmp_path):
+    store = LogStore(tmp_path)
+    store.log('mesa-1').extend(['home', 'away'])
+
+    async def scenario():
+        server, reader, writer = await start(SuggestionService(store))
+        for result in ['draw', 'home']:
+            writer.write(encode_message({'type': 'result', 'table': 'mesa-1', 'result': result}))
+        writer.write(encode_message({'type': 'history', 'table': 'mesa-1'}))
+        writer.write(encode_message({'type': 'clear', 'table': 'mesa-1'}))
+        writer.write(encode_message({'type': 'result', 'table': 'mesa-1', 'result': 'away'}))
+        writer.write(encode_message({'type': 'history', 'table': 'mesa-1'}))
+        writer.write(encode_message({'type': 'history', 'table': '../fora'}))
+        await writer.drain()
+        replies = [await receive(reader) for _ in range(3)]
+        await close(server, writer)
+        return replies
+
+    first, second, invalid = run(scenario())
+    assert first == {'type': 'history', 'table': 'mesa-1', 'round': 4, 'results': ['home', 'away', 'draw', 'home']}
+    assert second == {'type': 'history', 'table': 'mesa-1', 'round': 1, 'results': ['away']}
+    assert invalid['type'] == 'error'
+
+def test_client_loads_the_history_and_matches_rounds_sent_by_the_service():
+    ready = []
+    started = threading.Event()
+
+    async def serve():
+        stop = asyncio.Event()
+        server = await asyncio.start_server(SuggestionService().handle_connection, '127.0.0.1', 0)
+        ready.append((server.sockets[0].getsockname()[1], asyncio.get_running_loop(), stop))
+        started.set()
+        async with server:
+            await stop.wait()
+
+    thread = threading.Thread(target=asyncio.run, args=(serve(),), daemon=True)
+    thread.start()
+    assert started.wait(5)
+    port, loop, stop = ready[0]
+    client = service.ServiceClient('127.0.0.1', port)
+    try:
+        client.send_results('mesa-1', ['home'] * 10)
+        round_number, results = client.load_history('mesa-1')
+        assert (round_number, results) == (10, ['home'] * 10)
+        client.send_result('mesa-1', 'away')
+        message = client.wait_for('mesa-1', round_number + 1, timeout=5)
+        assert message is not None and message['last_result'] == 'away'
+        with pytest.raises(ValueError, match='inválido'):
+            client.load_history('../fora')
+    finally:
+        client.close()
+        loop.call_soon_threadsafe(stop.set)
+        thread.join(5)
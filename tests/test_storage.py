@@ -0,0 +1,129 @@
+"""Testes do log de resultados por mesa: gravação, recarga após queda e compactação."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from football_studio import storage
+from football_studio.incremental import IncrementalAnalyzer
+from football_studio.storage import LogStore, ResultLog
+
+SEQUENCE = ['home', 'away', 'draw', 'home', 'home', 'away', 'draw', 'draw', 'away', 'home']
+
+def test_append_and_extend_are_read_back_newest_first(tmp_path):
+    with ResultLog(tmp_path / 'mesa.log') as log:
+        log.append('home')
+        log.extend(['away', 'draw'])
+        assert len(log) == 3
+        assert list(log.view()) == ['draw', 'away', 'home']
+        assert list(log.view(2)) == ['draw', 'away']
+        assert log.view()[0] == 'draw'
+        assert log.view().count('away') == 1
+
+def test_load_rebuilds_history_and_incremental_state(tmp_path):
+    sequence = SEQUENCE * 4
+    with ResultLog(tmp_path / 'mesa.log') as log:
+        log.extend(sequence)
+        history, analyzer = log.load(max_history=30)
+
+    newest_first = list(reversed(sequence))[:30]
+    assert list(history) == newest_first
+    assert analyzer.analyze_all() == IncrementalAnalyzer.from_results(newest_first, 30).analyze_all()
+
+def test_results_survive_a_process_killed_without_close(tmp_path):
+    path = tmp_path / 'mesa.log'
+    script = (
+        'import os, sys\n'
+        'from football_studio.storage import ResultLog\n'
+        'log = ResultLog(sys.argv[1])\n'
+        'for result in sys.argv[2:]:\n'
+        '    log.append(result)\n'
+        'os._exit(0)\n'
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', script, str(path), *SEQUENCE], check=True, cwd=root)
+
+    with ResultLog(path) as log:
+        assert list(reversed(log.view())) == SEQUENCE
+        log.append('draw')
+        assert len(log) == len(SEQUENCE) + 1
+
+def test_compact_keeps_the_tail_and_accepts_new_results(tmp_path):
+    path = tmp_path / 'mesa.log'
+    with ResultLog(path) as log:
+        log.extend(SEQUENCE)
+        log.compact(keep=4)
+        assert list(reversed(log.view())) == SEQUENCE[-4:]
+        log.append('draw')
+        assert list(reversed(log.view())) == SEQUENCE[-4:] + ['draw']
+    assert not os.path.exists(str(path) + '.compact')
+    with ResultLog(path) as log:
+        assert len(log) == 5
+
+def test_compact_syncs_the_directory_after_the_rename(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(storage, 'sync_directory', synced.append)
+    with ResultLog(tmp_path / 'mesa.log') as log:
+        log.extend(SEQUENCE)
+        log.compact(keep=3)
+    assert synced == [str(tmp_path)]
+
+def test_crash_before_rename_keeps_the_old_log(tmp_path, monkeypatch):
+    path = tmp_path / 'mesa.log'
+    with ResultLog(path) as log:
+        log.extend(SEQUENCE)
+
+        def crash(source, target):
+            raise OSError('queda simulada')
+        monkeypatch.setattr(os, 'replace', crash)
+        with pytest.raises(OSError):
+            log.compact(keep=3)
+        monkeypatch.undo()
+
+    # O temporário que sobrou da queda não faz parte do log e é sobrescrito na compactação seguinte
+    assert os.path.exists(str(path) + '.compact')
+    with ResultLog(path) as log:
+        assert list(reversed(log.view())) == SEQUENCE
+        log.compact(keep=3)
+        assert list(reversed(log.view())) == SEQUENCE[-3:]
+    assert not os.path.exists(str(path) + '.compact')
+
+def test_truncate_clears_the_log(tmp_path):
+    with ResultLog(tmp_path / 'mesa.log') as log:
+        log.extend(SEQUENCE)
+        log.view()
+        log.truncate()
+        assert len(log) == 0
+        assert list(log.view()) == []
+        log.append('home')
+        assert list(log.view()) == ['home']
+
+def test_views_taken_before_truncate_or_compact_keep_reading_the_old_contents(tmp_path):
+    with ResultLog(tmp_path / 'mesa.log') as log:
+        log.extend(SEQUENCE)
+        before_compact = log.view()
+        log.compact(keep=3)
+        before_truncate = log.view()
+        log.truncate()
+        log.append('home')
+        # Ler uma view antiga depois de o arquivo encolher não pode derrubar o processo (SIGBUS)
+        assert list(reversed(before_compact)) == SEQUENCE
+        assert list(reversed(before_truncate)) == SEQUENCE[-3:]
+        assert list(log.view()) == ['home']
+
+def test_short_writes_are_retried_until_every_result_is_written(tmp_path, monkeypatch):
+    write = os.write
+    monkeypatch.setattr(os, 'write', lambda fd, data: write(fd, bytes(data[:3])))
+    with ResultLog(tmp_path / 'mesa.log') as log:
+        log.extend(SEQUENCE)
+        assert list(reversed(log.view())) == SEQUENCE
+
+def test_store_opens_one_log_per_table_and_rejects_bad_ids(tmp_path):
+    store = LogStore(tmp_path / 'mesas')
+    assert store.log('mesa-1') is store.log('mesa-1')
+    store.log('mesa-2').append('home')
+    assert store.tables() == ['mesa-1', 'mesa-2']
+    with pytest.raises(ValueError):
+        store.log('../fora')
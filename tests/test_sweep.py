@@ -0,0 +1,51 @@
+"""Testes da busca de parâmetros: retomada pelo arquivo de saída e workers com memória compartilhada."""
+
+import json
+import random
+
+from football_studio import sweep
+from football_studio.parsing import encode_results
+
+GRID = ['--set', 'critical_surf_threshold=6,7', '--set', 'pattern_min_count=2,3']
+
+def write_history(path, seed, size=120):
+    rng = random.Random(seed)
+    path.write_text(' '.join(rng.choices('HAD', (45, 45, 10), k=size)) + '\n', encoding='utf-8')
+    return str(path)
+
+def run_main(capsys, *args):
+    assert sweep.main(list(args)) == 0
+    captured = capsys.readouterr()
+    return captured.out, captured.err
+
+def test_second_run_with_the_same_out_evaluates_nothing_and_ranks_the_same(tmp_path, capsys):
+    history = write_history(tmp_path / 'mesa.txt', seed=1)
+    other = write_history(tmp_path / 'outra.txt', seed=2)
+    out = str(tmp_path / 'busca.jsonl')
+    # Linhas de outro conjunto de históricos no mesmo arquivo não contam como avaliadas
+    run_main(capsys, other, *GRID, '--out', out, '--workers', '1', '--min-bets', '0')
+    foreign_rows = len(open(out, encoding='utf-8').readlines())
+
+    # Uma tarefa por combinação e dois workers: passa pelo bloco de memória compartilhada
+    args = (history, *GRID, '--out', out, '--workers', '2', '--task-size', '1', '--min-bets', '0')
+    first_ranking, first_progress = run_main(capsys, *args)
+    lines = open(out, encoding='utf-8').readlines()
+    assert len(lines) == foreign_rows + 4
+    assert '4/4 tarefas' in first_progress
+
+    second_ranking, second_progress = run_main(capsys, *args)
+    assert open(out, encoding='utf-8').readlines() == lines
+    assert 'tarefas' not in second_progress
+    assert second_ranking == first_ranking
+    assert len(first_ranking.splitlines()) == 1 + 4
+
+def test_shared_memory_workers_match_the_serial_evaluation(tmp_path):
+    encoded = [encode_results(random.Random(seed).choices(('home', 'away', 'draw'), k=100)) for seed in (3, 4)]
+    param_list = sweep.expand_grid({'critical_surf_threshold': [6, 7], 'imbalance_score': [30, 40]})
+
+    def by_params(rows):
+        return sorted((json.dumps(row['params'], sort_keys=True), row['rounds'], row['bets'], row['hits']) for row in rows)
+    serial = sweep.run_sweep(encoded, param_list, workers=1)
+    parallel = sweep.run_sweep(encoded, param_list, workers=2, task_size=1)
+    assert by_params(parallel) == by_params(serial)
+    assert all(row['rounds'] for row in serial)